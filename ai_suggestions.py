@@ -5,64 +5,946 @@ Verwendet requests direkt (nicht das OpenAI SDK),
 genau wie die offizielle OpenRouter-Doku zeigt.
 Das OpenAI SDK hat in manchen Versionen Probleme
 mit custom default_headers → daher dieser Weg.
+
+Verbindungen:
+  - Eine langlebige requests.Session mit Connection-Pool + Keep-Alive
+    → TLS-Handshake und DNS-Lookup nur einmal statt pro Anfrage
+  - Kleiner, fester Worker-Pool statt einem neuen Thread pro Anfrage
+  - Optionaler Warm-up-Ping beim Start → erste Anfrage ohne Kaltstart
+
+Streaming (AI_STREAM):
+  - "stream": true → Server-Sent-Events, Tokens kommen einzeln rein
+  - SuggestionStreamParser erkennt fertige nummerierte Vorschläge
+  - Jeder fertige Vorschlag geht sofort an die UI (final=False),
+    am Ende kommt der komplette Text (final=True)
+  → Der erste Satz steht da, bevor die KI mit dem dritten fertig ist.
+
+Latest-wins (pro Kanal):
+  - Jede Anfrage bekommt eine fortlaufende ID
+  - Eine neue Anfrage bricht die laufende ab (Stream wird geschlossen)
+  - Nur Antworten der neuesten ID erreichen die UI
+  - Trigger innerhalb von AI_COALESCE_MS nach dem letzten Senden werden
+    zu einem Aufruf am Fensterende zusammengefasst (der jüngste Kontext
+    gewinnt). Die laufende Anfrage bleibt so lange unangetastet und darf
+    noch fertig werden – abgebrochen wird sie erst, wenn der Nachzügler
+    tatsächlich rausgeht
+  - Kanal = Ausgabe-Pane: Hauptansicht oder ein Profil im Fan-out;
+    Kanäle laufen parallel und verdrängen sich nicht gegenseitig
+
+Antwort-Cache:
+  - LRU + TTL, Schlüssel = Hash aus Profil-Prompt + normalisiertem Transkript
+    (inkl. Nutzer-Kontext, ohne den sekündlich wechselnden "Still seit"-Zähler)
+  - Treffer → Antwort sofort, ohne API-Aufruf
+  - force=True → Cache ignorieren, neue Antwort ziehen
+
+Failover / Hedging (providers.py):
+  - Endpunkte der Reihe nach, Endpunkte mit offenem Circuit-Breaker übersprungen;
+    sind alle pausiert (auch der einzige), wird nur gewartet, wenn das ins
+    Latenz-Budget passt – ein offener Breaker lässt die Anfrage sofort scheitern
+  - Scheitert ein Endpunkt, geht dieselbe Anfrage sofort an den nächsten
+  - AI_HEDGE_ENABLED: kommt bis zum Latenz-Perzentil kein erstes Token,
+    startet parallel eine Anfrage beim Backup – wer zuerst liefert, gewinnt,
+    der andere Stream wird geschlossen
+
+Rate-Limit / Retry:
+  - Jeder Versuch braucht ein Token aus dem Bucket des Endpunkts
+  - 429 / 5xx / Verbindungsfehler → Wiederholung mit exponentiellem Backoff
+    + Jitter, Retry-After des Servers wird eingehalten
+  - Alles innerhalb von AI_LATENCY_BUDGET_SEC – danach lieber keine Antwort
+    als eine veraltete; Fehler kommen als error=True (UI behält die alten
+    Vorschläge). Das Budget gilt bis zum ersten Token: jeder Versuch bekommt
+    höchstens die Restzeit als Timeout, hängende Versuche werden an der
+    Deadline geschlossen; ein laufender Stream darf fertig werden
+
+Lokales Backend (LOCAL_LLM_*, optional llama-cpp-python):
+  - Kleines GGUF-Modell, lädt beim Start im Hintergrund und bleibt resident
+  - Gleiche Schnittstelle wie der HTTP-Weg: Request-ID, Streaming-Parser,
+    Latest-wins, Cache – nur die Token-Quelle ist eine andere
+  - Backend pro Profil (PROFILE_BACKENDS); ist das Modell nicht verfügbar,
+    geht die Anfrage an die API
 """
 
 import threading
+import time
+import random
+import re
+import hashlib
+from collections import OrderedDict
 import requests
 import json
-from config import ACTIVE_API_KEY, ACTIVE_BASE_URL, ACTIVE_MODEL, SYSTEM_PROMPT_FALLBACK
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
+from config import (
+    SYSTEM_PROMPT_FALLBACK, AI_HEDGE_ENABLED,
+    AI_WORKERS, AI_POOL_SIZE, AI_WARMUP,
+    AI_STREAM, AI_MAX_TOKENS, AI_TIMEOUT_SEC, AI_COALESCE_MS,
+    AI_CACHE_SIZE, AI_CACHE_TTL_SEC, CONTEXT_SUMMARY_PROMPT,
+    LOCAL_LLM_MODEL_PATH, LOCAL_LLM_THREADS, LOCAL_LLM_CTX,
+    LOCAL_LLM_MAX_TOKENS, LOCAL_LLM_PRELOAD,
+    AI_RETRY_MAX, AI_RETRY_BASE_SEC, AI_RETRY_MAX_DELAY_SEC, AI_LATENCY_BUDGET_SEC,
+    AI_DEFAULT_BACKEND, PROFILE_BACKENDS, FANOUT_MAX_PROFILES,
+)
+from event_bus import EventBus, AISuggestions
+from providers import ProviderPool, Endpoint
+from metrics import METRICS
 
-class AISuggester:
+# Beginn eines nummerierten Vorschlags: "1. …", "2) …", "**3.** …"
+_ITEM_START = re.compile(r"^\s*\**\s*(\d+)\s*[.)]")
+
+BACKEND_API   = "api"
+BACKEND_LOCAL = "local"
+
+MAIN_CHANNEL  = "main"
+FANOUT_PREFIX = "fanout:"    # Fan-out-Kanäle: nie gleich MAIN_CHANNEL, auch bei Profil "main"
+
+
+def fanout_channel(profile: str) -> str:
+    return FANOUT_PREFIX + profile
+
+
+def fanout_profile(channel: str) -> str | None:
+    """Profilname eines Fan-out-Kanals, None für andere Kanäle."""
+    return channel[len(FANOUT_PREFIX):] if channel.startswith(FANOUT_PREFIX) else None
+
+# Kopfzeilen, die sich ohne neues Gesprächsmaterial ändern → nicht im Cache-Key
+_VOLATILE_PREFIXES = ("Still seit:",)
+
+
+def backend_for_profile(profile_name: str | None) -> str:
+    return PROFILE_BACKENDS.get(profile_name or "", AI_DEFAULT_BACKEND)
+
+
+def _cache_key(system_prompt: str, transcript_text: str,
+               backend: str = BACKEND_API) -> str:
+    lines = []
+    for line in transcript_text.splitlines():
+        line = " ".join(line.split())
+        if not line or line.startswith(_VOLATILE_PREFIXES):
+            continue
+        lines.append(line)
+    h = hashlib.sha256()
+    h.update(backend.encode("utf-8") + b"\x00")
+    h.update(system_prompt.strip().encode("utf-8"))
+    h.update(b"\x00")
+    h.update("\n".join(lines).encode("utf-8"))
+    return h.hexdigest()
+
+
+class SuggestionCache:
+    """Kleiner LRU-Cache mit Ablaufzeit (thread-sicher)."""
+
+    def __init__(self, max_size: int = AI_CACHE_SIZE, ttl: float = AI_CACHE_TTL_SEC):
+        self._max   = max_size
+        self._ttl   = ttl
+        self._data  = OrderedDict()    # key → (expires_at, text)
+        self._lock  = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires, text = hit
+            if time.monotonic() > expires:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        if self._max <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self._ttl, text)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SuggestionStreamParser:
+    """
+    Setzt gestreamte Text-Deltas zu nummerierten Vorschlägen zusammen.
+
+    feed() gibt die Vorschläge zurück, die mit diesem Delta fertig wurden:
+      - ein neuer nummerierter Eintrag beginnt, oder
+      - eine Leerzeile folgt
+    Ein Punkt am Zeilenende schließt NICHT ab – ein Vorschlag darf über
+    mehrere Zeilen gehen. Den letzten Vorschlag liefert finish().
+    """
 
     def __init__(self):
-        self._callbacks = []
+        self.items   = []      # fertige Vorschläge
+        self._line   = ""      # angefangene Zeile
+        self._item   = []      # Zeilen des aktuellen Vorschlags
+        self.text    = ""      # gesamter bisher empfangener Text
+
+    def feed(self, delta: str) -> list[str]:
+        self.text += delta
+        done = []
+        self._line += delta
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            done += self._push_line(line, line_complete=True)
+        if self._item and _ITEM_START.match(self._line):
+            done += self._close_item()      # nächster Eintrag beginnt schon
+        return done
+
+    def finish(self) -> list[str]:
+        done = []
+        if self._line:
+            done += self._push_line(self._line, line_complete=False)
+            self._line = ""
+        done += self._close_item()
+        return done
+
+    def _push_line(self, line: str, line_complete: bool) -> list[str]:
+        if not line.strip():
+            return self._close_item() if line_complete else []
+        done = self._close_item() if _ITEM_START.match(line) else []
+        self._item.append(line.strip())
+        return done
+
+    def _close_item(self) -> list[str]:
+        if not self._item:
+            return []
+        item = " ".join(self._item)
+        self._item = []
+        self.items.append(item)
+        return [item]
+
+
+class APIError(Exception):
+    """HTTP-Fehler eines Endpunkts (Status + gekürzter Body)."""
+
+    def __init__(self, status: int, body: str, retry_after: float | None = None):
+        super().__init__(f"HTTP {status}")
+        self.status      = status
+        self.body        = body
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 429 or self.status >= 500
+
+    def __str__(self):
+        if self.status == 429:
+            return "[KI-Anbieter ausgelastet (429) – bitte gleich nochmal]"
+        return f"[HTTP-Fehler {self.status}: {self.body}]"
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After: Sekunden oder HTTP-Datum → Sekunden ab jetzt."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, APIError):
+        return err.retryable
+    return isinstance(err, (requests.ConnectionError, requests.Timeout))
+
+
+def _backoff(attempt: int) -> float:
+    """Exponentiell mit Jitter: zufällig in [d/2, d], d = base·2^n (gedeckelt)."""
+    cap = min(AI_RETRY_MAX_DELAY_SEC, AI_RETRY_BASE_SEC * (2 ** attempt))
+    return random.uniform(cap / 2, cap)
+
+
+class _Race:
+    """
+    Wettlauf mehrerer Endpunkte um dieselbe Anfrage.
+    Wer zuerst ein Token liefert, gewinnt (claim); alle anderen brechen ab.
+    """
+
+    def __init__(self):
+        self._lock     = threading.Lock()
+        self.winner    : Endpoint | None = None
+        self.result    = None
+        self.errors    = []          # [(Endpoint, Exception)]
+        self.running   = 0
+        self.responses = {}          # Endpoint → laufende Response
+        self.expired   = False       # Latenz-Budget vor dem ersten Token verbraucht
+        self.done      = threading.Event()
+
+    def start(self):
+        with self._lock:
+            self.running += 1
+
+    def claim(self, ep: Endpoint) -> bool:
+        with self._lock:
+            if self.winner is None and not self.expired:
+                self.winner = ep
+                losers = [r for e, r in self.responses.items() if e is not ep]
+            else:
+                losers = []
+        for resp in losers:
+            try: resp.close()
+            except Exception: pass
+        return self.winner is ep
+
+    def lost(self, ep: Endpoint) -> bool:
+        w = self.winner
+        return self.expired or (w is not None and w is not ep)
+
+    def track(self, ep: Endpoint, response):
+        with self._lock:
+            self.responses[ep] = response
+
+    def finish(self, ep: Endpoint, result: str | None = None, error: Exception | None = None):
+        with self._lock:
+            self.running -= 1
+            self.responses.pop(ep, None)
+            if error is not None:
+                self.errors.append((ep, error))
+            if result is not None and self.winner is ep:
+                self.result = result
+                self.done.set()
+            elif self.running == 0:
+                self.done.set()
+
+    def close_all(self):
+        with self._lock:
+            responses = list(self.responses.values())
+        for resp in responses:
+            try: resp.close()
+            except Exception: pass
+
+    def expire(self):
+        """Budget um, noch kein Token → alle Versuche verlieren und schließen."""
+        with self._lock:
+            if self.winner is not None:
+                return
+            self.expired = True
+        self.close_all()
+
+
+class _Request:
+    """Eine KI-Anfrage mit ID und Abbruch-Signal."""
+
+    def __init__(self, request_id: int, transcript_text: str, system_prompt: str,
+                 cache_key: str, backend: str = BACKEND_API,
+                 channel: str = MAIN_CHANNEL):
+        self.id              = request_id
+        self.backend         = backend
+        self.channel         = channel
+        self.created         = time.monotonic()
+        self.transcript_text = transcript_text
+        self.system_prompt   = system_prompt
+        self.cache_key       = cache_key
+        self.cancelled       = threading.Event()
+        self.race            : _Race | None = None   # laufende Streams (zum Abbrechen)
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.race is not None:
+            self.race.close_all()        # unterbricht iter_lines() in den Workern
 
-    def register_callback(self, fn):
-        self._callbacks.append(fn)
 
-    def request_suggestions(self, transcript_text: str, system_prompt: str = None):
+class _Channel:
+    """Latest-wins-Zustand eines Ausgabekanals."""
+
+    def __init__(self, name: str):
+        self.name          = name
+        self.latest        = 0                      # neueste gesendete/gezeigte Request-ID
+        self.inflight      : _Request | None = None
+        self.pending       : _Request | None = None
+        self.timer         : threading.Timer | None = None
+        self.last_dispatch = 0.0
+
+    def cancel_inflight(self) -> bool:
+        if self.inflight is None:
+            return False
+        self.inflight.cancel()
+        self.inflight = None
+        return True
+
+
+class LocalBackend:
+    """
+    Lokales GGUF-Modell über llama-cpp-python.
+    Lädt einmal im Hintergrund und bleibt resident; Generierung ist
+    serialisiert (eine Llama-Instanz ist nicht thread-sicher).
+    """
+
+    def __init__(self, model_path: str = LOCAL_LLM_MODEL_PATH):
+        self.model_path = model_path
+        self._llm       = None
+        self._lock      = threading.Lock()
+        self._loaded    = threading.Event()
+        self._loading   = False
+        self.error      : str | None = None
+        self.load_time  = 0.0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.model_path)
+
+    @property
+    def ready(self) -> bool:
+        return self._llm is not None
+
+    def usable(self) -> bool:
+        """True solange das Modell geladen ist oder noch lädt."""
+        return self.configured and self.error is None
+
+    def start(self):
+        if not self.configured or self._loading or self._loaded.is_set():
+            return
+        self._loading = True
+        threading.Thread(target=self._load, name="local-llm-load", daemon=True).start()
+
+    def wait_ready(self, timeout: float) -> bool:
+        self.start()
+        self._loaded.wait(timeout)
+        return self.ready
+
+    def _load(self):
+        t0 = time.monotonic()
+        try:
+            from llama_cpp import Llama      # optional → nur bei Bedarf importieren
+            self._llm = Llama(model_path=self.model_path, n_ctx=LOCAL_LLM_CTX,
+                              n_threads=LOCAL_LLM_THREADS, verbose=False)
+            self.load_time = time.monotonic() - t0
+            print(f"[LocalBackend] Modell geladen in {self.load_time:.1f}s: {self.model_path}")
+        except ImportError:
+            self.error = "llama-cpp-python nicht installiert"
+            print(f"[LocalBackend] {self.error} → API wird verwendet")
+        except Exception as e:
+            self.error = str(e)
+            print(f"[LocalBackend] Laden fehlgeschlagen: {e} → API wird verwendet")
+        finally:
+            self._loaded.set()
+
+    def stream(self, system_prompt: str, user_text: str, cancelled: threading.Event):
+        """Liefert Text-Deltas; bricht zwischen zwei Tokens ab, wenn cancelled gesetzt ist."""
+        with self._lock:
+            if cancelled.is_set():
+                return
+            chunks = self._llm.create_chat_completion(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user",   "content": user_text},
+                ],
+                max_tokens=LOCAL_LLM_MAX_TOKENS,
+                temperature=0.7,
+                stream=True,
+            )
+            try:
+                for chunk in chunks:
+                    if cancelled.is_set():
+                        break
+                    delta = (chunk["choices"][0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+            finally:
+                chunks.close()        # Generator schließen → Generierung stoppt
+
+
+class AISuggester:
+
+    def __init__(self, bus: EventBus | None = None,
+                 providers: ProviderPool | None = None):
+        self.bus        = bus if bus is not None else EventBus()
+        self._session   = self._make_session()
+        self._providers = providers if providers is not None else ProviderPool()
+        self._local     = LocalBackend()
+        # Ein Worker pro gleichzeitigem Kanal → ein langsames Profil im
+        # Fan-out blockiert die anderen nicht
+        workers = AI_WORKERS + FANOUT_MAX_PROFILES
+        self._pool      = ThreadPoolExecutor(max_workers=workers,
+                                             thread_name_prefix="ai")
+        # Einzelne HTTP-Versuche (Primär + ggf. Hedge/Failover) pro Anfrage
+        self._attempts  = ThreadPoolExecutor(max_workers=workers * 2,
+                                             thread_name_prefix="ai-try")
+
+        self._lock          = threading.Lock()
+        self._seq           = 0
+        self._channels      : dict[str, _Channel] = {}
+        self._cache         = SuggestionCache()
+        self.stats = {"requested": 0, "coalesced": 0, "sent": 0,
+                      "cancelled": 0, "delivered": 0, "stale": 0,
+                      "cache_hits": 0, "hedged": 0, "failover": 0,
+                      "retried": 0, "throttled": 0}
+
+    def start(self):
+        """Optionaler Warm-up: baut die Verbindung im Hintergrund auf."""
+        if AI_WARMUP:
+            threading.Thread(target=self._warmup, name="ai-warmup", daemon=True).start()
+        uses_local = BACKEND_LOCAL in (AI_DEFAULT_BACKEND, *PROFILE_BACKENDS.values())
+        if LOCAL_LLM_PRELOAD and uses_local:
+            self._local.start()
+
+    def stop(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._attempts.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    def provider_stats(self) -> list[dict]:
+        return self._providers.stats()
+
+    def throttled_for(self) -> float:
+        """Sekunden, bis wieder ein API-Endpunkt frei ist (0 = sofort)."""
+        return self._providers.blocked_for()
+
+    def request_suggestions(self, transcript_text: str,
+                            system_prompt: str = None,
+                            force: bool = False,
+                            backend: str = None,
+                            channel: str = MAIN_CHANNEL) -> int | None:
+        """
+        Fordert Vorschläge an und gibt die Request-ID zurück.
+        Ältere laufende oder wartende Anfragen desselben Kanals werden verworfen.
+        force=True → Cache umgehen und eine neue Antwort ziehen.
+        backend="local" → lokales Modell (falls verfügbar), sonst API.
+        """
         if not transcript_text.strip():
+            return None
+        system_prompt = system_prompt or SYSTEM_PROMPT_FALLBACK
+        backend = backend or AI_DEFAULT_BACKEND
+        if backend == BACKEND_LOCAL and not self._local.usable():
+            backend = BACKEND_API
+        key    = _cache_key(system_prompt, transcript_text, backend)
+        cached = None if force else self._cache.get(key)
+        window = AI_COALESCE_MS / 1000.0
+        with self._lock:
+            ch = self._channels.get(channel)
+            if ch is None:
+                ch = self._channels[channel] = _Channel(channel)
+            self._seq += 1
+            req = _Request(self._seq, transcript_text, system_prompt, key, backend, channel)
+            self.stats["requested"] += 1
+            if cached is not None:
+                # Nichts Neues gesagt → gleiche Antwort, kein API-Aufruf; sie
+                # ersetzt alles Laufende und Wartende
+                self.stats["cache_hits"] += 1
+                ch.latest  = req.id
+                ch.pending = None
+                if ch.cancel_inflight():
+                    self.stats["cancelled"] += 1
+            else:
+                if ch.pending is not None:
+                    self.stats["coalesced"] += 1
+                ch.pending = req
+                wait = ch.last_dispatch + window - time.monotonic()
+                if wait > 0:
+                    # Innerhalb des Fensters: zusammenfassen, am Fensterende senden
+                    if ch.timer is None:
+                        ch.timer = threading.Timer(wait, self._dispatch_pending, args=(ch,))
+                        ch.timer.daemon = True
+                        ch.timer.start()
+                    return req.id
+        if cached is not None:
+            self._notify(req, cached, cached_hit=True)
+        else:
+            self._dispatch_pending(ch)
+        return req.id
+
+    def request_fanout(self, transcript_text: str, profiles: dict[str, tuple[str, str]],
+                       force: bool = False) -> dict[str, int]:
+        """
+        Schickt denselben Kontext parallel an mehrere Profile.
+        profiles = {Profilname: (System-Prompt, Backend)} → {Profilname: Request-ID}
+        Kanal je Profil: fanout_channel(name).
+        """
+        ids = {}
+        for name, (system_prompt, backend) in list(profiles.items())[:FANOUT_MAX_PROFILES]:
+            req_id = self.request_suggestions(transcript_text, system_prompt, force,
+                                              backend, channel=fanout_channel(name))
+            if req_id is not None:
+                ids[name] = req_id
+        return ids
+
+    def busy(self, channel: str = MAIN_CHANNEL) -> bool:
+        """Wartet oder läuft auf dem Kanal gerade eine Anfrage?"""
+        with self._lock:
+            ch = self._channels.get(channel)
+            return ch is not None and (ch.pending is not None or ch.inflight is not None)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def cancel(self, request_id: int):
+        """Bricht eine bestimmte Anfrage ab, falls sie noch wartet oder läuft."""
+        with self._lock:
+            for ch in self._channels.values():
+                if ch.pending is not None and ch.pending.id == request_id:
+                    ch.pending = None
+                if ch.inflight is not None and ch.inflight.id == request_id:
+                    ch.cancel_inflight()
+                    self.stats["cancelled"] += 1
+
+    def cancel_all(self):
+        """Bricht laufende und wartende Anfragen ab (z.B. Transkript geleert)."""
+        with self._lock:
+            self._seq += 1
+            for ch in self._channels.values():
+                ch.latest  = self._seq       # alles Laufende ist ab jetzt veraltet
+                ch.pending = None
+                if ch.cancel_inflight():
+                    self.stats["cancelled"] += 1
+
+    def _dispatch_pending(self, ch: _Channel):
+        with self._lock:
+            ch.timer = None
+            req, ch.pending = ch.pending, None
+            if req is None:
+                return
+            # Erst jetzt ist die laufende Antwort überholt → Stream freigeben
+            ch.latest = req.id
+            if ch.cancel_inflight():
+                self.stats["cancelled"] += 1
+            ch.inflight      = req
+            ch.last_dispatch = time.monotonic()
+            self.stats["sent"] += 1
+        self._pool.submit(self._run, req)
+
+    def _run(self, req: _Request):
+        # Lädt das lokale Modell noch, wartet die Anfrage darauf (max. Timeout)
+        if req.backend == BACKEND_LOCAL and self._local.wait_ready(AI_TIMEOUT_SEC):
+            self._call_local(req)
             return
-        threading.Thread(
-            target=self._call_api,
-            args=(transcript_text, system_prompt),
-            daemon=True
-        ).start()
-
-    def _call_api(self, transcript_text: str, system_prompt: str = None):
-        prompt = system_prompt if system_prompt else SYSTEM_PROMPT_FALLBACK
+        if req.backend != BACKEND_API:
+            # Ausweichen auf die API → Ergebnis unter dem API-Schlüssel cachen
+            req.backend   = BACKEND_API
+            req.cache_key = _cache_key(req.system_prompt, req.transcript_text, BACKEND_API)
+        self._call_api(req)
+
+    def _is_current(self, req: _Request) -> bool:
+        ch = self._channels.get(req.channel)
+        return ch is not None and req.id == ch.latest and not req.cancelled.is_set()
+
+    def _finished(self, req: _Request):
+        with self._lock:
+            ch = self._channels.get(req.channel)
+            if ch is not None and ch.inflight is req:
+                ch.inflight = None
+
+    # ── HTTP ────────────────────────────────────────────────
+
+    @staticmethod
+    def _make_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2,
+                              pool_maxsize=AI_POOL_SIZE + FANOUT_MAX_PROFILES)
+        session.mount("https://", adapter)
+        session.mount("http://",  adapter)
+        session.headers.update({
+            "Content-Type":  "application/json",
+            "HTTP-Referer":  "https://localhost/conversation-assistant",
+            "X-Title":       "Conversation Assistant",
+            "Connection":    "keep-alive",
+        })
+        return session
+
+    def _warmup(self):
+        # Billiger GET auf /models: öffnet TCP + TLS, Verbindung bleibt im Pool
+        for ep in self._providers.endpoints:
+            try:
+                self._session.get(ep.url("/models"), headers=ep.headers(), timeout=5)
+                print(f"[AISuggester] Verbindung vorgewärmt: {ep.name}")
+            except Exception as e:
+                print(f"[AISuggester] Warm-up fehlgeschlagen ({ep.name}): {e}")
+
+    def summarize(self, previous_summary: str, new_lines: list[str],
+                  max_tokens: int) -> str:
+        """
+        Aktualisiert eine laufende Gesprächs-Zusammenfassung (blockierend).
+        Wird vom ContextBuilder im Hintergrund aufgerufen, nicht im Worker-Pool.
+        """
+        ep   = self._providers.primary
+        if not ep.available() or ep.bucket.try_take() > 0:
+            # Zusammenfassung ist nicht eilig → Kontingent den Vorschlägen lassen
+            raise RuntimeError(f"{ep.name} pausiert oder Rate-Limit, später erneut")
+        user = (f"Bisherige Zusammenfassung:\n{previous_summary or '(noch keine)'}\n\n"
+                "Neue Zeilen:\n" + "\n".join(new_lines))
+        response = self._session.post(
+            url=ep.url("/chat/completions"),
+            headers=ep.headers(),
+            data=json.dumps({
+                "model": ep.model,
+                "messages": [
+                    {"role": "system", "content": CONTEXT_SUMMARY_PROMPT},
+                    {"role": "user",   "content": user}
+                ],
+                "max_tokens":  max_tokens,
+                "temperature": 0.2,
+            }),
+            timeout=AI_TIMEOUT_SEC
+        )
+        with response:
+            if response.status_code >= 400:
+                raise APIError(response.status_code, response.text[:300])
+            return response.json()["choices"][0]["message"]["content"].strip()
+
+    def _call_local(self, req: _Request):
+        """Wie _call_api, aber Tokens kommen vom lokalen Modell."""
         try:
-            response = requests.post(
-                url=ACTIVE_BASE_URL.rstrip("/") + "/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {ACTIVE_API_KEY}",
-                    "Content-Type":  "application/json",
-                    "HTTP-Referer":  "https://localhost/conversation-assistant",
-                    "X-Title":       "Conversation Assistant",
-                },
+            if not self._is_current(req):
+                return
+            parser = SuggestionStreamParser()
+            for delta in self._local.stream(req.system_prompt, self._user_message(req),
+                                            req.cancelled):
+                if parser.feed(delta):
+                    self._notify(req, "\n".join(parser.items), final=False)
+            if req.cancelled.is_set():
+                return
+            parser.finish()
+            text = parser.text.strip()
+            if text:                     # leere Antwort nicht für AI_CACHE_TTL_SEC festhalten
+                self._cache.put(req.cache_key, text)
+            self._notify(req, text)
+        except Exception as e:
+            self._notify(req, f"[Fehler (lokal): {e}]", error=True)
+        finally:
+            self._finished(req)
+
+    @staticmethod
+    def _user_message(req: _Request) -> str:
+        return f"Transkript:\n{req.transcript_text}"
+
+    def _call_api(self, req: _Request):
+        """Führt eine Anfrage aus – mit Failover, Hedging und Retries im Latenz-Budget."""
+        if not self._is_current(req):
+            return                       # schon überholt, bevor ein Worker frei war
+        deadline = time.monotonic() + AI_LATENCY_BUDGET_SEC
+        retries  = 0
+        try:
+            while True:
+                race = self._race(req, deadline)
+                if req.cancelled.is_set():
+                    return
+                if race is not None and (race.result is not None or race.winner is not None
+                                         or not race.errors):
+                    break                # Erfolg (oder Abbruch mitten im Stream)
+                if race is None:
+                    # Kein Token frei oder alle pausiert → warten, falls das
+                    # ins Budget passt (frisch offener Breaker: Cooldown >
+                    # Budget → scheitert sofort mit "pausiert")
+                    delay = self._providers.blocked_for()
+                else:
+                    err = race.errors[-1][1]
+                    if not _is_retryable(err) or retries >= AI_RETRY_MAX:
+                        break
+                    delay = max(_backoff(retries), getattr(err, "retry_after", None) or 0.0,
+                                self._providers.blocked_for())
+                if time.monotonic() + delay > deadline:
+                    break                # Antwort käme zu spät, um noch zu helfen
+                retries += 1
+                with self._lock:
+                    self.stats["retried" if race is not None else "throttled"] += 1
+                if req.cancelled.wait(delay):
+                    return
+
+            if race is None:
+                wait = self._providers.blocked_for()
+                reason = "KI-Anbieter pausiert" if self._providers.paused() else "KI-Limit erreicht"
+                self._notify(req, f"[{reason} – wieder frei in {wait:.0f}s]", error=True)
+            elif race.result is not None:
+                if race.result:
+                    self._cache.put(req.cache_key, race.result)
+                self._notify(req, race.result)
+            elif race.expired:
+                self._notify(req, f"[Keine Antwort innerhalb von {AI_LATENCY_BUDGET_SEC}s "
+                                  "– abgebrochen]", error=True)
+            elif race.errors:
+                ep, err = race.errors[-1]
+                msg = str(err) if isinstance(err, APIError) else f"[Fehler: {err}]"
+                self._notify(req, msg, error=True)
+        finally:
+            self._finished(req)
+
+    def _race(self, req: _Request, deadline: float) -> _Race | None:
+        """
+        Ein Durchgang über die Endpunkte (Primär, ggf. Hedge, Failover).
+        None → kein Endpunkt hatte ein Token frei.
+        Kommt bis deadline kein erstes Token, wird das Rennen abgebrochen
+        (race.expired); ein laufender Stream darf danach noch fertig werden.
+        """
+        pending = self._providers.candidates()
+        primary = self._take(pending)
+        if primary is None:
+            return None
+        race     = _Race()
+        req.race = race
+        self._launch(req, race, primary, deadline)
+        hedge_at = (time.monotonic() + self._providers.hedge_delay(primary)
+                    if AI_HEDGE_ENABLED and pending else None)
+
+        while True:
+            wake    = [t for t in (hedge_at, None if race.winner else deadline) if t is not None]
+            timeout = max(0.0, min(wake) - time.monotonic()) if wake else None
+            race.done.wait(timeout)
+            if req.cancelled.is_set():
+                return race
+            if race.done.is_set():
+                if race.result is None and race.winner is None:
+                    # Alle bisherigen Versuche gescheitert → nächster Endpunkt
+                    backup = self._take(pending) if time.monotonic() < deadline else None
+                    if backup is not None:
+                        race.done.clear()
+                        self._launch(req, race, backup, deadline)
+                        with self._lock:
+                            self.stats["failover"] += 1
+                        continue
+                return race
+            if race.winner is None and time.monotonic() >= deadline:
+                race.expire()            # hängende Versuche nicht weiter abwarten
+                if race.winner is None:
+                    return race
+                continue                 # Token kam gerade noch rechtzeitig
+            if hedge_at is None or time.monotonic() < hedge_at:
+                continue
+            # Hedge-Zeitpunkt: noch kein Token vom Primär-Endpunkt
+            hedge_at = None
+            if race.winner is None:
+                backup = self._take(pending)
+                if backup is not None:
+                    self._launch(req, race, backup, deadline)
+                    with self._lock:
+                        self.stats["hedged"] += 1
+
+    @staticmethod
+    def _take(pending: list[Endpoint]) -> Endpoint | None:
+        """Nächster Endpunkt aus pending, der ein Rate-Limit-Token hergibt."""
+        while pending:
+            ep = pending.pop(0)
+            if not ep.deferred() and ep.bucket.try_take() == 0.0:
+                return ep
+        return None
+
+    def _launch(self, req: _Request, race: _Race, ep: Endpoint, deadline: float):
+        race.start()
+        self._attempts.submit(self._attempt, req, race, ep, deadline)
+
+    def _attempt(self, req: _Request, race: _Race, ep: Endpoint, deadline: float):
+        """
+        Ein HTTP-Versuch bei einem Endpunkt. Meldet Ergebnis an das Race.
+        Verbindungs-/Lese-Timeout höchstens bis deadline, nie AI_TIMEOUT_SEC
+        über das Latenz-Budget hinaus.
+        """
+        result, error = None, None
+        t0 = time.monotonic()
+        try:
+            if req.cancelled.is_set() or race.lost(ep):
+                return
+            response = self._session.post(
+                url=ep.url("/chat/completions"),
+                headers=ep.headers(),
                 data=json.dumps({
-                    "model": ACTIVE_MODEL,
+                    "model": ep.model,
                     "messages": [
-                        {"role": "system", "content": prompt},
-                        {"role": "user",   "content": f"Transkript:\n{transcript_text}"}
+                        {"role": "system", "content": req.system_prompt},
+                        {"role": "user",   "content": self._user_message(req)}
                     ],
-                    "max_tokens":  300,
-                    "temperature": 0.7
+                    "max_tokens":  AI_MAX_TOKENS,
+                    "temperature": 0.7,
+                    "stream":      AI_STREAM,
                 }),
-                timeout=20
+                timeout=max(0.1, min(AI_TIMEOUT_SEC, deadline - time.monotonic())),
+                stream=AI_STREAM
             )
-            response.raise_for_status()
-            result = response.json()["choices"][0]["message"]["content"].strip()
-            self._notify(result)
-        except requests.HTTPError as e:
-            self._notify(f"[HTTP-Fehler {e.response.status_code}: {e.response.text}]")
+            race.track(ep, response)
+            METRICS.record("ai.connect", time.monotonic() - t0)   # bis Response-Header
+            if req.cancelled.is_set() or race.lost(ep):
+                response.close()
+                return
+            with response:
+                if response.status_code >= 400:
+                    raise APIError(response.status_code, response.text[:500],
+                                   _parse_retry_after(response.headers.get("Retry-After")))
+                if AI_STREAM:
+                    result, ttft = self._read_stream(req, race, ep, response, t0)
+                else:
+                    text = response.json()["choices"][0]["message"]["content"].strip()
+                    result, ttft = (text, time.monotonic() - t0) if race.claim(ep) else (None, 0.0)
+            if result is not None:
+                ep.record_success(ttft)
+                METRICS.record("ai.first_token", ttft)
+                METRICS.record("ai.complete", time.monotonic() - t0)
         except Exception as e:
-            self._notify(f"[Fehler: {e}]")
+            # Abbruch oder verlorenes Rennen ist kein Fehler des Endpunkts
+            if not (req.cancelled.is_set() or race.lost(ep)):
+                error = e
+                METRICS.incr("ai.errors")
+                if isinstance(e, APIError) and e.status == 429:
+                    # Kontingent, kein Ausfall → pausieren statt Breaker
+                    ep.defer(e.retry_after or _backoff(0))
+                else:
+                    if isinstance(e, APIError) and e.retry_after:
+                        ep.defer(e.retry_after)
+                    ep.record_failure()
+        finally:
+            race.finish(ep, result, error)
 
-    def _notify(self, suggestions: str):
-        for fn in self._callbacks:
-            try:
-                fn(suggestions)
-            except Exception as e:
-                print(f"[AISuggester] Callback-Fehler: {e}")
+    def _read_stream(self, req: _Request, race: _Race, ep: Endpoint,
+                     response: requests.Response, t0: float) -> tuple[str | None, float]:
+        """
+        Liest SSE-Zeilen, schickt jeden fertigen Vorschlag sofort an die UI.
+        Gibt (Text, Zeit bis zum ersten Token) zurück; Text=None → abgebrochen
+        oder Rennen verloren.
+        """
+        response.encoding = "utf-8"   # text/event-stream ohne charset → sonst latin-1
+        parser = SuggestionStreamParser()
+        ttft   = None
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if req.cancelled.is_set() or race.lost(ep):
+                return None, 0.0
+            if not line or line.startswith(":"):
+                continue              # Keep-Alive / Kommentar (z.B. OpenRouter)
+            if not line.startswith("data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == "[DONE]":
+                break
+            chunk = json.loads(payload)
+            if "error" in chunk:
+                err = chunk["error"]
+                raise RuntimeError(err.get("message", err) if isinstance(err, dict) else err)
+            choices = chunk.get("choices") or [{}]
+            delta   = (choices[0].get("delta") or {}).get("content") or ""
+            if not delta:
+                continue
+            if ttft is None:
+                ttft = time.monotonic() - t0
+                if not race.claim(ep):
+                    return None, 0.0  # anderer Endpunkt war schneller
+            if parser.feed(delta):
+                self._notify(req, "\n".join(parser.items), final=False)
+        parser.finish()
+        if ttft is None:
+            # Leere Antwort: trotzdem beanspruchen, sonst hängt das Rennen
+            ttft = time.monotonic() - t0
+            if not race.claim(ep):
+                return None, 0.0
+        return parser.text.strip(), ttft
+
+    def _notify(self, req: _Request, suggestions: str, final: bool = True,
+                cached_hit: bool = False, error: bool = False):
+        # Latest-wins: Antworten überholter Anfragen nie anzeigen
+        if not self._is_current(req):
+            with self._lock:
+                self.stats["stale"] += 1
+            return
+        if final:
+            with self._lock:
+                self.stats["delivered"] += 1
+            if not (error or cached_hit):
+                METRICS.record("ai.e2e", time.monotonic() - req.created)
+        self.bus.publish(AISuggestions(text=suggestions, final=final,
+                                       request_id=req.id, cached=cached_hit,
+                                       error=error, channel=req.channel,
+                                       latency_s=time.monotonic() - req.created))
@@ -6,26 +6,48 @@ Layout:
            + Profil-Leiste (Dropdown + Kontext-Feld + Profile-Manager-Button)
   Links : Pegel-Panel  (Mic-VU + Speaker-VU + Silence-Timer)
   Rechts: Live-Transkription + KI-Vorschläge
+
+Start: Fenster zuerst zeichnen, dann im Hintergrund Geräte scannen
+(PortAudio) und Whisper laden (faster-whisper/CTranslate2 werden erst dort
+importiert). Die Statuszeile zeigt die Phasen; Dauer seit Prozessstart
+landet in startup.* (Messung: startup_bench.py).
 """
 
+import time
+_T_START = time.perf_counter()      # Bezugspunkt aller Startzeiten
+
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
 import threading
-import time
+import bisect
 import math
 import os
 
 from mic_monitor    import MicMonitor, SpeakerMonitor
-from transcriber    import Transcriber
-from ai_suggestions import AISuggester
+from transcriber    import Transcriber, OTHER_SOURCES
+from transcriber_daemon import RemoteTranscriber
+from ai_suggestions import (AISuggester, backend_for_profile, fanout_profile,
+                            BACKEND_LOCAL, MAIN_CHANNEL)
 from audio_devices  import get_all_devices, get_default_mic, get_default_loopback, AudioDevice
+from event_bus      import (EventBus, SilenceChanged, TranscriptLine, AISuggestions,
+                            TurnEnded, QuestionDetected)
+from context_builder import ContextBuilder
+from prefetch       import PrefetchPolicy
+from metrics        import METRICS, SnapshotWriter
 from config import (
     SILENCE_LEVELS,
-    HOTKEY_SEND_TO_AI, HOTKEY_CLEAR_TRANSCRIPT, HOTKEY_AUTOSEND_TOGGLE,
+    HOTKEY_SEND_TO_AI, HOTKEY_CLEAR_TRANSCRIPT, HOTKEY_AUTOSEND_TOGGLE, HOTKEY_PROFILE,
     AUTOSEND_ENABLED, AUTOSEND_INTERVAL_SEC, AUTOSEND_MIN_LINES,
+    AUTOSEND_MODE, AUTOSEND_TURN_DEBOUNCE_SEC, AUTOSEND_TURN_MIN_GAP_SEC,
+    AUTOSEND_TURN_MIN_LINES,
     PROFILES_DIR, SYSTEM_PROMPT_FALLBACK,
+    PREFETCH_ENABLED, PROFILE_SECONDS,
+    FANOUT_ENABLED, FANOUT_PROFILES, FANOUT_MAX_PROFILES,
+    TRANSCRIBER_DAEMON,
 )
 
+_T_IMPORTED = time.perf_counter()
+
 # ── Farb-Schema ──────────────────────────────────────────────────────────────
 C = {
     "bg":        "#1a1a2e",
@@ -51,6 +73,7 @@ C = {
 }
 
 LEVEL_COLORS = [C["bg"], C["yellow"], C["orange"], C["red"]]
+AUTOSEND_MODES = {"interval": "Intervall", "turn": "Sprecherwechsel"}
 LEVEL_LABELS = ["OK – du sprichst", "⚠ 1 Min. still", "⚠⚠ 1,5 Min.", "🔴 2 Min. still!"]
 DEFAULT_CTX  = 20
 MAX_LINES    = 200
@@ -315,19 +338,83 @@ class ProfileManagerWindow(tk.Toplevel):
 #  HAUPTANWENDUNG
 # ══════════════════════════════════════════════════════════════════════════════
 
+class MetricsWindow(tk.Toplevel):
+    """
+    Live-Ansicht der Metriken (metrics.py) + Bus-/KI-Zähler.
+    Aktualisiert sich jede Sekunde, solange das Fenster offen ist.
+    """
+
+    REFRESH_MS = 1000
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.title("Metriken")
+        self.configure(bg=C["bg"])
+        self.geometry("760x560")
+        self._app = app
+        self._text = scrolledtext.ScrolledText(
+            self, bg=C["panel"], fg=C["text"], font=("Consolas", 9),
+            relief="flat", bd=6, wrap="none"
+        )
+        self._text.pack(fill="both", expand=True)
+        self._refresh()
+
+    def _refresh(self):
+        if not self.winfo_exists():
+            return
+        snap = METRICS.snapshot()
+        out  = [f"Laufzeit {snap['uptime_s']:.0f}s"
+                + ("" if METRICS.enabled else "   (METRICS_ENABLED = False)"), ""]
+        out.append(f"{'Stufe':<34}{'n':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+        for name, h in snap["histograms"].items():
+            if not h["count"]:
+                continue
+            # RTF ist ein Verhältnis, alles andere Sekunden → ms
+            fmt = (lambda v: f"{v:.3f}") if name.endswith("rtf") else (lambda v: f"{v * 1000:.1f}")
+            out.append(f"{name:<34}{h['count']:>7}" + "".join(
+                f"{fmt(h[k]):>10}" for k in ("p50", "p90", "p99", "max")))
+        if snap["counters"]:
+            out += ["", "Zähler:"]
+            out += [f"  {n:<32}{v:>8}" for n, v in snap["counters"].items()]
+        out += ["", "KI:  " + "  ".join(f"{k}={v}" for k, v in self._app.ai_suggester.stats.items())]
+        for ep in self._app.ai_suggester.provider_stats():
+            out.append(f"  {ep['name']:<14} ok={ep['successes']} fehler={ep['failures']} "
+                       f"429={ep['rate_limited']} {'frei' if ep['available'] else 'gesperrt'}")
+        out += ["", "Event-Bus:"]
+        for sub in self._app.bus.stats():
+            out.append(f"  {sub['name']:<16} zugestellt={sub['delivered']:<6} "
+                       f"verworfen={sub['dropped']:<4} queue={sub['queued']:<3} "
+                       f"Ø {sub['latency_avg_ms']:.1f} ms")
+
+        self._text.config(state="normal")
+        self._text.delete("1.0", "end")
+        self._text.insert("1.0", "\n".join(out))
+        self._text.config(state="disabled")
+        self.after(self.REFRESH_MS, self._refresh)
+
+
 class ConversationAssistantApp:
 
     def __init__(self, root: tk.Tk):
         self.root = root
+        # Start-Phasen: Name → Sekunden seit Prozessstart (startup.* in METRICS)
+        self._startup     = {}
+        self._bench_until = None        # startup_bench.py: nach dieser Phase beenden
+        self._mark_startup("imports", _T_IMPORTED)
         root.title("Conversation Assistant")
         root.configure(bg=C["bg"])
         root.geometry("1300x880")
         root.minsize(1000, 700)
 
-        self.mic_monitor     = MicMonitor()
+        self.bus             = EventBus()
+        self.mic_monitor     = MicMonitor(self.bus)
         self.speaker_monitor = SpeakerMonitor()
-        self.transcriber     = Transcriber()
-        self.ai_suggester    = AISuggester()
+        # Mit Dienst: Modell + Streams überleben das Schließen des Fensters
+        self.transcriber     = (RemoteTranscriber(self.bus) if TRANSCRIBER_DAEMON
+                                else Transcriber(self.bus))
+        self.ai_suggester    = AISuggester(self.bus)
+        self.context_builder = ContextBuilder(self.ai_suggester.summarize)
+        self.metrics_writer  = SnapshotWriter(METRICS)
 
         self.transcriber.speaker_monitor = self.speaker_monitor
 
@@ -340,12 +427,26 @@ class ConversationAssistantApp:
         self._loopback_enabled = tk.BooleanVar(value=True)
         self._auto_scroll      = tk.BooleanVar(value=True)
         self._ai_ctx_lines     = tk.IntVar(value=DEFAULT_CTX)
+        self.context_builder.set_max_lines(DEFAULT_CTX)
+        self._ai_ctx_lines.trace_add(
+            "write", lambda *_: self.context_builder.set_max_lines(self._ai_ctx_lines.get()))
 
         # Auto-Send
         self._autosend_enabled  = tk.BooleanVar(value=AUTOSEND_ENABLED)
         self._autosend_interval = tk.IntVar(value=AUTOSEND_INTERVAL_SEC)
+        self._autosend_mode     = tk.StringVar(value=AUTOSEND_MODES.get(AUTOSEND_MODE, "Intervall"))
         self._autosend_last     = time.time()
         self._autosend_last_linecount = 0
+        self._autosend_after    = None    # geplanter Turn-Send (Debounce)
+        self._autosend_trigger_ts = 0.0   # ts des Events, das ihn ausgelöst hat
+
+        # Prefetch vor Stille-Warnungen
+        self._prefetch         = PrefetchPolicy() if PREFETCH_ENABLED else None
+        self._prefetch_id      = None   # Request-ID des zurückgehaltenen Prefetch
+        self._prefetch_result  = None   # (text, final, cached) – erst bei Warnung zeigen
+        self._lines_total      = 0      # alle bisher angehängten Zeilen
+        self._line_times       = []     # Aufnahmezeit je Transkriptzeile (Widget-Reihenfolge)
+        self._lines_at_request = 0      # Stand bei der letzten KI-Anfrage
 
         # ── Profil-State ──
         # Aktives Profil: Name des gewählten Profils (oder None = Fallback)
@@ -356,12 +457,16 @@ class ConversationAssistantApp:
             value=default_profile if default_profile else "– kein Profil –"
         )
 
+        # Fan-out: ein Trigger → mehrere Profile parallel, je ein Pane
+        self._fanout_enabled  = tk.BooleanVar(value=FANOUT_ENABLED)
+        self._fanout_profiles = [p for p in FANOUT_PROFILES if p in profiles][:FANOUT_MAX_PROFILES]
+        self._fanout_panes    = {}      # Profilname → (Status-Label, Text-Widget)
+
         self._build_ui()
-        self._load_devices()
         self._connect_backends()
-        self._start_backends()
-        self._register_hotkeys()
         self._update_loop()
+        # Alles Schwere erst, wenn das Fenster steht
+        self.root.after_idle(self._on_first_paint)
 
     # ══════════════════════════════════════════════════════════════════════════
     #  UI AUFBAU
@@ -463,6 +568,12 @@ class ConversationAssistantApp:
         )
         self._autosend_btn.pack(side="left", padx=(0, 6))
 
+        ttk.Combobox(
+            as_frm, textvariable=self._autosend_mode,
+            values=list(AUTOSEND_MODES.values()), state="readonly",
+            width=15, font=("Segoe UI", 9)
+        ).pack(side="left", padx=(0, 6))
+
         tk.Label(as_frm, text="alle",
                  bg=C["panel2"], fg=C["dim"],
                  font=("Segoe UI", 9)).pack(side="left")
@@ -519,6 +630,19 @@ class ConversationAssistantApp:
             font=("Segoe UI", 9), relief="flat",
             padx=8, pady=3, cursor="hand2",
             command=self._open_profile_manager
+        ).pack(side="left", padx=(0, 6))
+
+        # Fan-out: mehrere Profile parallel
+        tk.Checkbutton(
+            bar, text="⧉ Parallel", variable=self._fanout_enabled,
+            command=self._on_fanout_toggled,
+            bg=C["panel2"], fg=C["text"], selectcolor=C["accent"],
+            activebackground=C["panel2"], font=("Segoe UI", 9)
+        ).pack(side="left", padx=(0, 2))
+        tk.Button(
+            bar, text="…", bg=C["accent"], fg=C["text"],
+            font=("Segoe UI", 9), relief="flat", padx=6, pady=1, cursor="hand2",
+            command=self._open_fanout_selector
         ).pack(side="left", padx=(0, 16))
 
         # Trennlinie
@@ -730,6 +854,9 @@ class ConversationAssistantApp:
 
         btn = {"bg": C["accent"], "fg": C["text"], "relief": "flat",
                "padx": 8, "pady": 3, "cursor": "hand2", "font": ("Segoe UI", 9)}
+        tk.Button(hdr, text="🎲 Neu",
+                  command=lambda: self._send_to_ai(force=True),
+                  **btn).pack(side="right", padx=(4, 0))
         tk.Button(hdr, text="🤖 An KI  [Ctrl+Shift+A]",
                   command=self._send_to_ai, **btn).pack(side="right", padx=(4, 0))
         tk.Button(hdr, text="🗑 Leeren  [Ctrl+Shift+C]",
@@ -767,7 +894,6 @@ class ConversationAssistantApp:
                                            foreground="#c8f7c5")
         self.transcript_text.tag_configure("src_mic",      foreground="#e0e0e0")
         self.transcript_text.tag_configure("src_loopback", foreground="#ff6b6b")
-        self.transcript_text.tag_configure("src_mixed",    foreground="#e0e0e0")
         self.transcript_text.tag_configure("src_edit",     foreground="#00d26a")
         self.transcript_text.tag_raise("src_edit")
         self.transcript_text.tag_raise("new_chunk")
@@ -792,6 +918,11 @@ class ConversationAssistantApp:
         )
         self.ai_text.grid(row=4, column=0, sticky="nsew", padx=10, pady=(2, 10))
 
+        # Fan-out-Panes (ersetzen ai_text solange "⧉ Parallel" aktiv ist)
+        self._fanout_frame = tk.Frame(pnl, bg=C["panel"])
+        self._ai_panel     = pnl
+        self._rebuild_fanout_panes()
+
     def _build_statusbar(self):
         bar = tk.Frame(self.root, bg=C["accent"], height=24)
         bar.pack(fill="x", side="bottom")
@@ -802,6 +933,10 @@ class ConversationAssistantApp:
         tk.Label(bar, text="Ctrl+Shift+A = KI  |  Ctrl+Shift+C = Leeren",
                  bg=C["accent"], fg=C["dim"],
                  font=("Segoe UI", 9)).pack(side="right", padx=8)
+        tk.Button(bar, text="📊 Metriken", bg=C["accent"], fg=C["text"],
+                  font=("Segoe UI", 8), relief="flat", padx=6, pady=0,
+                  cursor="hand2", command=self._open_metrics
+                  ).pack(side="right", padx=(0, 4))
 
     # ══════════════════════════════════════════════════════════════════════════
     #  PROFIL-LOGIK
@@ -840,6 +975,100 @@ class ConversationAssistantApp:
 
         self._active_profile_lbl.config(text=self._fmt_active_profile())
 
+        # Gelöschte/umbenannte Profile aus dem Parallel-Modus nehmen
+        kept = [p for p in self._fanout_profiles if p in profiles]
+        if kept != self._fanout_profiles:
+            self._fanout_profiles = kept
+            self._rebuild_fanout_panes()
+
+    # ── Fan-out ──────────────────────────────────────────────────────────────
+
+    def _fanout_active(self) -> bool:
+        return self._fanout_enabled.get() and bool(self._fanout_profiles)
+
+    def _on_fanout_toggled(self):
+        if self._fanout_enabled.get() and not self._fanout_profiles:
+            self._open_fanout_selector()
+        self._rebuild_fanout_panes()
+
+    def _open_fanout_selector(self):
+        """Kleines Fenster: Profile für den Parallel-Modus ankreuzen."""
+        win = tk.Toplevel(self.root)
+        win.title("Profile parallel")
+        win.configure(bg=C["panel"])
+        win.transient(self.root)
+        tk.Label(win, text=f"Bis zu {FANOUT_MAX_PROFILES} Profile gleichzeitig:",
+                 bg=C["panel"], fg=C["blue"],
+                 font=("Segoe UI", 9, "bold")).pack(anchor="w", padx=10, pady=(10, 4))
+        chosen = {}
+        for name in _list_profiles():
+            var = tk.BooleanVar(value=name in self._fanout_profiles)
+            chosen[name] = var
+            tk.Checkbutton(win, text=name, variable=var,
+                           bg=C["panel"], fg=C["text"], selectcolor=C["accent"],
+                           activebackground=C["panel"],
+                           font=("Segoe UI", 9)).pack(anchor="w", padx=14)
+
+        def _apply():
+            picked = [n for n, v in chosen.items() if v.get()]
+            if len(picked) > FANOUT_MAX_PROFILES:
+                self._set_status(f"Parallel: nur die ersten {FANOUT_MAX_PROFILES} Profile")
+            self._fanout_profiles = picked[:FANOUT_MAX_PROFILES]
+            self._fanout_enabled.set(bool(self._fanout_profiles))
+            self._rebuild_fanout_panes()
+            win.destroy()
+
+        tk.Button(win, text="Übernehmen", command=_apply,
+                  bg=C["accent"], fg=C["text"], relief="flat",
+                  font=("Segoe UI", 9), padx=8, pady=3,
+                  cursor="hand2").pack(anchor="e", padx=10, pady=10)
+
+    def _rebuild_fanout_panes(self):
+        for child in self._fanout_frame.winfo_children():
+            child.destroy()
+        self._fanout_panes = {}
+        if not self._fanout_active():
+            self._fanout_frame.grid_remove()
+            self.ai_text.grid()
+            return
+        self.ai_text.grid_remove()
+        self._fanout_frame.grid(row=4, column=0, sticky="nsew", padx=10, pady=(2, 10))
+        self._fanout_frame.rowconfigure(1, weight=1)
+        for col, name in enumerate(self._fanout_profiles):
+            self._fanout_frame.columnconfigure(col, weight=1, uniform="fanout")
+            hdr = tk.Frame(self._fanout_frame, bg=C["panel"])
+            hdr.grid(row=0, column=col, sticky="ew", padx=(0 if col == 0 else 6, 0))
+            tk.Label(hdr, text=name, bg=C["panel"], fg=C["blue"],
+                     font=("Segoe UI", 9, "bold")).pack(side="left")
+            status = tk.Label(hdr, text="", bg=C["panel"], fg=C["dim"],
+                              font=("Segoe UI", 8))
+            status.pack(side="right")
+            text = scrolledtext.ScrolledText(
+                self._fanout_frame, bg=C["sug_bg"], fg=C["text"],
+                font=("Segoe UI", 10), relief="flat", bd=0,
+                wrap="word", state="disabled", width=20
+            )
+            text.grid(row=1, column=col, sticky="nsew",
+                      padx=(0 if col == 0 else 6, 0), pady=(2, 0))
+            self._fanout_panes[name] = (status, text)
+
+    def _show_fanout(self, ev: AISuggestions):
+        pane = self._fanout_panes.get(fanout_profile(ev.channel))
+        if pane is None:
+            return                  # Pane inzwischen abgewählt
+        status, text = pane
+        ms = int(ev.latency_s * 1000)
+        if ev.error and text.get("1.0", "end-1c").strip():
+            status.config(text=f"⚠ {ev.text.strip('[]')[:40]}")
+            return
+        text.config(state="normal")
+        text.delete("1.0", "end")
+        text.insert("1.0", ev.text)
+        text.config(state="disabled")
+        status.config(text=(f"⟳ {ms} ms" if not ev.final else
+                            "✔ Cache" if ev.cached else
+                            f"✔ {ms} ms"))
+
     def _get_active_system_prompt(self) -> str:
         """Gibt den System-Prompt des aktiven Profils zurück, oder Fallback."""
         if self._active_profile_name:
@@ -927,48 +1156,69 @@ class ConversationAssistantApp:
     #  GERÄTE-VERWALTUNG
     # ══════════════════════════════════════════════════════════════════════════
 
-    def _load_devices(self):
+    def _load_devices(self, initial: bool = False):
+        """Geräte-Scan im Hintergrund – PortAudio-Init blockiert sonst die UI."""
         self._device_status.config(text="⟳ Erkenne Geräte …")
-        self.root.update_idletasks()
-        try:
-            mics, loopbacks = get_all_devices()
-            self._mic_devices      = mics
-            self._loopback_devices = loopbacks
-
-            mic_names = [d.display_name for d in mics] or ["Kein Mikrofon gefunden"]
-            self._mic_dropdown["values"] = mic_names
-
-            default_mic = get_default_mic()
-            if default_mic:
-                self._active_mic = default_mic
-                try:
-                    self._mic_dropdown.current(
-                        [d.index for d in mics].index(default_mic.index))
-                except ValueError:
-                    self._mic_dropdown.current(0)
-            elif mics:
-                self._active_mic = mics[0]
+
+        def scan():
+            try:
+                mics, loopbacks = get_all_devices()
+                result = (mics, loopbacks,
+                          get_default_mic(mics), get_default_loopback(loopbacks))
+            except Exception as e:
+                result = e
+            self.root.after(0, lambda: self._apply_devices(result, initial))
+
+        threading.Thread(target=scan, name="device-scan", daemon=True).start()
+
+    def _apply_devices(self, result, initial: bool):
+        if isinstance(result, Exception):
+            self._device_status.config(text=f"Fehler: {result}")
+            return
+        mics, loopbacks, default_mic, default_lb = result
+        self._mic_devices      = mics
+        self._loopback_devices = loopbacks
+
+        mic_names = [d.display_name for d in mics] or ["Kein Mikrofon gefunden"]
+        self._mic_dropdown["values"] = mic_names
+
+        if default_mic:
+            self._active_mic = default_mic
+            try:
+                self._mic_dropdown.current(
+                    [d.index for d in mics].index(default_mic.index))
+            except ValueError:
                 self._mic_dropdown.current(0)
+        elif mics:
+            self._active_mic = mics[0]
+            self._mic_dropdown.current(0)
+
+        lb_names = [d.display_name for d in loopbacks] or ["Kein Loopback gefunden"]
+        self._lb_dropdown["values"] = lb_names
 
-            lb_names = [d.display_name for d in loopbacks] or ["Kein Loopback gefunden"]
-            self._lb_dropdown["values"] = lb_names
-
-            default_lb = get_default_loopback()
-            if default_lb:
-                self._active_loopback = default_lb
-                try:
-                    self._lb_dropdown.current(
-                        [d.index for d in loopbacks].index(default_lb.index))
-                except ValueError:
-                    self._lb_dropdown.current(0)
-            elif loopbacks:
-                self._active_loopback = loopbacks[0]
+        if default_lb:
+            self._active_loopback = default_lb
+            try:
+                self._lb_dropdown.current(
+                    [d.index for d in loopbacks].index(default_lb.index))
+            except ValueError:
                 self._lb_dropdown.current(0)
+        elif loopbacks:
+            self._active_loopback = loopbacks[0]
+            self._lb_dropdown.current(0)
 
-            self._device_status.config(
-                text=f"✔ {len(mics)} Mic(s), {len(loopbacks)} Loopback(s)")
-        except Exception as e:
-            self._device_status.config(text=f"Fehler: {e}")
+        self._device_status.config(
+            text=f"✔ {len(mics)} Mic(s), {len(loopbacks)} Loopback(s)")
+
+        if initial:
+            # Erster Scan: Geräte an die schon laufenden Backends geben
+            # (Transcriber übernimmt sie auch, wenn Whisper noch lädt)
+            if self._mic_enabled.get() and self._active_mic:
+                self.mic_monitor.set_device(self._active_mic)
+                self.transcriber.set_mic_device(self._active_mic)
+            if self._loopback_enabled.get() and self._active_loopback:
+                self.transcriber.set_loopback_device(self._active_loopback)
+            self._mark_startup("devices")
 
     def _on_mic_selected(self, event=None):
         idx = self._mic_dropdown.current()
@@ -1025,25 +1275,49 @@ class ConversationAssistantApp:
     # ══════════════════════════════════════════════════════════════════════════
 
     def _connect_backends(self):
-        self.mic_monitor.register_callback(self._on_silence_change)
-        self.transcriber.register_callback(self._on_transcript)
-        self.ai_suggester.register_callback(self._on_ai_response)
+        # Jeder Handler bekommt eigene Queue → Tk-Marshaling bremst keine Producer
+        self.bus.subscribe(SilenceChanged, self._on_silence_change, name="ui.silence")
+        self.bus.subscribe(TranscriptLine, self._on_transcript,     name="ui.transcript")
+        self.bus.subscribe(AISuggestions,  self._on_ai_response,    name="ui.ai")
+        self.bus.subscribe(TurnEnded,        self._on_conversation_event, name="ui.turn")
+        self.bus.subscribe(QuestionDetected, self._on_conversation_event, name="ui.question")
+
+    def _on_first_paint(self):
+        self.root.update_idletasks()
+        self._mark_startup("first_paint")
+        self._set_status("Fenster bereit  ·  erkenne Geräte, lade Whisper …")
+        self._start_backends()
+        self._register_hotkeys()
 
     def _start_backends(self):
-        mic_dev = self._active_mic if self._mic_enabled.get() else None
-        self.mic_monitor.start(device=mic_dev)
-        self._set_status("Lade faster-whisper …")
-        threading.Thread(target=self._load_transcriber, daemon=True).start()
+        self.mic_monitor.start(device=None)      # Gerät folgt nach dem Scan
+        self.ai_suggester.start()
+        self.metrics_writer.start()
+        self._load_devices(initial=True)
+        threading.Thread(target=self._load_transcriber, name="whisper-load",
+                         daemon=True).start()
+
+    def _mark_startup(self, phase: str, t: float | None = None):
+        elapsed = (t if t is not None else time.perf_counter()) - _T_START
+        self._startup[phase] = elapsed
+        METRICS.record(f"startup.{phase}", elapsed)
+        print(f"[Startup] {phase}: {elapsed:.3f}s")
+        if phase == self._bench_until:
+            import json
+            print("STARTUP_JSON " + json.dumps(self._startup), flush=True)
+            self.root.after(0, self.on_close)
 
     def _load_transcriber(self):
         try:
-            self.transcriber.start()
-            if self._mic_enabled.get() and self._active_mic:
-                self.transcriber.set_mic_device(self._active_mic)
-            if self._loopback_enabled.get() and self._active_loopback:
-                self.transcriber.set_loopback_device(self._active_loopback)
+            self.transcriber.start(on_phase=lambda text: self.root.after(
+                0, lambda: self._set_status(text)))
+            self.root.after(0, lambda: self._mark_startup("whisper"))
+            info = self.transcriber.load_info
+            note = f"Whisper {info['device']}/{info['compute']}"
+            if info["fallbacks"]:
+                note += " (Fallback)"
             self.root.after(0, lambda: self._set_status(
-                "Bereit  ·  Mic + Speaker werden transkribiert"))
+                f"Bereit  ·  {note}  ·  Mic + Speaker werden transkribiert"))
         except Exception as e:
             msg = str(e)
             self.root.after(0, lambda m=msg: self._set_status(f"Fehler: {m}"))
@@ -1058,24 +1332,76 @@ class ConversationAssistantApp:
             keyboard.add_hotkey(HOTKEY_SEND_TO_AI,       self._send_to_ai)
             keyboard.add_hotkey(HOTKEY_CLEAR_TRANSCRIPT, self._clear_transcript)
             keyboard.add_hotkey(HOTKEY_AUTOSEND_TOGGLE,  self._toggle_autosend)
+            keyboard.add_hotkey(HOTKEY_PROFILE,
+                                lambda: self.root.after(0, self._start_profiling))
         except Exception as e:
             print(f"[Hotkeys] Fallback: {e}")
             self.root.bind("<Control-Shift-A>", lambda e: self._send_to_ai())
             self.root.bind("<Control-Shift-C>", lambda e: self._clear_transcript())
             self.root.bind("<Control-Shift-S>", lambda e: self._toggle_autosend())
+            self.root.bind("<Control-Shift-P>", lambda e: self._start_profiling())
+
+    def _start_profiling(self, seconds=None):
+        """Sampling-Profiler aller Threads; Modul wird erst hier geladen."""
+        import profiler
+        prof = profiler.start_profile(
+            seconds or PROFILE_SECONDS,
+            on_done=lambda collapsed, summary: self.root.after(
+                0, lambda: self._set_status(f"📈 Profil gespeichert: {summary}")))
+        if prof is None:
+            self._set_status("Profiler läuft bereits …")
+        else:
+            self._set_status(f"📈 Profiler läuft ({prof.seconds:.0f}s) …")
 
     # ══════════════════════════════════════════════════════════════════════════
     #  CALLBACKS
     # ══════════════════════════════════════════════════════════════════════════
 
-    def _on_silence_change(self, level, silence_s):
-        self.root.after(0, lambda: self._apply_silence_level(level))
+    def _on_silence_change(self, ev: SilenceChanged):
+        self.root.after(0, lambda: self._apply_silence_level(ev.level))
+
+    def _on_transcript(self, ev: TranscriptLine):
+        self.root.after(0, lambda: self._apply_transcript(ev))
+
+    def _apply_transcript(self, ev: TranscriptLine):
+        if ev.source in OTHER_SOURCES:
+            self._cancel_turn_autosend(ev)
+        self._render("transcript", ev, self._append_transcript, ev.text, ev.source, ev.t_start)
 
-    def _on_transcript(self, text, is_partial, source="mic"):
-        self.root.after(0, lambda: self._append_transcript(text, source))
+    def _on_ai_response(self, ev: AISuggestions):
+        self.root.after(0, lambda: self._render("ai", ev, self._handle_ai_response, ev))
 
-    def _on_ai_response(self, suggestions):
-        self.root.after(0, lambda: self._show_ai_suggestions(suggestions))
+    @staticmethod
+    def _render(kind, ev, fn, *args):
+        """Tk-Update mit Metriken: Wartezeit bis zum Tk-Thread + Render-Dauer."""
+        METRICS.record(f"ui.lag.{kind}", time.monotonic() - ev.ts)
+        with METRICS.span(f"ui.render.{kind}"):
+            fn(*args)
+
+    def _on_conversation_event(self, ev):
+        self.root.after(0, lambda: self._schedule_turn_autosend(ev))
+
+    def _handle_ai_response(self, ev: AISuggestions):
+        if ev.channel != MAIN_CHANNEL:
+            self._show_fanout(ev)
+            return
+        if self._prefetch_id is not None and ev.request_id == self._prefetch_id:
+            if ev.error:
+                # Fehlgeschlagener Prefetch: nichts anzeigen, Warnung holt normal nach
+                self._prefetch_id = None
+                self._prefetch_result = None
+                return
+            # Prefetch: zurückhalten bis die Stille-Warnung kommt
+            self._prefetch_result = (ev.text, ev.final, ev.cached)
+            if ev.final:
+                self._set_status("⚡ Vorschläge vorbereitet")
+            return
+        if ev.error and self.ai_text.get("1.0", "end-1c").strip():
+            # Letzte brauchbare Vorschläge stehen lassen, Fehler nur in der Statuszeile
+            self.ai_status.config(text="⚠ alte Vorschläge")
+            self._set_status(ev.text.strip("[]"))
+            return
+        self._show_ai_suggestions(ev.text, ev.final, ev.cached)
 
     # ══════════════════════════════════════════════════════════════════════════
     #  UI UPDATES
@@ -1088,6 +1414,19 @@ class ConversationAssistantApp:
                      else C["accent"])
             dot.config(fg=color)
 
+        if level == 0:
+            if self._prefetch is not None:
+                self._prefetch.reset()
+        elif self._prefetch_id is not None:
+            # Warnung ist da → vorgeladene Vorschläge sofort zeigen
+            self._prefetch_id = None
+            if self._prefetch_result is not None:
+                text, final, cached = self._prefetch_result
+                self._show_ai_suggestions(text, final, cached)
+            else:
+                self.ai_status.config(text="⟳ Anfrage läuft …")
+            self._prefetch_result = None
+
     def _update_loop(self):
         mic_rms = self.mic_monitor.current_rms
         self._update_vu(self._mic_bars, mic_rms / 3000.0, C["green"])
@@ -1107,6 +1446,12 @@ class ConversationAssistantApp:
                 C["green"])
         )
 
+        # Kein Prefetch, solange eine Anfrage des Nutzers läuft – latest-wins
+        # würde sie sonst abbrechen und durch das versteckte Ergebnis ersetzen
+        if (self._prefetch is not None and not self.ai_suggester.busy()
+                and self._prefetch.check(sil, self._lines_total > self._lines_at_request)):
+            self._prefetch.commit(self._send_to_ai(prefetch=True))
+
         self.rms_thresh_label.config(
             text=f"Schwelle: {self.threshold_var.get()}")
 
@@ -1115,29 +1460,33 @@ class ConversationAssistantApp:
         self._ctx_info_lbl.config(text=f"  ·  KI bekommt letzte {n} Zeilen")
 
         try:
-            content = self.transcript_text.get("1.0", "end-1c")
-            n_lines = len([l for l in content.splitlines() if l.strip()])
+            # Zeilenzahl über den Index statt den ganzen Text zu scannen
+            n_lines = int(self.transcript_text.index("end-1c").split(".")[0]) - 1
             self._line_count_lbl.config(text=f"{n_lines} Zeilen")
         except Exception:
             pass
 
-        if self._autosend_enabled.get():
+        if self._autosend_enabled.get() and self._autosend_mode_key() == "interval":
             interval  = self._autosend_interval.get()
             elapsed   = time.time() - self._autosend_last
             remaining = max(0, interval - elapsed)
             self._autosend_countdown.config(text=f"{int(remaining)}s")
 
             if elapsed >= interval:
-                content   = self.transcript_text.get("1.0", "end-1c")
-                cur_lines = len([l for l in content.splitlines() if l.strip()])
-                new_lines = cur_lines - self._autosend_last_linecount
-                if new_lines >= AUTOSEND_MIN_LINES:
+                new_lines = self._lines_total - self._autosend_last_linecount
+                throttled = self._ai_throttled_for()
+                if throttled > 0:
+                    # Kontingent knapp / Anbieter bittet um Pause → nicht nachlegen
+                    self._set_status(f"Auto-Send pausiert: KI-Limit (frei in {throttled:.0f}s)")
+                elif new_lines >= AUTOSEND_MIN_LINES:
                     self._send_to_ai()
-                    self._autosend_last_linecount = cur_lines
+                    self._autosend_last_linecount = self._lines_total
                 else:
                     self._set_status(
                         f"Auto-Send: zu wenig neue Zeilen ({new_lines}/{AUTOSEND_MIN_LINES}), warte...")
                 self._autosend_last = time.time()
+        elif self._autosend_enabled.get():
+            self._autosend_countdown.config(text="⇄")
 
         self.root.after(60, self._update_loop)
 
@@ -1157,13 +1506,13 @@ class ConversationAssistantApp:
             line_num  = cursor.split(".")[0]
             line_start = f"{line_num}.0"
             line_end   = f"{line_num}.end"
-            for tag in ("src_mic", "src_loopback", "src_mixed"):
+            for tag in ("src_mic", "src_loopback"):
                 self.transcript_text.tag_remove(tag, line_start, line_end)
             self.transcript_text.tag_add("src_edit", line_start, line_end)
         except Exception:
             pass
 
-    def _append_transcript(self, text, source="mic"):
+    def _append_transcript(self, text, source="mic", t_start=None):
         at_end = self.transcript_text.yview()[1] >= 0.95
         try:
             cursor_pos = self.transcript_text.index(tk.INSERT)
@@ -1172,18 +1521,39 @@ class ConversationAssistantApp:
 
         content = self.transcript_text.get("1.0", "end-1c")
         lines   = content.splitlines()
+        if len(self._line_times) != len(lines):
+            # Zeilen von Hand eingefügt/gelöscht → alles Bisherige gilt als älter
+            self._line_times = [float("-inf")] * len(lines)
         if len(lines) >= MAX_LINES:
             overflow = len(lines) - MAX_LINES + 1
             self.transcript_text.delete("1.0", f"{overflow + 1}.0")
+            del self._line_times[:overflow]
 
         src_tag    = f"src_{source}"
-        src_prefix = {"mic": "🎙 ", "loopback": "🔊 ", "mixed": "🎙🔊 "}.get(source, "")
+        src_prefix = {"mic": "🎙 ", "loopback": "🔊 "}.get(source, "")
         display    = src_prefix + text
-
-        ins_start = self.transcript_text.index("end-1c")
+        self.context_builder.add_line(display, t_start)
+        self._lines_total += 1
+
+        # Neues Material → zurückgehaltener Prefetch ist veraltet
+        if self._prefetch_id is not None:
+            self.ai_suggester.cancel(self._prefetch_id)
+            self._prefetch_id     = None
+            self._prefetch_result = None
+            self._prefetch.invalidate()
+
+        # Nach Aufnahmezeit einsortieren: ein spät fertiges Ergebnis landet
+        # vor jüngeren Zeilen statt am Ende
+        if t_start is None:
+            t_start = self._line_times[-1] if self._line_times else 0.0
+        row = bisect.bisect_right(self._line_times, t_start)
+        self._line_times.insert(row, t_start)
+        pos = "end-1c" if row == len(self._line_times) - 1 else f"{row + 1}.0"
+
+        ins_start = self.transcript_text.index(pos)
         self._is_whisper_insert = True
-        self.transcript_text.insert("end", display + "\n", (src_tag, "new_chunk"))
-        ins_end = self.transcript_text.index("end-1c")
+        self.transcript_text.insert(ins_start, display + "\n", (src_tag, "new_chunk"))
+        ins_end = self.transcript_text.index(f"{ins_start} lineend")
         self._is_whisper_insert = False
 
         if cursor_pos:
@@ -1203,20 +1573,24 @@ class ConversationAssistantApp:
         except Exception:
             pass
 
-    def _show_ai_suggestions(self, suggestions):
+    def _show_ai_suggestions(self, suggestions, final=True, cached=False):
         self.ai_text.config(state="normal")
         self.ai_text.delete("1.0", "end")
         self.ai_text.insert("1.0", suggestions)
         self.ai_text.config(state="disabled")
-        self.ai_status.config(text="✔ Aktualisiert")
+        status = ("⟳ empfange …" if not final else
+                  "✔ Aus Cache (nichts Neues gesagt)" if cached else
+                  "✔ Aktualisiert")
+        self.ai_status.config(text=status)
 
-    def _send_to_ai(self):
+    def _send_to_ai(self, force=False, prefetch=False) -> bool:
+        """True → eine Anfrage ging wirklich raus (kein leeres Transkript, kein Cache-Treffer)."""
         n       = self._ai_ctx_lines.get()
         content = self.transcript_text.get("1.0", "end-1c")
         lines   = [l for l in content.splitlines() if l.strip()]
         if not lines:
             self._set_status("Kein Transkript vorhanden.")
-            return
+            return False
 
         # ── Kontext-Header ──────────────────────────────────────────────────
         header_parts = []
@@ -1230,17 +1604,50 @@ class ConversationAssistantApp:
         if ctx_note:
             header_parts.append(f"Nutzer-Kontext: {ctx_note}")
 
-        header  = "\n".join(header_parts) + "\n\n"
-        context = header + "\n".join(lines[-n:])
+        header = "\n".join(header_parts) + "\n\n"
         # ────────────────────────────────────────────────────────────────────
 
-        self._highlight_context(lines, n)
-        self.ai_status.config(text="⟳ Anfrage läuft …")
-        self._set_status(f"KI-Anfrage: letzte {min(n, len(lines))} Zeilen …")
+        # Neueste Zeilen wörtlich (Token-Budget) + Zusammenfassung des Rests
+        context, n_recent = self.context_builder.build(lines, header, n)
+
+        if self._fanout_active():
+            if prefetch:
+                return False        # Prefetch nur für die Einzelansicht
+            self._highlight_context(lines, n_recent)
+            for status, _text in self._fanout_panes.values():
+                status.config(text="⟳ …")
+            self._set_status(f"KI-Anfrage parallel an {len(self._fanout_panes)} Profile: "
+                             f"letzte {n_recent} Zeilen …")
+            self.ai_suggester.request_fanout(
+                context,
+                {name: (_load_profile(name), backend_for_profile(name))
+                 for name in self._fanout_profiles},
+                force=force)
+            self._lines_at_request = self._lines_total
+            return True
+
+        # Backend (API oder lokales Modell) hängt am aktiven Profil
+        backend = backend_for_profile(self._active_profile_name)
+
+        if prefetch:
+            self._set_status("⚡ Bereite Vorschläge vor (Prefetch) …")
+        else:
+            self._highlight_context(lines, n_recent)
+            self.ai_status.config(text="⟳ Anfrage läuft (lokal) …" if backend == BACKEND_LOCAL
+                                  else "⟳ Anfrage läuft …")
+            summary_note = " + Zusammenfassung" if n_recent < len(lines) and self.context_builder.summary else ""
+            self._set_status(f"KI-Anfrage: letzte {n_recent} Zeilen{summary_note} …")
 
         # System-Prompt aus aktivem Profil an den Suggester übergeben
         system_prompt = self._get_active_system_prompt()
-        self.ai_suggester.request_suggestions(context, system_prompt=system_prompt)
+        req_id = self.ai_suggester.request_suggestions(
+            context, system_prompt=system_prompt, force=force, backend=backend)
+        self._lines_at_request = self._lines_total
+        # Manuelle Anfrage überholt einen Prefetch (latest-wins im Suggester)
+        self._prefetch_id     = req_id if prefetch else None
+        self._prefetch_result = None
+        # Cache-Treffer ist schon zugestellt → nichts wartet oder läuft
+        return req_id is not None and self.ai_suggester.busy()
 
     def _highlight_context(self, all_lines, n):
         try:
@@ -1252,6 +1659,61 @@ class ConversationAssistantApp:
         except Exception:
             pass
 
+    def _ai_throttled_for(self) -> float:
+        """Sekunden bis die API wieder Anfragen annimmt (lokales Backend: nie gedrosselt)."""
+        if backend_for_profile(self._active_profile_name) == BACKEND_LOCAL:
+            return 0.0
+        return self.ai_suggester.throttled_for()
+
+    def _autosend_mode_key(self) -> str:
+        label = self._autosend_mode.get()
+        return next((k for k, v in AUTOSEND_MODES.items() if v == label), "interval")
+
+    def _schedule_turn_autosend(self, ev):
+        """Sprecherwechsel / Frage → nach kurzem Debounce an die KI."""
+        if not self._autosend_enabled.get() or self._autosend_mode_key() != "turn":
+            return
+        if self._autosend_after is not None:
+            self.root.after_cancel(self._autosend_after)
+        reason = "Frage erkannt" if isinstance(ev, QuestionDetected) else "Sprecherwechsel"
+        self._autosend_trigger_ts = ev.ts
+        self._autosend_after = self.root.after(
+            int(AUTOSEND_TURN_DEBOUNCE_SEC * 1000),
+            lambda: self._fire_turn_autosend(reason))
+
+    def _cancel_turn_autosend(self, line: TranscriptLine):
+        """Der andere redet weiter → geplanten Turn-Send verwerfen.
+
+        Nur Zeilen, die NACH dem auslösenden Event entstanden sind: die
+        Fragezeile selbst kommt über einen eigenen Bus-Worker und kann nach
+        QuestionDetected eintreffen."""
+        if self._autosend_after is None or line.ts <= self._autosend_trigger_ts:
+            return
+        self.root.after_cancel(self._autosend_after)
+        self._autosend_after = None
+        METRICS.incr("autosend.turn_cancelled")
+
+    def _fire_turn_autosend(self, reason):
+        self._autosend_after = None
+        if not self._autosend_enabled.get():
+            return
+        since = time.time() - self._autosend_last
+        if since < AUTOSEND_TURN_MIN_GAP_SEC:
+            self._set_status(
+                f"Auto-Send: {reason}, aber Rate-Limit ({int(since)}/{AUTOSEND_TURN_MIN_GAP_SEC}s)")
+            return
+        new_lines = self._lines_total - self._autosend_last_linecount
+        if new_lines < AUTOSEND_TURN_MIN_LINES:
+            return
+        throttled = self._ai_throttled_for()
+        if throttled > 0:
+            self._set_status(f"Auto-Send: {reason}, aber KI-Limit (frei in {throttled:.0f}s)")
+            return
+        self._send_to_ai()
+        self._set_status(f"Auto-Send ({reason})")
+        self._autosend_last           = time.time()
+        self._autosend_last_linecount = self._lines_total
+
     def _toggle_autosend(self):
         enabled = not self._autosend_enabled.get()
         self._autosend_enabled.set(enabled)
@@ -1259,22 +1721,36 @@ class ConversationAssistantApp:
             self._autosend_btn.config(
                 text="⏱ AUTO  ● ", fg=C["green"], bg=C["on_bg"])
             self._autosend_last = time.time()
-            content = self.transcript_text.get("1.0", "end-1c")
-            self._autosend_last_linecount = len(
-                [l for l in content.splitlines() if l.strip()])
-            self._set_status(
-                f"Auto-Send AN – alle {self._autosend_interval.get()}s  [Ctrl+Shift+S zum Stoppen]")
+            self._autosend_last_linecount = self._lines_total
+            if self._autosend_mode_key() == "turn":
+                self._set_status(
+                    "Auto-Send AN – bei Sprecherwechsel/Frage  [Ctrl+Shift+S zum Stoppen]")
+            else:
+                self._set_status(
+                    f"Auto-Send AN – alle {self._autosend_interval.get()}s  [Ctrl+Shift+S zum Stoppen]")
         else:
             self._autosend_btn.config(
                 text="⏱ AUTO  ○", fg=C["off"], bg=C["off_bg"])
             self._autosend_countdown.config(text="")
+            if self._autosend_after is not None:
+                self.root.after_cancel(self._autosend_after)
+                self._autosend_after = None
             self._set_status("Auto-Send AUS")
 
     def _clear_transcript(self):
         self.transcript_text.delete("1.0", "end")
+        self._line_times = []
         self.transcriber.clear_buffer()
+        self.context_builder.reset()
+        self.ai_suggester.cancel_all()
+        self.ai_status.config(text="")
+        for status, _text in self._fanout_panes.values():
+            status.config(text="")
         self._set_status("Transkript geleert.")
 
+    def _open_metrics(self):
+        MetricsWindow(self.root, self)
+
     def _on_threshold_change(self, val):
         import config as cfg
         cfg.SPEAK_THRESHOLD_RMS = int(val)
@@ -1285,13 +1761,28 @@ class ConversationAssistantApp:
     def on_close(self):
         self.mic_monitor.stop()
         self.transcriber.stop()
+        self.ai_suggester.stop()
+        self.metrics_writer.stop()
+        self.bus.close()
         self.root.destroy()
 
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="VoiceCoach")
+    parser.add_argument("--profile", nargs="?", type=float, const=PROFILE_SECONDS,
+                        default=None, metavar="SEKUNDEN",
+                        help="Beim Start Sampling-Profiler aller Threads laufen lassen")
+    parser.add_argument("--startup-bench", choices=("first_paint", "devices", "whisper"),
+                        default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
     root = tk.Tk()
     app  = ConversationAssistantApp(root)
+    app._bench_until = args.startup_bench
     root.protocol("WM_DELETE_WINDOW", app.on_close)
+    if args.profile:
+        app._start_profiling(args.profile)
     root.mainloop()
 
 
@@ -6,9 +6,10 @@ Nutzt PyAudioWPatch für WASAPI-Loopback (Lautsprecher aufnehmen).
 
 Gibt strukturierte Gerätelisten zurück, die direkt in Dropdowns
 der UI verwendet werden können.
-"""
 
-import pyaudiowpatch as pyaudio
+pyaudiowpatch (PortAudio) wird erst beim ersten Scan geladen – die App ruft
+das im Hintergrund auf, damit das Fenster sofort erscheint.
+"""
 
 
 # ── Gerät-Typen ──────────────────────────────────────────────
@@ -43,6 +44,7 @@ def get_all_devices() -> tuple[list[AudioDevice], list[AudioDevice]]:
     Gibt (mic_devices, loopback_devices) zurück.
     Loopback-Geräte sind WASAPI-Loopback-Streams der Ausgabegeräte.
     """
+    import pyaudiowpatch as pyaudio
     mic_devices      = []
     loopback_devices = []
 
@@ -103,9 +105,11 @@ def get_all_devices() -> tuple[list[AudioDevice], list[AudioDevice]]:
     return mic_devices, loopback_devices
 
 
-def get_default_mic() -> AudioDevice | None:
-    """Gibt das Standard-Mikrofon zurück."""
-    mics, _ = get_all_devices()
+def get_default_mic(mics: list[AudioDevice] | None = None) -> AudioDevice | None:
+    """Gibt das Standard-Mikrofon zurück (mics: schon gescannte Liste)."""
+    import pyaudiowpatch as pyaudio
+    if mics is None:
+        mics, _ = get_all_devices()
     if not mics:
         return None
     pa = pyaudio.PyAudio()
@@ -121,7 +125,8 @@ def get_default_mic() -> AudioDevice | None:
     return mics[0] if mics else None
 
 
-def get_default_loopback() -> AudioDevice | None:
-    """Gibt das Standard-Loopback-Gerät zurück."""
-    _, loopbacks = get_all_devices()
+def get_default_loopback(loopbacks: list[AudioDevice] | None = None) -> AudioDevice | None:
+    """Gibt das Standard-Loopback-Gerät zurück (loopbacks: schon gescannte Liste)."""
+    if loopbacks is None:
+        _, loopbacks = get_all_devices()
     return loopbacks[0] if loopbacks else None
\ No newline at end of file
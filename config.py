@@ -19,11 +19,46 @@ SAMPLE_RATE            = 16000      # Whisper erwartet 16 kHz
 # Empfehlung für Echtzeit: "tiny" oder "base"
 #WHISPER_MODEL          = "base" #alt
 WHISPER_MODEL   = "TheTobyB/whisper-large-v3-turbo-german-ct2" #NEUBETTERWHISPER
+# Modell-Verwaltung (model_manager.py): Modelle liegen unter WHISPER_MODELS_DIR;
+# der Start sucht immer zuerst lokal und geht nur ins Netz, wenn nichts da ist
+WHISPER_MODELS_DIR = "models"
+WHISPER_OFFLINE    = False         # True = beim Start nie ins Netz (fehlt das Modell → Fehler)
 WHISPER_DEVICE     = "cuda"        # statt "cpu" NEUBETTERWHISPER
 WHISPER_COMPUTE    = "float16"     # statt "int8" NEUBETTERWHISPER
+# Scheitert (device, compute) beim Laden oder Aufwärmen (kein CUDA, cuDNN fehlt,
+# Typ nicht unterstützt), wird die nächste Stufe probiert – Start bricht nicht ab
+WHISPER_FALLBACK   = [("cuda", "float16"), ("cpu", "int8_float32"), ("cpu", "int8")]
+# Aufwärm-Decode (synthetisches Audio) vor "Bereit" → erste echte Äußerung
+# zahlt keine Kernel-/Allocator-Initialisierung mehr. 0 = aus
+WHISPER_WARMUP_SEC = 1.0
+# CPU-Feintuning (cpu_tuning.py) – 0 = automatisch bzw. Wert aus der Kalibrierung
+WHISPER_CPU_THREADS   = 0          # Intra-Op-Threads von CTranslate2 pro Decode
+WHISPER_NUM_WORKERS   = 0          # parallele Decodes (mic + loopback gleichzeitig)
+WHISPER_PIN_THREADS   = False      # Decode- und Aufnahme-Threads auf getrennte Kerne legen
+WHISPER_CAPTURE_CORES = 1          # so viele Kerne (von vorn) bleiben der Aufnahme
+WHISPER_TUNING_FILE   = "whisper_tuning.json"   # python cpu_tuning.py --calibrate
+# Micro-Batching: kurze Chunks derselben Quelle, die innerhalb des Fensters
+# anstehen, werden mit Stille-Trenner zu EINEM Decode verbunden und per
+# Wort-Zeitstempel wieder aufgeteilt (spart Fixkosten pro transcribe())
+WHISPER_BATCH_ENABLED   = False
+WHISPER_BATCH_WINDOW_MS = 150      # so lange auf weitere kurze Chunks warten
+WHISPER_BATCH_MAX       = 4        # max. Chunks pro Decode
+WHISPER_BATCH_CHUNK_SEC = 2.0      # nur Chunks bis zu dieser Länge gelten als kurz
 # VAD-Filter (Voice Activity Detection): überspringt stille Chunks → schneller
 WHISPER_VAD_FILTER     = False
 
+# Transkriptions-Dienst (transcriber_daemon.py): hält Whisper-Modell und
+# Aufnahme-Streams über UI-Neustarts hinweg; die App verbindet sich lokal per Socket
+TRANSCRIBER_DAEMON           = False      # False = Whisper im App-Prozess wie bisher
+TRANSCRIBER_DAEMON_PORT      = 8765       # nur 127.0.0.1
+TRANSCRIBER_DAEMON_AUTOSTART = True       # Dienst starten, falls keiner läuft
+TRANSCRIBER_DAEMON_START_SEC = 20         # so lange auf das Lauschen des Dienstes warten
+TRANSCRIBER_DAEMON_READY_SEC = 120        # Laden ohne Lebenszeichen → Fehler statt ewig warten
+# Zugangs-Token: schreibt der Dienst beim Start (nur für den Nutzer lesbar),
+# jeder Client schickt ihn als erste Nachricht – andere lokale Nutzer bleiben draußen
+TRANSCRIBER_DAEMON_TOKEN_FILE = os.path.join(os.path.expanduser("~"),
+                                             ".conversation_assistant_daemon.token")
+
 CHUNK_SECONDS          = 1.0          # Aufnahme-Intervall in Sekunden (1.5s = sehr reaktiv)
 MAX_TRANSCRIPT_LINES   = 200
 
@@ -66,6 +101,87 @@ else:
     ACTIVE_BASE_URL = GEMINI_BASE_URL
     ACTIVE_MODEL    = GEMINI_MODEL
 
+# ── Failover / Hedging über mehrere Endpunkte ──
+# Geordnete Liste OpenAI-kompatibler Endpunkte; der erste ist der Standard.
+# Für Failover z.B. AI_ENDPOINT_ORDER = ["openrouter", "gemini"] setzen
+# (dann müssen beide Keys eingetragen sein). Eigene Einträge (z.B. ein lokaler
+# Server) einfach an AI_ENDPOINTS anhängen.
+_PROVIDERS = {
+    "openrouter": {"base_url": OPENROUTER_BASE_URL, "api_key": OPENROUTER_API_KEY,
+                   "model": OPENROUTER_MODEL},
+    "gemini":     {"base_url": GEMINI_BASE_URL,     "api_key": GEMINI_API_KEY,
+                   "model": GEMINI_MODEL},
+}
+AI_ENDPOINT_ORDER = [API_PROVIDER]
+AI_ENDPOINTS = [dict(name=n, **_PROVIDERS[n]) for n in AI_ENDPOINT_ORDER]
+
+AI_HEDGE_ENABLED           = False  # 2. Anfrage an Backup, wenn der erste zu lange braucht
+AI_HEDGE_PERCENTILE        = 90     # "zu lange" = langsamer als p90 bis zum ersten Token
+AI_HEDGE_MIN_DELAY_SEC     = 0.8    # nie früher hedgen als nach …
+AI_HEDGE_DEFAULT_DELAY_SEC = 2.5    # … und so lange, solange noch keine Messwerte da sind
+AI_BREAKER_FAILURES        = 3      # Fehler in Folge → Endpunkt überspringen
+AI_BREAKER_COOLDOWN_SEC    = 30     # … für so lange, dann ein Probe-Versuch
+
+# ── Rate-Limit + Retry ──
+# Token-Bucket pro Endpunkt: schützt das Kontingent, wenn Auto-Send und
+# Hotkey gleichzeitig feuern. Pro Endpunkt überschreibbar über die Keys
+# "rate_per_min" / "burst" in AI_ENDPOINTS.
+AI_RATE_PER_MIN        = 12     # Anfragen pro Minute und Endpunkt (Dauerrate)
+AI_RATE_BURST          = 3      # so viele dürfen kurz hintereinander raus
+AI_RETRY_MAX           = 3      # Wiederholungen bei 429 / 5xx / Verbindungsfehler
+AI_RETRY_BASE_SEC      = 0.5    # Backoff: 0.5s, 1s, 2s … (mit Jitter)
+AI_RETRY_MAX_DELAY_SEC = 8      # einzelne Wartezeit höchstens …
+AI_LATENCY_BUDGET_SEC  = 15     # Gesamtzeit pro Anfrage inkl. Retries – danach aufgeben
+
+# ── HTTP-Verbindung zur KI-API ──
+AI_WORKERS   = 2       # max. gleichzeitige KI-Anfragen (fester Worker-Pool)
+AI_POOL_SIZE = 4       # Keep-Alive-Verbindungen pro Host im Session-Pool
+AI_WARMUP    = True    # beim Start Verbindung vorwärmen (TLS + DNS)
+AI_STREAM    = True    # Antwort streamen (SSE) → erster Vorschlag sofort sichtbar
+AI_MAX_TOKENS  = 300
+AI_TIMEOUT_SEC = 20    # Verbindungs-/Lese-Timeout pro Anfrage
+AI_COALESCE_MS = 1500  # Trigger kurz nach dem letzten Senden → zu einem Aufruf bündeln
+AI_CACHE_SIZE    = 32   # gespeicherte Antworten (LRU), 0 = Cache aus
+AI_CACHE_TTL_SEC = 300  # Cache-Treffer gelten max. 5 Minuten
+
+# ── Lokales Modell (offline, llama.cpp / GGUF) ──
+# Optional: pip install llama-cpp-python
+# Ein kleines quantisiertes Instruct-Modell (z.B. Qwen2.5-1.5B-Instruct Q4_K_M)
+# läuft auf der CPU – keine Netz-Latenz, keine Kosten pro Anfrage.
+LOCAL_LLM_MODEL_PATH = ""     # Pfad zur .gguf-Datei, leer = lokales Backend aus
+LOCAL_LLM_THREADS    = 4      # CPU-Threads für die Generierung
+LOCAL_LLM_CTX        = 2048   # Kontextfenster (Tokens) – Prompt + Antwort
+LOCAL_LLM_MAX_TOKENS = 160    # kurze Vorschläge → vorhersehbare Latenz
+LOCAL_LLM_PRELOAD    = True   # beim Start im Hintergrund laden und resident halten
+
+# Welches Backend pro Profil: "api" (AI_ENDPOINTS) oder "local"
+# Profile, die hier fehlen, nutzen AI_DEFAULT_BACKEND.
+AI_DEFAULT_BACKEND = "api"
+PROFILE_BACKENDS   = {
+    # "Standard": "local",
+}
+
+# ── Fan-out: ein Trigger → mehrere Profile parallel ──
+FANOUT_ENABLED      = False   # Startzustand des Schalters "⧉ Parallel"
+FANOUT_PROFILES     = []      # vorausgewählte Profile, z.B. ["Standard", "Debatte"]
+FANOUT_MAX_PROFILES = 3       # höchstens so viele Panes / gleichzeitige Anfragen
+
+# ── KI-Kontext (Token-Budget + laufende Zusammenfassung) ──
+CONTEXT_SUMMARY_ENABLED = True
+CONTEXT_RECENT_TOKENS   = 600    # neueste Zeilen wörtlich, bis zu diesem Budget
+CONTEXT_SUMMARY_TOKENS  = 200    # max. Länge der Zusammenfassung älterer Zeilen
+CONTEXT_TOKEN_CEILING   = 1000   # harte Obergrenze für den gesamten Kontext
+CONTEXT_SUMMARY_BATCH   = 10     # neu zusammenfassen ab N herausgefallenen Zeilen
+CONTEXT_RELEVANT_TOKENS = 150    # ältere, zum Thema passende Zeilen (BM25), 0 = aus
+CONTEXT_RELEVANT_MAX    = 6      # max. Anzahl solcher Zeilen
+CONTEXT_QUERY_LINES     = 4      # Suchanfrage = die letzten N wörtlichen Zeilen
+CONTEXT_SUMMARY_PROMPT  = (
+    "Du fasst ein laufendes Gespräch für einen Gesprächs-Coach zusammen. "
+    "Du bekommst die bisherige Zusammenfassung und neue Transkript-Zeilen. "
+    "Gib eine aktualisierte, knappe Zusammenfassung zurück: Themen, Positionen "
+    "der Teilnehmer, offene Fragen. Stichpunkte, auf Deutsch, keine Einleitung."
+)
+
 # ── Profile ──────────────────────────────────────────────────────────────────
 # Profile werden als .txt-Dateien im PROFILES_DIR gespeichert.
 # Jede Datei = ein vollständiger System-Prompt.
@@ -99,8 +215,39 @@ SYSTEM_PROMPT = SYSTEM_PROMPT_FALLBACK
 AUTOSEND_ENABLED        = False   # beim Start deaktiviert
 AUTOSEND_INTERVAL_SEC   = 30      # alle 30 Sekunden neuer Vorschlag
 AUTOSEND_MIN_LINES      = 3       # mindestens N neue Zeilen seit letztem Send
+# "interval" = fester Takt (AUTOSEND_INTERVAL_SEC)
+# "turn"     = ereignisgesteuert: Sprecherwechsel oder erkannte Frage
+AUTOSEND_MODE           = "interval"
+AUTOSEND_TURN_DEBOUNCE_SEC = 0.8  # kurz warten, ob der Sprecher doch weiterredet
+AUTOSEND_TURN_MIN_GAP_SEC  = 10   # max. ein Auto-Send pro N Sekunden (Rate-Limit)
+AUTOSEND_TURN_MIN_LINES    = 1    # mindestens N neue Zeilen seit letztem Send
+TURN_END_GAP_SEC        = 1.5     # so lange keine neue Loopback-Zeile → Turn vorbei
+
+# ── Prefetch vor Stille-Warnungen ──
+# Kurz bevor eine Warnstufe (SILENCE_LEVELS) erreicht wird und neue Zeilen da
+# sind, wird im Hintergrund schon angefragt → Vorschläge stehen mit der Warnung.
+PREFETCH_ENABLED        = False
+PREFETCH_LEAD_SEC       = 8       # so viele Sekunden vor der Warnstufe anfragen
+PREFETCH_MAX_PER_HOUR   = 20      # Kostendeckel
 
 # ── Hotkeys ──
 HOTKEY_SEND_TO_AI       = "ctrl+shift+a"
 HOTKEY_CLEAR_TRANSCRIPT = "ctrl+shift+c"
 HOTKEY_AUTOSEND_TOGGLE  = "ctrl+shift+s"   # Auto-Send ein/aus
+HOTKEY_PROFILE          = "ctrl+shift+p"   # Profiler für PROFILE_SECONDS starten
+
+# ── Profiler (profiler.py, nur bei Bedarf geladen) ──
+PROFILE_SECONDS    = 15        # Dauer eines Laufs (Hotkey / --profile ohne Zahl)
+PROFILE_HZ         = 100       # Abtastrate pro Sekunde, alle Threads
+PROFILE_OUTPUT_DIR = "perf"    # *.collapsed (Flamegraph) + *.txt (CPU pro Thread)
+
+# ── Metriken (metrics.py) ──
+METRICS_ENABLED       = True            # Spans/Histogramme – Overhead ~1 µs pro Messwert
+METRICS_SNAPSHOT_FILE = "metrics.json"  # periodischer JSON-Snapshot, "" = aus
+METRICS_SNAPSHOT_SEC  = 10
+
+# ── Event-Bus ──
+# "async" = jeder Subscriber bekommt eigene Queue + Thread (Producer blockiert nie)
+# "sync"  = Handler läuft direkt im Producer-Thread (nur für Debugging)
+EVENT_BUS_DEFAULT_MODE  = "async"
+EVENT_BUS_QUEUE_SIZE    = 256     # max. wartende Events pro Subscriber
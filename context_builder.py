@@ -0,0 +1,214 @@
+"""
+context_builder.py
+──────────────────
+Baut den KI-Kontext mit festem Token-Budget.
+
+Funktionsprinzip:
+  - Neueste Zeilen kommen wörtlich rein, bis CONTEXT_RECENT_TOKENS erreicht ist
+  - Ältere Zeilen werden zu einer laufenden Zusammenfassung verdichtet;
+    bis das (ab CONTEXT_SUMMARY_BATCH Zeilen) passiert ist, gehen sie
+    ebenfalls wörtlich mit – keine Zeile fällt zwischen Fenster und
+    Zusammenfassung durch
+  - Die Zusammenfassung wird im Hintergrund nachgeführt (alte Zusammenfassung
+    + neuer Block → neue Zusammenfassung), nie im Hot-Path der Anfrage
+  - Zusätzlich: ältere Zeilen, die laut BM25-Index zu den neuesten passen
+    (CONTEXT_RELEVANT_TOKENS), chronologisch als eigener Abschnitt
+  - Header + Zusammenfassung + relevante + noch nicht zusammengefasste +
+    neueste Zeilen bleiben unter CONTEXT_TOKEN_CEILING
+
+Ergebnis: auch nach 2 Stunden Meeting bleibt der Prompt gleich groß,
+die KI verliert aber nicht den roten Faden.
+"""
+
+import bisect
+import threading
+import time
+
+from config import (
+    CONTEXT_SUMMARY_ENABLED, CONTEXT_RECENT_TOKENS, CONTEXT_SUMMARY_TOKENS,
+    CONTEXT_TOKEN_CEILING, CONTEXT_SUMMARY_BATCH,
+    CONTEXT_RELEVANT_TOKENS, CONTEXT_RELEVANT_MAX, CONTEXT_QUERY_LINES,
+)
+from transcript_index import TranscriptIndex
+
+CHARS_PER_TOKEN = 4       # grobe Schätzung, reicht fürs Budget
+RETRY_AFTER_SEC = 30      # nach Fehler nicht bei jeder Zeile neu versuchen
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class ContextBuilder:
+
+    def __init__(self, summarize_fn=None, max_lines: int = 20):
+        """
+        summarize_fn(previous_summary, new_lines, max_tokens) → str
+        Läuft im Hintergrund-Thread und darf blockieren.
+        max_lines = Zeilen-Regler der UI (wie bei build()).
+        """
+        self._summarize_fn = summarize_fn
+        self._lock         = threading.Lock()
+        self._log          = []      # Zeilen seit der letzten Zusammenfassung
+        self._times        = []      # Aufnahmezeit je Zeile in _log (aufsteigend)
+        self._doc_times    = []      # Aufnahmezeit je Index-Dokument (doc_id)
+        self._summary      = ""
+        self._summarized   = 0       # Index in _log: bis hier wird/ist zusammengefasst
+        self._generation   = 0       # erhöht bei reset() → alte Läufe verwerfen
+        self._busy         = False
+        self._retry_at     = 0.0
+        self._max_lines    = max_lines   # wörtliches Fenster: wie build()
+        self.index         = TranscriptIndex()
+
+    # ── Public API ──────────────────────────────────────────
+
+    def add_line(self, line: str, t_start: float | None = None):
+        """Zeile nach Aufnahmezeit einsortieren (wie Timeline.insert); ohne
+        t_start wird angehängt. Vor bereits zusammengefasste Zeilen kann
+        nichts mehr rutschen – eine so späte Zeile kommt an deren Ende."""
+        with self._lock:
+            if t_start is None:
+                t_start = self._times[-1] if self._times else float("-inf")
+            i = max(self._summarized, bisect.bisect_right(self._times, t_start))
+            self._times.insert(i, t_start)
+            self._log.insert(i, line)
+            self._doc_times.append(t_start)
+            self.index.add(line)         # unter dem Lock: doc_id passt zu _doc_times
+        self._maybe_refresh()
+
+    def set_max_lines(self, max_lines: int):
+        """Zeilen-Regler geändert → was davor liegt, wird zusammengefasst."""
+        with self._lock:
+            self._max_lines = max_lines
+        self._maybe_refresh()
+
+    def reset(self):
+        with self._lock:
+            self._log        = []
+            self._times      = []
+            self._doc_times  = []
+            self._summary    = ""
+            self._summarized = 0
+            self._generation += 1
+        self.index.clear()
+
+    @property
+    def summary(self) -> str:
+        return self._summary
+
+    def build(self, lines: list[str], header: str, max_lines: int) -> tuple[str, int]:
+        """
+        Gibt (Kontext-Text, Anzahl wörtlicher Zeilen) zurück.
+        lines = aktuelle Transkript-Zeilen (inkl. Nutzer-Korrekturen).
+        """
+        with self._lock:
+            self._max_lines = max_lines
+            # Alles in _log ist noch nicht in der Zusammenfassung
+            unsummarized = (len(self._log) if CONTEXT_SUMMARY_ENABLED
+                            and self._summarize_fn is not None else 0)
+        recent = self._select_recent(lines, max_lines)
+        older  = len(lines) - len(recent)
+        # Aus dem Fenster gefallen, aber noch nicht zusammengefasst → wörtlich
+        n_gap  = min(older, max(0, unsummarized - len(recent)))
+        gap    = lines[older - n_gap:older]
+        summary = self._summary if CONTEXT_SUMMARY_ENABLED else ""
+        if older == 0:
+            summary = ""         # alles passt wörtlich rein
+        relevant = self._select_relevant(recent, exclude=gap) if n_gap < older else []
+
+        # Obergrenze: erst relevante Zeilen, dann älteste noch nicht
+        # zusammengefasste, dann Zusammenfassung kürzen, zuletzt älteste
+        # wörtliche Zeilen streichen
+        def _total():
+            return (estimate_tokens(header) + estimate_tokens(summary)
+                    + sum(estimate_tokens(l) for l in relevant)
+                    + sum(estimate_tokens(l) for l in gap)
+                    + sum(estimate_tokens(l) for l in recent))
+
+        while _total() > CONTEXT_TOKEN_CEILING and relevant:
+            relevant = relevant[:-1]
+        while _total() > CONTEXT_TOKEN_CEILING and gap:
+            gap = gap[1:]
+        while _total() > CONTEXT_TOKEN_CEILING and summary:
+            keep    = max(0, len(summary) - (_total() - CONTEXT_TOKEN_CEILING) * CHARS_PER_TOKEN)
+            summary = summary[:keep].rsplit(" ", 1)[0] + " …" if keep > 20 else ""
+        while _total() > CONTEXT_TOKEN_CEILING and len(recent) > 1:
+            recent = recent[1:]
+
+        parts = [header.rstrip("\n")] if header.strip() else []
+        if summary:
+            parts.append(f"Bisheriger Verlauf (Zusammenfassung):\n{summary}")
+        if relevant:
+            parts.append("Frühere Aussagen zum aktuellen Thema:\n" + "\n".join(relevant))
+        parts.append("\n".join(gap + recent))
+        return "\n\n".join(parts), len(gap) + len(recent)
+
+    # ── Intern ──────────────────────────────────────────────
+
+    @staticmethod
+    def _select_recent(lines: list[str], max_lines: int) -> list[str]:
+        recent, used = [], 0
+        for line in reversed(lines[-max_lines:]):
+            cost = estimate_tokens(line)
+            if recent and used + cost > CONTEXT_RECENT_TOKENS:
+                break
+            recent.append(line)
+            used += cost
+        recent.reverse()
+        return recent
+
+    def _select_relevant(self, recent: list[str], exclude: list[str] = ()) -> list[str]:
+        """Ältere Zeilen, die zu den neuesten passen – chronologisch sortiert."""
+        if CONTEXT_RELEVANT_TOKENS <= 0 or not recent:
+            return []
+        query = " ".join(recent[-CONTEXT_QUERY_LINES:])
+        hits  = self.index.search(query, k=CONTEXT_RELEVANT_MAX,
+                                  exclude=set(recent) | set(exclude))
+        picked, used = [], 0
+        for doc_id, line, _score in hits:     # beste zuerst ins Budget
+            cost = estimate_tokens(line)
+            if used + cost > CONTEXT_RELEVANT_TOKENS:
+                continue
+            picked.append((self._doc_times[doc_id], doc_id, line))
+            used += cost
+        return [line for _t, _id, line in sorted(picked)]
+
+    def _maybe_refresh(self):
+        if not CONTEXT_SUMMARY_ENABLED or self._summarize_fn is None:
+            return
+        with self._lock:
+            if self._busy or time.monotonic() < self._retry_at:
+                return
+            # Was nicht mehr ins wörtliche Fenster passt (Token-Budget UND
+            # Zeilen-Regler wie in build()), gehört in die Zusammenfassung
+            window_start = len(self._log) - len(self._select_recent(self._log, self._max_lines))
+            if window_start - self._summarized < CONTEXT_SUMMARY_BATCH:
+                return
+            batch      = self._log[self._summarized:window_start]
+            upto       = window_start
+            previous   = self._summary
+            generation = self._generation
+            self._busy = True
+            self._summarized = upto
+        threading.Thread(
+            target=self._refresh, args=(previous, batch, upto, generation),
+            name="ctx-summary", daemon=True
+        ).start()
+
+    def _refresh(self, previous: str, batch: list[str], upto: int, generation: int):
+        try:
+            summary = self._summarize_fn(previous, batch, CONTEXT_SUMMARY_TOKENS)
+            with self._lock:
+                if generation == self._generation and summary:
+                    self._summary    = summary.strip()
+                    # Zusammengefasste Zeilen werden nicht mehr gebraucht
+                    self._log        = self._log[upto:]
+                    self._times      = self._times[upto:]
+        except Exception as e:
+            print(f"[ContextBuilder] Zusammenfassung fehlgeschlagen: {e}")
+            with self._lock:
+                self._retry_at = time.monotonic() + RETRY_AFTER_SEC
+        finally:
+            with self._lock:
+                self._busy       = False
+                self._summarized = 0
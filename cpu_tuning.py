@@ -0,0 +1,387 @@
+"""
+cpu_tuning.py
+─────────────
+Threads, parallele Decodes und Kern-Zuordnung für Whisper auf der CPU.
+
+Funktionsprinzip:
+  - resolve(): welche Werte gelten – config.py (≠ 0) vor Kalibrierung
+    (WHISPER_TUNING_FILE) vor Automatik
+  - Automatik: cpu_threads = physische Kerne − 1 (max. 8), damit
+    Audio-Callbacks und Tk nicht um Rechenzeit kämpfen; num_workers = 1
+  - Kern-Zuordnung (WHISPER_PIN_THREADS):
+      set_default_cores(): Kerne für den Lade-Thread. Linux: sched_setaffinity,
+        danach von ihm erzeugte Threads erben die Maske. Windows: nur dieser
+        Thread (SetThreadSelectedCpuSets) – bewusst kein Prozess-Standard,
+        der würde auch Tk, KI-Pool und Event-Bus auf die Decode-Kerne legen
+      pin_new_threads(): nach dem Laden alle seither entstandenen nativen
+        Threads (Pool von CTranslate2, den wir nicht selbst starten) gezielt
+        auf die Decode-Kerne – unter Windows der einzige Weg dorthin, unter
+        Linux dasselbe Ergebnis wie die Vererbung
+      pin_current_thread(): nur der aufrufende Thread (Linux:
+        sched_setaffinity, Windows: SetThreadSelectedCpuSets, CPU-Sets ab
+        Windows 10). Für Aufnahme-Threads und PortAudio-Callbacks
+    Ohne CPU-Sets (ältere Windows-Versionen) wird die Zuordnung mit Warnung
+    abgeschaltet – sie würde die Decode-Arbeit sonst gar nicht erreichen
+  - Kalibrierung: misst auf diesem Rechner alle Kombinationen aus
+    cpu_threads × num_workers mit demselben Modell und speichert die
+    mit der kleinsten p95-Latenz pro Chunk
+
+Aufruf:
+    python cpu_tuning.py --calibrate
+    python cpu_tuning.py --calibrate --threads 2,4,6 --workers 1,2 --wav probe.wav
+    python cpu_tuning.py                 # zeigt die aktuell gültigen Werte
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    WHISPER_CPU_THREADS, WHISPER_NUM_WORKERS, WHISPER_PIN_THREADS,
+    WHISPER_CAPTURE_CORES, WHISPER_TUNING_FILE, WHISPER_COMPUTE, SAMPLE_RATE,
+)
+
+MAX_AUTO_THREADS = 8
+
+
+def physical_cores() -> int:
+    try:
+        import psutil
+        n = psutil.cpu_count(logical=False)
+        if n:
+            return n
+    except ImportError:
+        pass
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _load_tuning() -> dict:
+    try:
+        with open(WHISPER_TUNING_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[CPU-Tuning] {WHISPER_TUNING_FILE} unlesbar: {e}")
+        return {}
+
+
+def resolve() -> dict:
+    """Gültige Einstellungen samt Herkunft (config / kalibriert / auto)."""
+    tuned   = _load_tuning()
+    logical = os.cpu_count() or 1
+    capture = list(range(min(WHISPER_CAPTURE_CORES, logical - 1)))
+    decode  = [c for c in range(logical) if c not in capture]
+
+    def pick(name, configured, auto):
+        if configured:
+            return configured, "config"
+        if tuned.get(name):
+            return tuned[name], "kalibriert"
+        return auto, "auto"
+
+    threads, threads_src = pick("cpu_threads", WHISPER_CPU_THREADS,
+                                max(1, min(MAX_AUTO_THREADS, physical_cores() - 1)))
+    workers, workers_src = pick("num_workers", WHISPER_NUM_WORKERS, 1)
+    pin = WHISPER_PIN_THREADS and bool(capture) and bool(decode)
+    if pin and sys.platform == "win32" and not windows_pinning_available():
+        print("[CPU-Tuning] WHISPER_PIN_THREADS ignoriert: ohne CPU-Sets (Windows 10+) "
+              "erreicht die Zuordnung die Decode-Threads von CTranslate2 nicht")
+        pin = False
+    return {
+        "cpu_threads":   threads,
+        "num_workers":   workers,
+        "pin":           pin,
+        "capture_cores": capture,
+        "decode_cores":  decode,
+        "source":        {"cpu_threads": threads_src, "num_workers": workers_src},
+    }
+
+
+# ── Windows: CPU-Sets ────────────────────────────────────────
+
+_cpu_set_ids = None
+
+
+def _win_cpu_set_ids() -> dict[int, int]:
+    """Logischer Prozessor (Gruppe * 64 + Index) → CPU-Set-ID. Leer ohne CPU-Sets."""
+    global _cpu_set_ids
+    if _cpu_set_ids is not None:
+        return _cpu_set_ids
+    import ctypes
+    from ctypes import wintypes
+    k32 = ctypes.windll.kernel32
+    ids = {}
+    if hasattr(k32, "GetSystemCpuSetInformation"):
+        fn = k32.GetSystemCpuSetInformation
+        fn.argtypes = (ctypes.c_void_p, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG),
+                       wintypes.HANDLE, wintypes.ULONG)
+        needed = wintypes.ULONG(0)
+        fn(None, 0, ctypes.byref(needed), None, 0)
+        buf = ctypes.create_string_buffer(needed.value)
+        if needed.value and fn(buf, needed, ctypes.byref(needed), None, 0):
+            raw, pos = buf.raw, 0
+            while pos < needed.value:
+                # SYSTEM_CPU_SET_INFORMATION: Size, Type, Id, Group, LogicalProcessorIndex …
+                size    = int.from_bytes(raw[pos:pos + 4], "little")
+                set_id  = int.from_bytes(raw[pos + 8:pos + 12], "little")
+                group   = int.from_bytes(raw[pos + 12:pos + 14], "little")
+                logical = raw[pos + 14]
+                ids[group * 64 + logical] = set_id
+                if size <= 0:
+                    break
+                pos += size
+    _cpu_set_ids = ids
+    return ids
+
+
+def _win_cpu_sets(cores: list[int]):
+    import ctypes
+    ids = _win_cpu_set_ids()
+    if not ids:
+        raise OSError("CPU-Sets nicht verfügbar (erst ab Windows 10)")
+    chosen = [ids[c] for c in cores if c in ids]
+    if not chosen:
+        raise ValueError(f"keine CPU-Sets für Kerne {cores}")
+    return (ctypes.c_ulong * len(chosen))(*chosen), len(chosen)
+
+
+def windows_pinning_available() -> bool:
+    if sys.platform != "win32":
+        return False
+    try:
+        return bool(_win_cpu_set_ids())
+    except (OSError, AttributeError):
+        return False
+
+
+def set_default_cores(cores: list[int]) -> bool:
+    """Kerne für den aufrufenden (Lade-)Thread; unter Linux erben danach
+    erzeugte Threads sie. Windows vererbt nicht → pin_new_threads()."""
+    return pin_current_thread(cores)
+
+
+def _win_thread_ids() -> set[int]:
+    """Thread-IDs dieses Prozesses per Toolhelp-Snapshot."""
+    import ctypes
+    from ctypes import wintypes
+
+    class THREADENTRY32(ctypes.Structure):
+        _fields_ = [("dwSize", wintypes.DWORD), ("cntUsage", wintypes.DWORD),
+                    ("th32ThreadID", wintypes.DWORD), ("th32OwnerProcessID", wintypes.DWORD),
+                    ("tpBasePri", wintypes.LONG), ("tpDeltaPri", wintypes.LONG),
+                    ("dwFlags", wintypes.DWORD)]
+
+    k32 = ctypes.windll.kernel32
+    k32.CreateToolhelp32Snapshot.restype = ctypes.c_void_p
+    k32.Thread32First.argtypes = (ctypes.c_void_p, ctypes.c_void_p)
+    k32.Thread32Next.argtypes  = (ctypes.c_void_p, ctypes.c_void_p)
+    k32.CloseHandle.argtypes   = (ctypes.c_void_p,)
+    snap = k32.CreateToolhelp32Snapshot(0x4, 0)          # TH32CS_SNAPTHREAD
+    if not snap or snap == ctypes.c_void_p(-1).value:
+        raise OSError("CreateToolhelp32Snapshot fehlgeschlagen")
+    pid, ids = os.getpid(), set()
+    try:
+        entry = THREADENTRY32()
+        entry.dwSize = ctypes.sizeof(THREADENTRY32)
+        ok = k32.Thread32First(snap, ctypes.byref(entry))
+        while ok:
+            if entry.th32OwnerProcessID == pid:
+                ids.add(entry.th32ThreadID)
+            ok = k32.Thread32Next(snap, ctypes.byref(entry))
+    finally:
+        k32.CloseHandle(snap)
+    return ids
+
+
+def native_thread_ids() -> set[int]:
+    """Native IDs aller Threads dieses Prozesses; leer, wenn nicht ermittelbar."""
+    try:
+        if sys.platform == "win32":
+            return _win_thread_ids()
+        return {int(t) for t in os.listdir("/proc/self/task")}
+    except (OSError, AttributeError, ValueError):
+        return set()
+
+
+def _pin_thread(tid: int, cores: list[int]) -> bool:
+    """Fremden Thread (native ID) auf cores legen."""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(tid, cores)      # TID statt PID → nur dieser Thread
+            return True
+        if sys.platform == "win32":
+            import ctypes
+            arr, n = _win_cpu_sets(cores)
+            k32 = ctypes.windll.kernel32
+            k32.OpenThread.restype = ctypes.c_void_p
+            k32.SetThreadSelectedCpuSets.argtypes = (ctypes.c_void_p, ctypes.c_void_p,
+                                                     ctypes.c_ulong)
+            k32.CloseHandle.argtypes = (ctypes.c_void_p,)
+            handle = k32.OpenThread(0x0400, False, tid)  # THREAD_SET_LIMITED_INFORMATION
+            if not handle:
+                return False                             # Thread schon beendet
+            try:
+                return k32.SetThreadSelectedCpuSets(handle, arr, n) != 0
+            finally:
+                k32.CloseHandle(handle)
+    except (OSError, AttributeError, ValueError) as e:
+        print(f"[CPU-Tuning] Thread {tid} nicht zugeordnet: {e}")
+    return False
+
+
+def pin_new_threads(before: set[int], cores: list[int]) -> int:
+    """Seit before entstandene native Threads, die keine Python-Threads sind
+    (die legen sich selbst fest), auf cores legen. Gibt die Anzahl zurück."""
+    if not cores or not before:
+        return 0
+    python = {t.native_id for t in threading.enumerate()}
+    new    = native_thread_ids() - before - python
+    return sum(_pin_thread(tid, cores) for tid in sorted(new))
+
+
+def pin_current_thread(cores: list[int]) -> bool:
+    """Aufrufenden Thread auf cores beschränken; False wenn nicht möglich."""
+    if not cores:
+        return False
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)        # 0 = aufrufender Thread (Linux)
+            return True
+        if sys.platform == "win32":
+            import ctypes
+            arr, n = _win_cpu_sets(cores)
+            k32 = ctypes.windll.kernel32
+            k32.GetCurrentThread.restype = ctypes.c_void_p
+            k32.SetThreadSelectedCpuSets.argtypes = (ctypes.c_void_p, ctypes.c_void_p,
+                                                     ctypes.c_ulong)
+            return k32.SetThreadSelectedCpuSets(k32.GetCurrentThread(), arr, n) != 0
+    except (OSError, AttributeError, ValueError) as e:
+        print(f"[CPU-Tuning] Affinität nicht gesetzt: {e}")
+    return False
+
+
+# ══════════════════════════════════════════════════════════════
+#  KALIBRIERUNG
+# ══════════════════════════════════════════════════════════════
+
+def _fixtures(wav_paths: list[str]):
+    """Test-Audio: WAV-Dateien (16 kHz mono) oder synthetische Chunks 1–5 s."""
+    import numpy as np
+    if wav_paths:
+        import wave
+        chunks = []
+        for path in wav_paths:
+            with wave.open(path, "rb") as w:
+                if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1:
+                    raise ValueError(f"{path}: erwartet 16 kHz mono")
+                pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+            chunks.append(pcm.astype(np.float32) / 32768.0)
+        return chunks
+    rng = np.random.default_rng(0)
+    chunks = []
+    for sec in (1.0, 2.0, 3.0, 5.0):
+        t = np.arange(int(SAMPLE_RATE * sec), dtype=np.float32) / SAMPLE_RATE
+        f = 180.0 + 60.0 * np.sin(2 * np.pi * 0.7 * t)          # Sprachgrundton-artig
+        chunks.append((0.1 * np.sin(2 * np.pi * f * t)
+                       + 0.01 * rng.standard_normal(len(t))).astype(np.float32))
+    return chunks
+
+
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def _measure(model, chunks, workers: int, repeat: int) -> dict:
+    from transcriber import Transcriber
+    latencies = []
+    lock = threading.Lock()
+
+    def one(audio):
+        t0 = time.perf_counter()
+        Transcriber._decode(model, audio)
+        with lock:
+            latencies.append(time.perf_counter() - t0)
+
+    Transcriber._decode(model, chunks[0])                 # Aufwärmen
+    work = [c for _ in range(repeat) for c in chunks]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(one, work))
+    wall = time.perf_counter() - t0
+    audio_s = sum(len(c) for c in work) / SAMPLE_RATE
+    return {"p50_s": _percentile(latencies, 50), "p95_s": _percentile(latencies, 95),
+            "wall_s": wall, "rtf": wall / audio_s}
+
+
+def calibrate(threads: list[int], workers: list[int], compute: str,
+              wav_paths: list[str], repeat: int) -> dict:
+    from faster_whisper import WhisperModel
+    from transcriber import Transcriber
+
+    path   = Transcriber._resolve_model()
+    chunks = _fixtures(wav_paths)
+    results = []
+    for t in threads:
+        for w in workers:
+            model = WhisperModel(path, device="cpu", compute_type=compute,
+                                 cpu_threads=t, num_workers=w)
+            r = _measure(model, chunks, w, repeat)
+            del model
+            r.update(cpu_threads=t, num_workers=w)
+            results.append(r)
+            print(f"[CPU-Tuning] threads={t:<2} workers={w}  p50 {r['p50_s'] * 1000:6.0f} ms"
+                  f"  p95 {r['p95_s'] * 1000:6.0f} ms  RTF {r['rtf']:.3f}")
+
+    # Kleinste p95-Latenz gewinnt; bei Gleichstand (±5 %) weniger Threads
+    best_p95 = min(r["p95_s"] for r in results)
+    best = min((r for r in results if r["p95_s"] <= best_p95 * 1.05),
+               key=lambda r: (r["cpu_threads"] * r["num_workers"], r["p95_s"]))
+    tuning = {
+        "cpu_threads": best["cpu_threads"],
+        "num_workers": best["num_workers"],
+        "compute":     compute,
+        "host":        platform.node(),
+        "cpu_count":   os.cpu_count(),
+        "calibrated":  time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results":     results,
+    }
+    with open(WHISPER_TUNING_FILE, "w", encoding="utf-8") as f:
+        json.dump(tuning, f, indent=1)
+    print(f"[CPU-Tuning] Bestes Ergebnis: cpu_threads={best['cpu_threads']}, "
+          f"num_workers={best['num_workers']} → {WHISPER_TUNING_FILE}")
+    return tuning
+
+
+def _int_list(spec: str) -> list[int]:
+    return sorted({int(v) for v in spec.split(",") if v.strip()})
+
+
+def main():
+    logical = os.cpu_count() or 1
+    default_threads = sorted({t for t in (1, 2, 4, 6, 8, physical_cores() - 1, physical_cores())
+                              if 1 <= t <= logical})
+    parser = argparse.ArgumentParser(description="Whisper-CPU-Einstellungen kalibrieren")
+    parser.add_argument("--calibrate", action="store_true")
+    parser.add_argument("--threads", type=_int_list, default=default_threads)
+    parser.add_argument("--workers", type=_int_list, default=[1, 2])
+    parser.add_argument("--compute", default=WHISPER_COMPUTE if WHISPER_COMPUTE.startswith("int8")
+                        else "int8")
+    parser.add_argument("--wav", nargs="*", default=[], help="eigene Test-Aufnahmen (16 kHz mono)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.calibrate:
+        calibrate(args.threads, args.workers, args.compute, args.wav, args.repeat)
+    else:
+        print(json.dumps(resolve(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
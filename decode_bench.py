@@ -0,0 +1,144 @@
+"""
+decode_bench.py
+───────────────
+Misst Decode-Zeiten: mit/ohne Stille-Trimmen, optional Micro-Batching.
+
+Funktionsprinzip:
+  - Fixtures: kurze Äußerungen (--wav, 16 kHz mono) oder synthetische
+    Sprach-Attrappen 0.25–0.8 s; jede wird wie ein echter VAD-Chunk mit
+    PREROLL_MS Stille davor und SILENCE_MS danach (leises Rauschen) verpackt
+  - Jede Fixture wird --repeat mal ungetrimmt und getrimmt decodiert
+    (abwechselnd, damit Cache-/Takteffekte beide Seiten gleich treffen)
+  - Ausgabe: Decode-Zeit p50/Mittel je Variante, Ersparnis, entfernte
+    Audio-Dauer und wie oft sich der erkannte Text unterscheidet
+  - --batch: zusätzlich Durchsatz einzeln vs. Micro-Batching
+    (WHISPER_BATCH_MAX Chunks pro Decode, getrimmt)
+  - --source loopback: mit der Loopback-VAD-Schwelle trimmen (synthetische
+    Fixtures entsprechend leiser), wie es die App für Loopback-Chunks tut
+
+Aufruf:
+    python decode_bench.py --repeat 5
+    python decode_bench.py --wav aha.wav ja.wav genau.wav
+    python decode_bench.py --wav tests/fixtures/*.wav   # synthetische Laute aus den Tests
+    python decode_bench.py --batch
+    python decode_bench.py --source loopback --wav call.wav
+"""
+
+import argparse
+import statistics
+import time
+import wave
+
+import numpy as np
+
+import cpu_tuning
+from config import SAMPLE_RATE, WHISPER_BATCH_MAX
+from transcriber import (Transcriber, trim_silence, PREROLL_MS, SILENCE_MS,
+                         VAD_RMS_THRESH, LOOPBACK_RMS_FACTOR)
+
+VAD_THRESH = {"mic": VAD_RMS_THRESH, "loopback": VAD_RMS_THRESH * LOOPBACK_RMS_FACTOR}
+
+
+def _pad_like_vad(speech: np.ndarray, rng) -> np.ndarray:
+    pre  = 0.002 * rng.standard_normal(int(SAMPLE_RATE * PREROLL_MS / 1000))
+    post = 0.002 * rng.standard_normal(int(SAMPLE_RATE * SILENCE_MS / 1000))
+    return np.concatenate([pre, speech, post]).astype(np.float32)
+
+
+def fixtures(wav_paths: list[str], level: float = 1.0) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    if wav_paths:
+        out = []
+        for path in wav_paths:
+            with wave.open(path, "rb") as w:
+                if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1:
+                    raise ValueError(f"{path}: erwartet 16 kHz mono")
+                pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+            out.append(_pad_like_vad(pcm.astype(np.float32) / 32768.0, rng))
+        return out
+    out = []
+    for sec in (0.25, 0.35, 0.5, 0.65, 0.8):
+        t  = np.arange(int(SAMPLE_RATE * sec), dtype=np.float32) / SAMPLE_RATE
+        f0 = 140.0 + 40.0 * np.sin(2 * np.pi * 3.0 * t)             # Tonhöhenverlauf
+        voiced = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 6))
+        env    = np.sin(np.pi * t / sec) ** 0.5                      # An-/Abschwellen
+        out.append(_pad_like_vad(0.08 * level * voiced * env, rng))
+    return out
+
+
+def _time_decode(model, audio: np.ndarray) -> tuple[float, str]:
+    t0 = time.perf_counter()
+    text = " ".join(Transcriber._decode(model, audio))
+    return time.perf_counter() - t0, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode-Zeit mit/ohne Stille-Trimmen")
+    parser.add_argument("--wav", nargs="*", default=[])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch", action="store_true", help="Micro-Batching mitmessen")
+    parser.add_argument("--source", choices=tuple(VAD_THRESH), default="mic",
+                        help="VAD-Schwelle dieser Quelle zum Trimmen")
+    args = parser.parse_args()
+    vad_thresh = VAD_THRESH[args.source]
+    level      = LOOPBACK_RMS_FACTOR if args.source == "loopback" else 1.0
+
+    t = Transcriber()
+    t._tuning   = cpu_tuning.resolve()
+    t.load_info = {"fallbacks": []}
+    model = t._load_with_fallback(Transcriber._resolve_model(), lambda text: print(f"  {text}"))
+    print(f"[DecodeBench] Whisper {t.load_info['device']}/{t.load_info['compute']}")
+
+    full_s, trim_s, removed_s, changed = [], [], [], 0
+    for audio in fixtures(args.wav, level):
+        trimmed, removed = trim_silence(audio, vad_thresh)
+        removed_s.append(removed / SAMPLE_RATE)
+        for i in range(args.repeat):
+            pair = [(audio, full_s), (trimmed, trim_s)]
+            if i % 2:
+                pair.reverse()
+            texts = []
+            for a, bucket in pair:
+                dt, text = _time_decode(model, a)
+                bucket.append(dt)
+                texts.append(text)
+            changed += texts[0] != texts[1]
+
+    p50_full, p50_trim = statistics.median(full_s), statistics.median(trim_s)
+    print()
+    print("══ Decode mit/ohne Trimmen ════════════════════")
+    print(f"  Fixtures           {len(removed_s)} × {args.repeat}")
+    print(f"  Entfernt           Ø {statistics.mean(removed_s) * 1000:5.0f} ms pro Chunk")
+    print(f"  Ungetrimmt         p50 {p50_full * 1000:6.0f} ms   Ø {statistics.mean(full_s) * 1000:6.0f} ms")
+    print(f"  Getrimmt           p50 {p50_trim * 1000:6.0f} ms   Ø {statistics.mean(trim_s) * 1000:6.0f} ms")
+    print(f"  Ersparnis          {(1 - p50_trim / p50_full) * 100:5.1f} % (p50)")
+    print(f"  Text abweichend    {changed} von {len(full_s)} Paaren")
+
+    if args.batch:
+        bench_batch(model, [trim_silence(a, vad_thresh)[0] for a in fixtures(args.wav, level)],
+                    args.repeat)
+
+
+def bench_batch(model, chunks: list[np.ndarray], repeat: int):
+    audio_s = sum(len(c) for c in chunks) / SAMPLE_RATE * repeat
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for c in chunks:
+            Transcriber._decode(model, c)
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for i in range(0, len(chunks), WHISPER_BATCH_MAX):
+            Transcriber._decode_batch(model, chunks[i:i + WHISPER_BATCH_MAX])
+    batched = time.perf_counter() - t0
+
+    print()
+    print("══ Micro-Batching ═════════════════════════════")
+    print(f"  Einzeln            {single:6.2f} s   ({audio_s / single:5.1f}× Echtzeit)")
+    print(f"  Batch à {WHISPER_BATCH_MAX:<2}        {batched:6.2f} s   ({audio_s / batched:5.1f}× Echtzeit)")
+    print(f"  Durchsatz          {single / batched:5.2f}×")
+
+
+if __name__ == "__main__":
+    main()
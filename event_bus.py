@@ -0,0 +1,243 @@
+"""
+event_bus.py
+────────────
+Zentraler, typisierter Event-Bus für alle Backends.
+
+Funktionsprinzip:
+  - Producer (MicMonitor, Transcriber, AISuggester) rufen nur publish() auf
+  - Jeder Subscriber hat eine eigene Zustell-Queue + Worker-Thread (async)
+    oder wird direkt im Producer-Thread aufgerufen (sync)
+  - Volle Queues blockieren nie den Producer → Drop-Policy entscheidet
+    ob das älteste oder das neue Event verworfen wird
+  - Pro Subscriber: Zähler für Zustellungen, Drops, Fehler + Latenz
+    (Zeit vom publish() bis der Handler fertig ist)
+
+Ergebnis: ein langsamer Consumer (Tk-Marshaling, Logger …) bremst weder
+die Aufnahme noch das Whisper-Decoding.
+"""
+
+import threading
+import time
+import queue
+from dataclasses import dataclass, field
+
+from config import EVENT_BUS_DEFAULT_MODE, EVENT_BUS_QUEUE_SIZE
+from metrics import METRICS
+
+# ── Dispatch-Modi ────────────────────────────────────────────
+MODE_SYNC  = "sync"    # Handler läuft im Producer-Thread
+MODE_ASYNC = "async"   # Handler läuft im eigenen Worker-Thread
+
+# ── Drop-Policies (nur async) ────────────────────────────────
+DROP_OLDEST = "drop_oldest"   # ältestes Event aus der Queue werfen
+DROP_NEWEST = "drop_newest"   # neues Event verwerfen
+
+
+# ══════════════════════════════════════════════════════════════
+#  EVENTS
+# ══════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class Event:
+    """Basis aller Events. ts = monotone Zeit beim Erzeugen."""
+    ts: float = field(default_factory=time.monotonic, kw_only=True)
+
+
+@dataclass(frozen=True)
+class SilenceChanged(Event):
+    """MicMonitor: Warnstufe hat sich geändert (0 = spricht)."""
+    level:     int
+    silence_s: float
+
+
+@dataclass(frozen=True)
+class TranscriptLine(Event):
+    """Transcriber: neue transkribierte Zeile.
+    t_start = Aufnahmezeit des Chunks (time.monotonic()) – danach sortieren,
+    nicht nach Eingang; None = unbekannt → anhängen."""
+    text:       str
+    source:     str  = "mic"    # "mic" | "loopback"
+    is_partial: bool = False
+    t_start:    float | None = None
+
+
+@dataclass(frozen=True)
+class TurnEnded(Event):
+    """Transcriber: anderer Sprecher ist seit gap_s Sekunden still."""
+    source: str
+    gap_s:  float
+
+
+@dataclass(frozen=True)
+class QuestionDetected(Event):
+    """Transcriber: fremde Zeile ist eine Frage → Antwort wird erwartet."""
+    text:   str
+    source: str
+
+
+@dataclass(frozen=True)
+class AISuggestions(Event):
+    """
+    AISuggester: Vorschläge (oder Fehlertext).
+    final=False → Zwischenstand beim Streaming (bisher fertige Vorschläge).
+    """
+    text:       str
+    final:      bool = True
+    request_id: int  = 0
+    cached:     bool = False   # aus dem Antwort-Cache statt frisch von der API
+    error:      bool = False   # text ist eine Fehlermeldung, keine Vorschläge
+    channel:    str  = "main"  # Ausgabe-Pane: "main" oder Profilname (Fan-out)
+    latency_s:  float = 0.0    # Zeit seit der Anfrage bis zu diesem Stand
+
+
+# ══════════════════════════════════════════════════════════════
+#  SUBSCRIPTION
+# ══════════════════════════════════════════════════════════════
+
+class Subscription:
+    """Ein Subscriber mit eigener Queue, Worker-Thread und Zählern."""
+
+    def __init__(self, event_type: type, fn, mode: str, maxsize: int,
+                 drop: str, name: str):
+        self.event_type = event_type
+        self.fn         = fn
+        self.mode       = mode
+        self.drop       = drop
+        self.name       = name
+
+        self.delivered   = 0
+        self.dropped     = 0
+        self.errors      = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+        self._lock    = threading.Lock()
+        self._queue   = queue.Queue(maxsize=maxsize) if mode == MODE_ASYNC else None
+        self._running = mode == MODE_ASYNC
+        self._thread  = None
+        if self._running:
+            self._thread = threading.Thread(
+                target=self._worker, name=f"bus:{name}", daemon=True)
+            self._thread.start()
+
+    def offer(self, event: Event):
+        if self.mode == MODE_SYNC:
+            self._deliver(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if self.drop == DROP_NEWEST:
+                self._count_drop()
+                return
+            try:
+                self._queue.get_nowait()
+                self._count_drop()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._count_drop()
+
+    def close(self):
+        self._running = False
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self.delivered
+            return {
+                "name":           self.name,
+                "event":          self.event_type.__name__,
+                "mode":           self.mode,
+                "delivered":      n,
+                "dropped":        self.dropped,
+                "errors":         self.errors,
+                "queued":         self._queue.qsize() if self._queue else 0,
+                "latency_avg_ms": (self.latency_sum / n * 1000) if n else 0.0,
+                "latency_max_ms": self.latency_max * 1000,
+                "latency_last_ms": self.latency_last * 1000,
+            }
+
+    def _count_drop(self):
+        with self._lock:
+            self.dropped += 1
+        METRICS.incr(f"bus.dropped.{self.name}")
+
+    def _worker(self):
+        while self._running:
+            event = self._queue.get()
+            if event is None:
+                break
+            self._deliver(event)
+
+    def _deliver(self, event: Event):
+        try:
+            self.fn(event)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"[EventBus] Handler-Fehler ({self.name}): {e}")
+        latency = time.monotonic() - event.ts
+        METRICS.record(f"bus.dispatch.{self.name}", latency)
+        with self._lock:
+            self.delivered    += 1
+            self.latency_sum  += latency
+            self.latency_last  = latency
+            if latency > self.latency_max:
+                self.latency_max = latency
+
+
+# ══════════════════════════════════════════════════════════════
+#  BUS
+# ══════════════════════════════════════════════════════════════
+
+class EventBus:
+
+    def __init__(self, default_mode: str = EVENT_BUS_DEFAULT_MODE):
+        self._default_mode = default_mode
+        self._subs: list[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: type, fn, mode: str = None,
+                  maxsize: int = EVENT_BUS_QUEUE_SIZE,
+                  drop: str = DROP_OLDEST, name: str = None) -> Subscription:
+        """
+        Registriert fn(event) für event_type (inkl. Unterklassen).
+        mode=None → Default-Modus des Busses.
+        """
+        sub = Subscription(
+            event_type, fn,
+            mode=mode or self._default_mode,
+            maxsize=maxsize, drop=drop,
+            name=name or getattr(fn, "__name__", event_type.__name__)
+        )
+        with self._lock:
+            self._subs = self._subs + [sub]
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subs = [s for s in self._subs if s is not sub]
+        sub.close()
+
+    def publish(self, event: Event):
+        # Copy-on-write-Liste → kein Lock im Hot-Path nötig
+        for sub in self._subs:
+            if isinstance(event, sub.event_type):
+                sub.offer(event)
+
+    def stats(self) -> list[dict]:
+        return [s.stats() for s in self._subs]
+
+    def close(self):
+        with self._lock:
+            subs, self._subs = self._subs, []
+        for s in subs:
+            s.close()
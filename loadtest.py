@@ -0,0 +1,214 @@
+"""
+loadtest.py
+───────────
+Lasttest für den AISuggester gegen den lokalen Mock-Server.
+
+Funktionsprinzip:
+  - Startet mock_server.MockServer im selben Prozess (oder nutzt --url)
+  - Treibt AISuggester mit einem Trigger-Muster:
+      burst   – Salven von --burst-size Triggern im Abstand --burst-gap,
+                dazwischen --pause Sekunden Ruhe (Hotkey-Hämmern, Auto-Send)
+      steady  – ein Trigger alle --interval Sekunden
+      typing  – pro neuer Transkript-Zeile ein Trigger, zufällige Abstände
+  - Jeder Trigger hat neuen Transkript-Text (kein Cache-Treffer)
+  - Misst pro angezeigter Antwort: Trigger → erster Zwischenstand,
+    Trigger → finale Antwort (End-to-End über den Event-Bus)
+  - Zählt Threads (Maximum während des Laufs) und prüft die Wirksamkeit
+    des Abbrechens: abgebrochene Anfragen, deren Stream der Server trotzdem
+    komplett ausgeliefert hat, sind verschwendete Tokens
+
+Aufruf:
+    python loadtest.py --pattern burst --duration 20 --latency uniform:0.3,1.2
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+
+import mock_server
+from ai_suggestions import AISuggester
+from config import AI_COALESCE_MS, AI_WORKERS
+from event_bus import EventBus, AISuggestions, MODE_SYNC
+from metrics import METRICS
+from providers import ProviderPool
+
+
+def _percentile(values: list[float], p: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+
+def _fmt_ms(v: float | None) -> str:
+    return "–" if v is None else f"{v * 1000:7.0f} ms"
+
+
+class LoadTest:
+
+    def __init__(self, suggester: AISuggester, bus: EventBus):
+        self.suggester  = suggester
+        self._lock      = threading.Lock()
+        self._sent_at   = {}      # request_id → Trigger-Zeitpunkt
+        self._first     = {}      # request_id → Latenz erster Zwischenstand
+        self._final     = {}      # request_id → Latenz finale Antwort
+        self._errors    = 0
+        self._threads_max = threading.active_count()
+        self._line_no   = 0
+        bus.subscribe(AISuggestions, self._on_ai, mode=MODE_SYNC, name="loadtest")
+
+    # ── Trigger ─────────────────────────────────────────────
+
+    def trigger(self):
+        self._line_no += 1
+        text = (f"Still seit: 0s\n\nIch: Zeile {self._line_no} – "
+                f"wir reden über Punkt {random.randint(1, 10_000)}")
+        t = time.monotonic()
+        req_id = self.suggester.request_suggestions(text)
+        with self._lock:
+            self._sent_at[req_id] = t
+
+    def run(self, pattern: str, duration: float, args):
+        end = time.monotonic() + duration
+        sampler = threading.Thread(target=self._sample_threads, args=(end,),
+                                   name="loadtest-sampler", daemon=True)
+        sampler.start()
+        while time.monotonic() < end:
+            if pattern == "burst":
+                for _ in range(args.burst_size):
+                    self.trigger()
+                    time.sleep(args.burst_gap)
+                time.sleep(args.pause)
+            elif pattern == "steady":
+                self.trigger()
+                time.sleep(args.interval)
+            elif pattern == "typing":
+                self.trigger()
+                time.sleep(random.expovariate(1.0 / args.interval))
+            else:
+                raise ValueError(f"Unbekanntes Muster: {pattern!r}")
+
+    # ── Messung ─────────────────────────────────────────────
+
+    def _on_ai(self, event: AISuggestions):
+        now = time.monotonic()
+        with self._lock:
+            sent = self._sent_at.get(event.request_id)
+            if sent is None:
+                return
+            if event.request_id not in self._first:
+                self._first[event.request_id] = now - sent
+            if event.final:
+                self._final[event.request_id] = now - sent
+                if event.error:
+                    self._errors += 1
+
+    def _sample_threads(self, end: float):
+        while time.monotonic() < end + 5:
+            self._threads_max = max(self._threads_max, threading.active_count())
+            time.sleep(0.05)
+
+    def report(self, server_stats: dict | None) -> dict:
+        with self._lock:
+            first = list(self._first.values())
+            final = list(self._final.values())
+            triggers = len(self._sent_at)
+            errors = self._errors
+        st = self.suggester.stats
+        result = {
+            "triggers":       triggers,
+            "displayed":      len(final),
+            "errors_shown":   errors,
+            "first_p50_s":    _percentile(first, 50),
+            "first_p95_s":    _percentile(first, 95),
+            "final_p50_s":    _percentile(final, 50),
+            "final_p95_s":    _percentile(final, 95),
+            "final_max_s":    max(final) if final else None,
+            "threads_max":    self._threads_max,
+            "threads_end":    threading.active_count(),
+            "suggester":      dict(st),
+            "server":         server_stats,
+            "phases":         {n: h for n, h in METRICS.snapshot()["histograms"].items()
+                               if n.startswith("ai.")},
+        }
+        if server_stats is not None and st["cancelled"]:
+            # Abgebrochene Anfragen, deren Stream der Server trotzdem bis zum
+            # Ende ausgeliefert hat, waren verschwendet (Tokens bezahlt, nie gezeigt)
+            wasted = max(0, server_stats["completed"] - len(final))
+            result["wasted_streams"]       = wasted
+            result["cancel_effectiveness"] = max(0.0, 1.0 - wasted / st["cancelled"])
+        return result
+
+
+def print_report(r: dict):
+    st = r["suggester"]
+    print()
+    print("══ Lasttest ═══════════════════════════════════")
+    print(f"  Trigger            {r['triggers']}")
+    print(f"  Gesendet / Coal.   {st['sent']} / {st['coalesced']}")
+    print(f"  Abgebrochen        {st['cancelled']}   (veraltet verworfen: {st['stale']})")
+    print(f"  Retries / gedr.    {st['retried']} / {st['throttled']}")
+    print(f"  Angezeigt          {r['displayed']}   (davon Fehler: {r['errors_shown']})")
+    print(f"  Erster Vorschlag   p50 {_fmt_ms(r['first_p50_s'])}   p95 {_fmt_ms(r['first_p95_s'])}")
+    print(f"  Finale Antwort     p50 {_fmt_ms(r['final_p50_s'])}   p95 {_fmt_ms(r['final_p95_s'])}"
+          f"   max {_fmt_ms(r['final_max_s'])}")
+    print(f"  Threads            max {r['threads_max']}   am Ende {r['threads_end']}")
+    if r["server"] is not None:
+        sv = r["server"]
+        print(f"  Server             {sv['requests']} Anfragen, {sv['completed']} fertig, "
+              f"{sv['aborted']} abgebrochen, max {sv['active_max']} parallel")
+    for name, h in r["phases"].items():
+        if h["count"]:
+            print(f"  {name:<18} p50 {_fmt_ms(h['p50'])}   p99 {_fmt_ms(h['p99'])}   n={h['count']}")
+    if "cancel_effectiveness" in r:
+        print(f"  Abbruch wirksam    {r['cancel_effectiveness']:.0%}"
+              f"   ({r['wasted_streams']} Streams trotzdem komplett geliefert)")
+    print(f"  (AI_WORKERS={AI_WORKERS}, AI_COALESCE_MS={AI_COALESCE_MS})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lasttest für den AISuggester")
+    parser.add_argument("--pattern", choices=("burst", "steady", "typing"), default="burst")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--burst-size", type=int, default=5)
+    parser.add_argument("--burst-gap", type=float, default=0.1)
+    parser.add_argument("--pause", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--url", default=None,
+                        help="Vorhandenen Server nutzen statt Mock im Prozess")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    mock_server.add_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        base_url = args.url
+    else:
+        server   = mock_server.MockServer(mock_server.config_from_args(args)).start()
+        base_url = server.base_url
+
+    bus       = EventBus()
+    providers = ProviderPool([dict(name="mock", base_url=base_url,
+                                   api_key="mock", model="mock-model")])
+    suggester = AISuggester(bus, providers=providers)
+    test      = LoadTest(suggester, bus)
+
+    print(f"[LoadTest] {args.pattern} für {args.duration:.0f}s gegen {base_url}")
+    test.run(args.pattern, args.duration, args)
+    time.sleep(3)                 # letzte Antworten abwarten
+
+    result = test.report(server.stats.snapshot() if server else None)
+    suggester.stop()
+    bus.close()
+    if server:
+        server.stop()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
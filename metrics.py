@@ -0,0 +1,232 @@
+"""
+metrics.py
+──────────
+Leichtgewichtige Laufzeit-Metriken: Spans, Histogramme, Zähler.
+
+Funktionsprinzip:
+  - Histogram: HDR-artige log-lineare Buckets (je Zweierpotenz 16 lineare
+    Unter-Buckets → ~6 % Auflösung), feste Größe, O(1) pro Messwert,
+    kein Speicherwachstum – auch nach Stunden nicht
+  - span("whisper.decode") misst per monotoner Uhr (perf_counter) die Dauer
+    eines Blocks; record() für Messungen über Thread-Grenzen (Queue-Wartezeit)
+  - Zähler (verworfene Chunks, leere Decodes …) und Gauges (aktueller Wert)
+  - SnapshotWriter schreibt alle METRICS_SNAPSHOT_SEC eine JSON-Datei;
+    die App zeigt dieselben Werte live im Metriken-Fenster
+
+Overhead: ein Lock + ein paar Integer-Operationen pro Messwert (~1 µs) →
+bleibt im Normalbetrieb an. METRICS_ENABLED = False macht alles zum No-op.
+"""
+
+import json
+import os
+import threading
+import time
+
+from config import METRICS_ENABLED, METRICS_SNAPSHOT_FILE, METRICS_SNAPSHOT_SEC
+
+SUB_BITS    = 4                  # 2^4 = 16 Unter-Buckets pro Zweierpotenz
+SUB_COUNT   = 1 << SUB_BITS
+MAX_EXP     = 40                 # 2^40 µs ≈ 12 Tage – mehr braucht niemand
+SCALE       = 1_000_000          # Werte intern in Millionstel (s → µs, RTF → ppm)
+
+
+def _bucket_index(v: int) -> int:
+    if v < SUB_COUNT:
+        return v
+    exp = v.bit_length() - SUB_BITS - 1           # v liegt in [2^(exp+4), 2^(exp+5))
+    sub = v >> exp                                 # 16 … 31
+    return min((exp + 1) * SUB_COUNT + (sub - SUB_COUNT), (MAX_EXP + 1) * SUB_COUNT - 1)
+
+
+def _bucket_value(idx: int) -> int:
+    """Obere Grenze des Buckets (konservativ für Perzentile)."""
+    if idx < SUB_COUNT:
+        return idx
+    exp = idx // SUB_COUNT - 1
+    sub = idx % SUB_COUNT + SUB_COUNT
+    return ((sub + 1) << exp) - 1
+
+
+class Histogram:
+    """Log-lineares Histogramm; Werte in Sekunden (oder beliebigen Einheiten)."""
+
+    def __init__(self, name: str):
+        self.name   = name
+        self._lock  = threading.Lock()
+        self._counts = [0] * ((MAX_EXP + 1) * SUB_COUNT)
+        self.count  = 0
+        self.total  = 0.0
+        self.min    = float("inf")
+        self.max    = 0.0
+
+    def record(self, value: float):
+        v = int(value * SCALE)
+        if v < 0:
+            v = 0
+        idx = _bucket_index(v)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.total += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, p: float) -> float | None:
+        with self._lock:
+            if self.count == 0:
+                return None
+            target = max(1, int(round(p / 100.0 * self.count)))
+            seen = 0
+            for idx, c in enumerate(self._counts):
+                seen += c
+                if seen >= target:
+                    return min(_bucket_value(idx) / SCALE, self.max)
+        return self.max
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self.count, self.total = 0, 0.0
+            self.min, self.max     = float("inf"), 0.0
+
+    def snapshot(self) -> dict:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean":  self.total / self.count,
+            "min":   self.min,
+            "p50":   self.percentile(50),
+            "p90":   self.percentile(90),
+            "p99":   self.percentile(99),
+            "max":   self.max,
+        }
+
+
+class _Span:
+    __slots__ = ("_hist", "_t0")
+
+    def __init__(self, hist: Histogram):
+        self._hist = hist
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.record(time.perf_counter() - self._t0)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Registry:
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled     = enabled
+        self._lock       = threading.Lock()
+        self._hists      : dict[str, Histogram] = {}
+        self._counters   : dict[str, int] = {}
+        self._gauges     : dict[str, float] = {}
+        self._started    = time.monotonic()
+
+    def histogram(self, name: str) -> Histogram:
+        h = self._hists.get(name)
+        if h is None:
+            with self._lock:
+                h = self._hists.setdefault(name, Histogram(name))
+        return h
+
+    def span(self, name: str):
+        """with metrics.span("stage"): … → Dauer landet im Histogramm "stage"."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self.histogram(name))
+
+    def record(self, name: str, value: float):
+        if self.enabled:
+            self.histogram(name).record(value)
+
+    def incr(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        if self.enabled:
+            self._gauges[name] = value
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._started = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hists    = dict(self._hists)
+            counters = dict(self._counters)
+            gauges   = dict(self._gauges)
+        return {
+            "ts":         time.time(),
+            "uptime_s":   time.monotonic() - self._started,
+            "histograms": {n: h.snapshot() for n, h in sorted(hists.items())},
+            "counters":   dict(sorted(counters.items())),
+            "gauges":     dict(sorted(gauges.items())),
+        }
+
+
+class SnapshotWriter:
+    """Schreibt periodisch einen JSON-Snapshot (atomar über Temp-Datei)."""
+
+    def __init__(self, registry: Registry, path: str = METRICS_SNAPSHOT_FILE,
+                 interval: float = METRICS_SNAPSHOT_SEC):
+        self._registry = registry
+        self._path     = path
+        self._interval = interval
+        self._stop     = threading.Event()
+        self._thread   = None
+
+    def start(self):
+        if not self._registry.enabled or not self._path or self._interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._loop, name="metrics-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self.write()                 # letzter Stand beim Beenden
+
+    def write(self):
+        tmp = self._path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._registry.snapshot(), f, indent=1)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            print(f"[Metrics] Snapshot fehlgeschlagen: {e}")
+
+    def _loop(self):
+        while not self._stop.wait(self._interval):
+            self.write()
+
+
+# Prozessweite Instanz – Module importieren nur diese
+METRICS = Registry()
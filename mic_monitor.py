@@ -7,8 +7,8 @@ Thread-sicherer Mic-Monitor mit Event-basiertem Geräte-Wechsel.
 import threading
 import time
 import numpy as np
-import pyaudiowpatch as pyaudio
 from audio_devices import AudioDevice
+from event_bus import EventBus, SilenceChanged
 from config import (
     SPEAK_THRESHOLD_RMS, PING_FREQUENCY_HZ,
     PING_DURATION_MS, SILENCE_LEVELS
@@ -32,11 +32,11 @@ def _generate_ping(freq=PING_FREQUENCY_HZ, duration_ms=PING_DURATION_MS,
 
 class MicMonitor:
 
-    def __init__(self):
+    def __init__(self, bus: EventBus | None = None):
+        self.bus           = bus if bus is not None else EventBus()
         self.last_spoke_at = time.time()
         self.current_rms   = 0.0
         self.silence_level = 0
-        self._callbacks    = []
         self._ping_played  = {}
         self._running      = False
         self._thread       = None
@@ -50,7 +50,7 @@ class MicMonitor:
         self._enabled        = device is not None
         self._running        = True
         self._device_change.set()
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread = threading.Thread(target=self._run, name="mic-monitor", daemon=True)
         self._thread.start()
 
     def stop(self):
@@ -67,13 +67,11 @@ class MicMonitor:
             self._ping_played  = {}
             self._notify(0, 0.0)
 
-    def register_callback(self, fn):
-        self._callbacks.append(fn)
-
     def seconds_since_last_speech(self) -> float:
         return time.time() - self.last_spoke_at
 
     def _run(self):
+        import pyaudiowpatch as pyaudio     # erst hier laden → schneller Fensteraufbau
         pa     = None
         stream = None
 
@@ -151,11 +149,10 @@ class MicMonitor:
         _close()
 
     def _notify(self, level: int, silence_s: float):
-        for fn in self._callbacks:
-            try: fn(level, silence_s)
-            except Exception: pass
+        self.bus.publish(SilenceChanged(level=level, silence_s=silence_s))
 
     def _play_ping(self, level: int):
+        import pyaudiowpatch as pyaudio
         ping_pcm = _generate_ping(
             freq=PING_FREQUENCY_HZ + (level - 1) * 120,
             duration_ms=PING_DURATION_MS
@@ -211,7 +208,10 @@ class SpeakerMonitor:
             rms = float(np.sqrt(np.mean(window ** 2)))
             if rms > peak:
                 peak = rms
+        self.push_level(peak)
 
+    def push_level(self, peak: float):
+        """Fertiger Spitzenpegel (z.B. vom Transkriptions-Dienst gemeldet)."""
         if peak > self._peak_rms:
             self._peak_rms = peak
 
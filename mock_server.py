@@ -0,0 +1,280 @@
+"""
+mock_server.py
+──────────────
+Lokaler, OpenAI-kompatibler Ersatz-Server zum Testen ohne API-Key und Netz.
+
+Funktionsprinzip:
+  - POST /chat/completions (mit und ohne "stream": true), GET /models
+  - Latenz bis zum ersten Token aus einer Verteilung:
+      fixed:0.4 · uniform:0.2,1.5 · normal:0.6,0.2 · lognormal:-0.7,0.5
+  - Danach Tokens im Abstand --token-delay (Streaming in kleinen Stücken)
+  - --error-rate: Anteil Anfragen, die mit --error-status antworten
+    (optional mit Retry-After-Header: --retry-after)
+    --stream-error-rate: Anteil Streams, die mittendrin einen Fehler senden
+  - Antworttexte: eingebaute Beispiele oder --body-file (Blöcke durch
+    Leerzeilen getrennt, zufällig gewählt)
+  - Zähler: Anfragen, fertige Streams, vom Client abgebrochene Streams,
+    injizierte Fehler – GET /stats liefert sie als JSON
+
+Start:
+    python mock_server.py --port 8808 --latency lognormal:-0.7,0.5
+Dann in config.py einen Endpunkt mit base_url="http://127.0.0.1:8808" eintragen.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_BODIES = [
+    "1. Frag nach, was genau mit dem Zeitplan gemeint ist.\n"
+    "2. Fass kurz zusammen, was ihr bisher beschlossen habt.\n"
+    "3. Schlag vor, die offenen Punkte bis Freitag zu klären.",
+    "1. Erzähl von deiner Erfahrung mit dem Thema.\n"
+    "2. Frag, wie die anderen das Risiko einschätzen.\n"
+    "3. Bring ein konkretes Beispiel aus dem letzten Projekt.",
+    "1. Stimm dem letzten Punkt zu und ergänze einen Gedanken.\n"
+    "2. Frag nach den nächsten Schritten.\n"
+    "3. Biete an, die Aufgabe zu übernehmen.",
+]
+
+CHUNK_CHARS = 4           # Zeichen pro SSE-Delta (≈ 1 Token)
+
+
+def parse_distribution(spec: str, rng: random.Random = random):
+    """'kind:a,b' → Funktion, die eine Latenz in Sekunden liefert (≥ 0)."""
+    kind, _, args = spec.partition(":")
+    vals = [float(v) for v in args.split(",") if v.strip()] if args else []
+    if kind == "fixed":
+        return lambda: vals[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(vals[0], vals[1])
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(vals[0], vals[1]))
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(vals[0], vals[1])
+    raise ValueError(f"Unbekannte Verteilung: {spec!r}")
+
+
+class MockStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "streams": 0, "completed": 0,
+                       "aborted": 0, "errors_injected": 0, "active": 0,
+                       "active_max": 0}
+
+    def inc(self, key: str, n: int = 1):
+        with self._lock:
+            self.counts[key] += n
+            if key == "active":
+                self.counts["active_max"] = max(self.counts["active_max"],
+                                                self.counts["active"])
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+
+class MockConfig:
+
+    def __init__(self, latency: str = "fixed:0.3", token_delay: float = 0.02,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 stream_error_rate: float = 0.0, bodies: list[str] | None = None,
+                 seed: int | None = None, retry_after: float | None = None):
+        self.random            = random.Random(seed)
+        self.latency           = parse_distribution(latency, self.random)
+        self.latency_spec      = latency
+        self.token_delay       = token_delay
+        self.error_rate        = error_rate
+        self.error_status      = error_status
+        self.stream_error_rate = stream_error_rate
+        self.bodies            = bodies or DEFAULT_BODIES
+        self.retry_after       = retry_after
+
+
+def _make_handler(cfg: MockConfig, stats: MockStats):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"     # Keep-Alive wie bei echten Anbietern
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                self._send_json(200, stats.snapshot())
+            elif self.path.rstrip("/").endswith("/models"):
+                self._send_json(200, {"data": [{"id": "mock-model"}]})
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "invalid json"}})
+                return
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+            stats.inc("requests")
+            stats.inc("active")
+            try:
+                self._completion(body)
+            finally:
+                stats.inc("active", -1)
+
+        # ── Intern ──────────────────────────────────────────
+
+        def _completion(self, body: dict):
+            rnd = cfg.random
+            time.sleep(cfg.latency())
+            if rnd.random() < cfg.error_rate:
+                stats.inc("errors_injected")
+                headers = {}
+                if cfg.retry_after is not None:
+                    headers["Retry-After"] = f"{cfg.retry_after:g}"
+                self._send_json(cfg.error_status,
+                                {"error": {"message": "injected error"}}, headers)
+                return
+            text = rnd.choice(cfg.bodies)
+            if not body.get("stream"):
+                self._send_json(200, {
+                    "model": body.get("model", "mock-model"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": text}}],
+                })
+                return
+            self._stream(text, fail=rnd.random() < cfg.stream_error_rate)
+
+        def _stream(self, text: str, fail: bool):
+            stats.inc("streams")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            cut = len(text) // 2 if fail else None
+            try:
+                self._chunk(": mock-processing\n\n")
+                for i in range(0, len(text), CHUNK_CHARS):
+                    if cut is not None and i >= cut:
+                        stats.inc("errors_injected")
+                        self._chunk("data: " + json.dumps(
+                            {"error": {"message": "injected stream error"}}) + "\n\n")
+                        break
+                    if i:
+                        time.sleep(cfg.token_delay)
+                    delta = {"choices": [{"index": 0,
+                                          "delta": {"content": text[i:i + CHUNK_CHARS]}}]}
+                    self._chunk("data: " + json.dumps(delta) + "\n\n")
+                else:
+                    self._chunk("data: [DONE]\n\n")
+                    stats.inc("completed")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                # Client hat den Stream geschlossen (Latest-wins / Hedge-Verlierer)
+                stats.inc("aborted")
+                self.close_connection = True
+
+        def _chunk(self, s: str):
+            data = s.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+class MockServer:
+    """Startet den Server in einem Hintergrund-Thread (für loadtest.py)."""
+
+    def __init__(self, cfg: MockConfig | None = None, host: str = "127.0.0.1",
+                 port: int = 0):
+        self.cfg     = cfg or MockConfig()
+        self.stats   = MockStats()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self.cfg, self.stats))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", default="fixed:0.3",
+                        help="Zeit bis zum ersten Token, z.B. uniform:0.2,1.5")
+    parser.add_argument("--token-delay", type=float, default=0.02,
+                        help="Sekunden zwischen zwei Stream-Deltas")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Anteil Anfragen mit HTTP-Fehler (0–1)")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None,
+                        help="Retry-After-Header (Sekunden) bei Fehlerantworten")
+    parser.add_argument("--stream-error-rate", type=float, default=0.0,
+                        help="Anteil Streams mit Fehler mittendrin (0–1)")
+    parser.add_argument("--body-file", default=None,
+                        help="Antworttexte, Blöcke durch Leerzeilen getrennt")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args) -> MockConfig:
+    bodies = None
+    if args.body_file:
+        with open(args.body_file, encoding="utf-8") as f:
+            bodies = [b.strip() for b in f.read().split("\n\n") if b.strip()]
+    return MockConfig(latency=args.latency, token_delay=args.token_delay,
+                      error_rate=args.error_rate, error_status=args.error_status,
+                      stream_error_rate=args.stream_error_rate,
+                      bodies=bodies, seed=args.seed, retry_after=args.retry_after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-kompatibler Mock-Server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"[MockServer] {server.base_url}  (Latenz {args.latency}, "
+          f"Fehlerrate {args.error_rate:.0%})")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"[MockServer] {json.dumps(server.stats.snapshot())}")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+model_manager.py
+────────────────
+Lokale Verwaltung der Whisper-Modelle (CTranslate2-Format).
+
+Funktionsprinzip:
+  - Jedes Modell liegt in WHISPER_MODELS_DIR/<repo--name>/ mit einer
+    manifest.json (SHA-256 + Größe je Datei, Herkunft, Quantisierung)
+  - fetch:   lädt ein fertiges CT2-Modell von Hugging Face (Repo-ID oder
+             Kurzname wie "small") in den Modell-Ordner
+  - convert: wandelt einen Whisper-Checkpoint (Transformers-Format, z.B.
+             openai/whisper-large-v3-turbo) mit CTranslate2 um – int8 ist
+             auf der CPU deutlich kleiner und schneller als float16
+  - verify:  prüft alle Dateien gegen das Manifest
+  - resolve: was die App beim Start nutzt – nur lokal (Pfad, Modell-Ordner,
+             HF-Cache); ins Netz nur, wenn nichts da ist und WHISPER_OFFLINE
+             aus ist. Beim Start wird nur die Dateigröße geprüft (billig),
+             die volle Prüfsumme über `verify`
+
+Aufruf:
+    python model_manager.py fetch TheTobyB/whisper-large-v3-turbo-german-ct2
+    python model_manager.py convert openai/whisper-large-v3-turbo --quantization int8
+    python model_manager.py verify models/openai--whisper-large-v3-turbo-int8
+    python model_manager.py list
+Danach in config.py: WHISPER_MODEL = "models/…", WHISPER_OFFLINE = True
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from config import WHISPER_MODELS_DIR, WHISPER_OFFLINE
+
+MANIFEST      = "manifest.json"
+QUANTIZATIONS = ("int8", "int8_float16", "int8_float32", "float16", "float32")
+# Beim Konvertieren neben model.bin mitkopieren (Tokenizer + Feature-Extractor)
+COPY_FILES    = ("tokenizer.json", "preprocessor_config.json")
+
+
+def local_dir(name: str) -> str:
+    return os.path.join(WHISPER_MODELS_DIR, name.replace("/", "--"))
+
+
+# ── Manifest ─────────────────────────────────────────────────
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_manifest(model_dir: str, **meta) -> dict:
+    files = {}
+    for root, _, names in os.walk(model_dir):
+        for n in sorted(names):
+            path = os.path.join(root, n)
+            rel  = os.path.relpath(path, model_dir).replace(os.sep, "/")
+            if rel == MANIFEST or rel.startswith(".cache/"):
+                continue
+            files[rel] = {"sha256": _sha256(path), "size": os.path.getsize(path)}
+    manifest = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), **meta, "files": files}
+    with open(os.path.join(model_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def _read_manifest(model_dir: str) -> dict | None:
+    try:
+        with open(os.path.join(model_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def verify(model_dir: str, full: bool = True) -> list[str]:
+    """Liste der Probleme (leer = in Ordnung). full=False prüft nur Größen."""
+    manifest = _read_manifest(model_dir)
+    if manifest is None:
+        return [f"{MANIFEST} fehlt"]
+    problems = []
+    for rel, info in manifest["files"].items():
+        path = os.path.join(model_dir, rel)
+        if not os.path.isfile(path):
+            problems.append(f"{rel}: fehlt")
+        elif os.path.getsize(path) != info["size"]:
+            problems.append(f"{rel}: Größe {os.path.getsize(path)} statt {info['size']}")
+        elif full and _sha256(path) != info["sha256"]:
+            problems.append(f"{rel}: Prüfsumme stimmt nicht")
+    return problems
+
+
+# ── Beschaffen ───────────────────────────────────────────────
+
+def fetch(name: str) -> str:
+    """Fertiges CT2-Modell (Repo-ID oder faster-whisper-Kurzname) herunterladen."""
+    from faster_whisper.utils import download_model
+    out = local_dir(name)
+    print(f"[Modelle] Lade {name} → {out}")
+    download_model(name, output_dir=out)
+    write_manifest(out, source=name, quantization=None)
+    print("[Modelle] Fertig, Manifest geschrieben")
+    return out
+
+
+def convert(source: str, quantization: str = "int8", out: str | None = None) -> str:
+    """Whisper-Checkpoint (Transformers) → CTranslate2 mit Quantisierung.
+
+    Braucht zusätzlich: pip install ctranslate2 transformers[torch]
+    """
+    try:
+        from ctranslate2.converters import TransformersConverter
+    except ImportError as e:
+        raise RuntimeError("Konvertieren braucht ctranslate2 + transformers[torch]") from e
+    out = out or local_dir(f"{source}-{quantization}")
+    print(f"[Modelle] Konvertiere {source} ({quantization}) → {out}")
+    t0 = time.perf_counter()
+    converter = TransformersConverter(source, copy_files=list(COPY_FILES))
+    converter.convert(out, quantization=quantization, force=True)
+    write_manifest(out, source=source, quantization=quantization)
+    print(f"[Modelle] Fertig in {time.perf_counter() - t0:.0f}s")
+    return out
+
+
+def list_models() -> list[dict]:
+    if not os.path.isdir(WHISPER_MODELS_DIR):
+        return []
+    result = []
+    for entry in sorted(os.listdir(WHISPER_MODELS_DIR)):
+        path = os.path.join(WHISPER_MODELS_DIR, entry)
+        if not os.path.isdir(path):
+            continue
+        manifest = _read_manifest(path) or {}
+        size = sum(f["size"] for f in manifest.get("files", {}).values())
+        result.append({"path": path, "source": manifest.get("source"),
+                       "quantization": manifest.get("quantization"),
+                       "size_mb": size / 1e6 if size else None,
+                       "manifest": bool(manifest)})
+    return result
+
+
+# ── Auflösen beim Start ──────────────────────────────────────
+
+def resolve(name: str, offline: bool = WHISPER_OFFLINE) -> str:
+    """Lokaler Pfad für WHISPER_MODEL – Netz nur als letzte Möglichkeit."""
+    for path in (name, local_dir(name)):
+        if os.path.isdir(path):
+            problems = verify(path, full=False)
+            if problems and problems != [f"{MANIFEST} fehlt"]:
+                print(f"[Modelle] Warnung {path}: {'; '.join(problems[:3])} "
+                      f"(python model_manager.py verify {path})")
+            return path
+
+    from faster_whisper.utils import download_model
+    try:
+        return download_model(name, local_files_only=True)      # HF-Cache
+    except Exception:
+        pass
+    if offline:
+        raise RuntimeError(f"Modell {name!r} nicht lokal vorhanden (WHISPER_OFFLINE) – "
+                           f"python model_manager.py fetch {name}")
+    print(f"[Modelle] {name} nicht lokal – lade von Hugging Face")
+    return download_model(name)
+
+
+# ══════════════════════════════════════════════════════════════
+#  CLI
+# ══════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper-Modelle lokal verwalten")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("fetch", help="fertiges CT2-Modell herunterladen")
+    p.add_argument("name")
+    p = sub.add_parser("convert", help="Whisper-Checkpoint nach CTranslate2 wandeln")
+    p.add_argument("source")
+    p.add_argument("--quantization", choices=QUANTIZATIONS, default="int8")
+    p.add_argument("--out", default=None)
+    p = sub.add_parser("verify", help="Dateien gegen manifest.json prüfen")
+    p.add_argument("path")
+    sub.add_parser("list", help="lokale Modelle anzeigen")
+    args = parser.parse_args()
+
+    if args.cmd == "fetch":
+        fetch(args.name)
+    elif args.cmd == "convert":
+        convert(args.source, args.quantization, args.out)
+    elif args.cmd == "verify":
+        problems = verify(args.path)
+        for msg in problems:
+            print(f"  ✗ {msg}")
+        if problems:
+            sys.exit(1)
+        print(f"[Modelle] {args.path}: alle Prüfsummen ok")
+    elif args.cmd == "list":
+        for m in list_models():
+            size = f"{m['size_mb']:8.0f} MB" if m["size_mb"] else "       ? MB"
+            print(f"  {size}  {m['quantization'] or '–':<13} {m['path']}"
+                  + ("" if m["manifest"] else "   (ohne Manifest)"))
+
+
+if __name__ == "__main__":
+    main()
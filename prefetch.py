@@ -0,0 +1,89 @@
+"""
+prefetch.py
+───────────
+Spekulatives Vorladen von KI-Vorschlägen vor den Stille-Warnungen.
+
+Funktionsprinzip:
+  - Nähert sich die Stille einer Warnstufe (SILENCE_LEVELS) auf
+    PREFETCH_LEAD_SEC und sind seit der letzten Anfrage neue Zeilen da
+    → Anfrage im Hintergrund starten
+  - Pro Warnstufe höchstens ein Prefetch, zurückgesetzt sobald man spricht
+  - Kostendeckel: max. PREFETCH_MAX_PER_HOUR Prefetches pro rollender Stunde;
+    gezählt wird nur, was wirklich an die KI geht (commit(sent=True)),
+    nicht leere Transkripte oder Cache-Treffer
+
+Die App hält das Ergebnis zurück und zeigt es erst, wenn die Warnung
+tatsächlich kommt. Neue Zeilen machen einen Prefetch ungültig (Abbruch
+über die Request-ID im AISuggester); invalidate() erlaubt dann pro
+Warnstufe genau einen neuen Versuch mit frischem Kontext – sonst würde
+jede weitere Zeile einen neuen Prefetch auslösen und den Deckel leeren.
+"""
+
+import time
+from collections import deque
+
+from config import (
+    SILENCE_LEVELS, PREFETCH_LEAD_SEC, PREFETCH_MAX_PER_HOUR,
+)
+
+
+class PrefetchPolicy:
+
+    def __init__(self, levels=SILENCE_LEVELS, lead_s: float = PREFETCH_LEAD_SEC,
+                 max_per_hour: int = PREFETCH_MAX_PER_HOUR):
+        self._levels       = sorted(levels)
+        self._lead         = lead_s
+        self._max_per_hour = max_per_hour
+        self._done_levels  = set()      # Warnstufen, für die schon vorgeladen wurde
+        self._retried      = set()      # Warnstufen mit verbrauchtem Neuversuch
+        self._candidate    = None       # von check() gewählt, wartet auf commit()
+        self._history      = deque()    # Zeitpunkte der letzten Prefetches
+        self._last_level   = None
+
+    def reset(self):
+        """Nutzer hat gesprochen → Warnstufen beginnen von vorn."""
+        self._done_levels.clear()
+        self._retried.clear()
+
+    def invalidate(self):
+        """Letzter Prefetch ist veraltet → für diese Stufe einmal nochmal erlauben."""
+        level, self._last_level = self._last_level, None
+        if level is not None and level not in self._retried:
+            self._retried.add(level)
+            self._done_levels.discard(level)
+
+    def budget_left(self) -> int:
+        self._expire()
+        return max(0, self._max_per_hour - len(self._history))
+
+    def check(self, silence_s: float, has_new_lines: bool) -> bool:
+        """True → jetzt vorladen; danach commit() mit dem Ergebnis aufrufen."""
+        if not has_new_lines:
+            return False
+        upcoming = next((t for t in self._levels if silence_s < t), None)
+        if upcoming is None or upcoming in self._done_levels:
+            return False
+        if upcoming - silence_s > self._lead:
+            return False
+        if self.budget_left() <= 0:
+            return False
+        self._candidate = upcoming
+        return True
+
+    def commit(self, sent: bool):
+        """
+        Nach dem Vorladen: Stufe ist erledigt. Nur sent=True (Anfrage ging
+        wirklich raus) zählt auf den Deckel und kann invalidiert werden.
+        """
+        level, self._candidate = self._candidate, None
+        if level is None:
+            return
+        self._done_levels.add(level)
+        if sent:
+            self._last_level = level
+            self._history.append(time.monotonic())
+
+    def _expire(self):
+        cutoff = time.monotonic() - 3600
+        while self._history and self._history[0] < cutoff:
+            self._history.popleft()
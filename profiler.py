@@ -0,0 +1,177 @@
+"""
+profiler.py
+───────────
+Sampling-Profiler für alle Threads – nur bei Bedarf geladen.
+
+Funktionsprinzip:
+  - Eigener Thread tastet PROFILE_HZ mal pro Sekunde sys._current_frames() ab
+    (Tk-Main, Mic-/Loopback-Loop, Chunk-Loop, KI-Worker …), PROFILE_SECONDS lang
+  - Jeder Stack wird als "Thread;äußere;…;innere Funktion" gezählt →
+    *.collapsed ist direkt mit flamegraph.pl / speedscope / inferno lesbar
+  - Zusätzlich *.txt: pro Thread Samples, CPU-Zeit (psutil, falls installiert,
+    sonst pthread-CPU-Uhren) und die häufigsten innersten Funktionen
+
+Gestartet per Hotkey (HOTKEY_PROFILE) oder `python app.py --profile [Sekunden]`.
+Die App importiert dieses Modul erst beim ersten Profiling-Lauf.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from config import PROFILE_SECONDS, PROFILE_HZ, PROFILE_OUTPUT_DIR
+
+TOP_FRAMES = 8            # so viele heißeste Funktionen pro Thread im Bericht
+
+_lock   = threading.Lock()
+_active = None            # laufender SamplingProfiler (max. einer)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_cpu_times() -> dict[int, float]:
+    """threading-ident → CPU-Sekunden (user + system), soweit ermittelbar."""
+    threads = {t.native_id: t.ident for t in threading.enumerate()
+               if t.native_id is not None}
+    try:
+        import psutil
+        return {threads[t.id]: t.user_time + t.system_time
+                for t in psutil.Process().threads() if t.id in threads}
+    except ImportError:
+        pass
+    if not hasattr(time, "pthread_getcpuclockid"):
+        return {}
+    result = {}
+    for ident in threads.values():
+        try:
+            result[ident] = time.clock_gettime(time.pthread_getcpuclockid(ident))
+        except (OSError, OverflowError):
+            pass
+    return result
+
+
+class SamplingProfiler:
+
+    def __init__(self, seconds: float = PROFILE_SECONDS, hz: int = PROFILE_HZ,
+                 out_dir: str = PROFILE_OUTPUT_DIR, on_done=None):
+        self.seconds  = seconds
+        self.hz       = hz
+        self.out_dir  = out_dir
+        self.on_done  = on_done        # on_done(collapsed_path, summary_path)
+        self._thread  = None
+        self._stop    = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Vorzeitig beenden – Ergebnis wird trotzdem geschrieben."""
+        self._stop.set()
+
+    def _run(self):
+        global _active
+        try:
+            paths = self._sample_and_write()
+            print(f"[Profiler] geschrieben: {paths[0]}")
+            if self.on_done:
+                self.on_done(*paths)
+        except Exception as e:
+            print(f"[Profiler] Fehler: {e}")
+        finally:
+            with _lock:
+                _active = None
+
+    def _sample_and_write(self) -> tuple[str, str]:
+        me        = threading.get_ident()
+        interval  = 1.0 / self.hz
+        stacks    = Counter()                 # "Thread;f1;f2" → Samples
+        leaves    = defaultdict(Counter)      # Thread → innerste Funktion → Samples
+        samples   = Counter()                 # Thread → Samples
+        names     = {}
+        cpu_start = _thread_cpu_times()
+        t_start   = time.monotonic()
+        t_end     = t_start + self.seconds
+        next_names = 0.0
+
+        print(f"[Profiler] Sampling {self.seconds:.0f}s @ {self.hz} Hz …")
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= t_end:
+                break
+            if now >= next_names:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                next_names = now + 1.0
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                tname = names.get(ident, f"thread-{ident}")
+                parts = []
+                leaf  = None
+                while frame is not None:
+                    label = _frame_label(frame.f_code)
+                    if leaf is None:
+                        leaf = label
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(tname)
+                parts.reverse()
+                stacks[";".join(p.replace(";", ":") for p in parts)] += 1
+                leaves[tname][leaf] += 1
+                samples[tname] += 1
+            # Schlafen bis zum nächsten Takt (Abtastzeit abziehen)
+            self._stop.wait(max(0.0, interval - (time.monotonic() - now)))
+
+        wall    = time.monotonic() - t_start
+        cpu_end = _thread_cpu_times()
+        names   = {t.ident: t.name for t in threading.enumerate()} | names
+        cpu     = {names.get(i, f"thread-{i}"): cpu_end[i] - cpu_start.get(i, 0.0)
+                   for i in cpu_end if i != me}
+        return self._write(stacks, leaves, samples, cpu, wall)
+
+    def _write(self, stacks, leaves, samples, cpu, wall) -> tuple[str, str]:
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp     = time.strftime("%Y%m%d-%H%M%S")
+        collapsed = os.path.join(self.out_dir, f"profile-{stamp}.collapsed")
+        summary   = os.path.join(self.out_dir, f"profile-{stamp}.txt")
+
+        with open(collapsed, "w", encoding="utf-8") as f:
+            for stack, n in stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+        total = sum(samples.values()) or 1
+        lines = [f"Profil {stamp}: {wall:.1f}s Wandzeit, {self.hz} Hz, "
+                 f"{total} Samples",
+                 "CPU-Zeit: " + ("psutil / pthread-Uhren" if cpu else
+                                 "nicht verfügbar (pip install psutil)"),
+                 "",
+                 f"{'Thread':<32}{'Samples':>9}{'CPU s':>9}{'CPU %':>8}"]
+        order = sorted(samples, key=lambda t: (-cpu.get(t, 0.0), -samples[t]))
+        for tname in order:
+            c = cpu.get(tname)
+            lines.append(f"{tname[:31]:<32}{samples[tname]:>9}"
+                         + (f"{c:>9.2f}{c / wall * 100:>7.1f}%" if c is not None
+                            else f"{'–':>9}{'–':>8}"))
+        for tname in order:
+            lines += ["", f"── {tname} – häufigste innerste Funktionen"]
+            for label, n in leaves[tname].most_common(TOP_FRAMES):
+                lines.append(f"  {n / samples[tname] * 100:5.1f}%  {label}")
+
+        with open(summary, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return collapsed, summary
+
+
+def start_profile(seconds: float = PROFILE_SECONDS, on_done=None) -> SamplingProfiler | None:
+    """Startet einen Lauf; None wenn schon einer läuft."""
+    global _active
+    with _lock:
+        if _active is not None:
+            return None
+        _active = SamplingProfiler(seconds=seconds, on_done=on_done)
+    _active.start()
+    return _active
@@ -0,0 +1,194 @@
+"""
+providers.py
+────────────
+OpenAI-kompatible KI-Endpunkte mit Health-Tracking und Circuit-Breaker.
+
+Funktionsprinzip:
+  - AI_ENDPOINTS (config.py) ist eine geordnete Liste: erster = Standard
+  - Pro Endpunkt: Latenz-Historie (Zeit bis zum ersten Token),
+    Fehler in Folge, Erfolge/Fehler gesamt
+  - Circuit-Breaker: nach AI_BREAKER_FAILURES Fehlern in Folge wird der
+    Endpunkt AI_BREAKER_COOLDOWN_SEC lang übersprungen, danach ein
+    Probe-Versuch (half-open); Erfolg schließt den Breaker wieder.
+    Gilt auch bei nur einem Endpunkt: ist alles pausiert, liefert
+    candidates() nichts – kein Umgehen des Breakers
+  - hedge_delay(): nach dieser Zeit ohne Antwort startet der AISuggester
+    parallel eine Anfrage beim nächsten Endpunkt (Perzentil der Latenz)
+  - Token-Bucket pro Endpunkt (AI_RATE_PER_MIN / AI_RATE_BURST): jede
+    Anfrage braucht ein Token, sonst wird gewartet oder ausgewichen
+  - defer(): Retry-After des Servers → Endpunkt bis dahin pausieren
+    (zählt nicht als Fehler für den Breaker)
+"""
+
+import threading
+import time
+from collections import deque
+
+from config import (
+    AI_ENDPOINTS, AI_BREAKER_FAILURES, AI_BREAKER_COOLDOWN_SEC,
+    AI_HEDGE_PERCENTILE, AI_HEDGE_MIN_DELAY_SEC, AI_HEDGE_DEFAULT_DELAY_SEC,
+    AI_RATE_PER_MIN, AI_RATE_BURST,
+)
+
+LATENCY_WINDOW  = 50      # so viele letzte Latenzen pro Endpunkt merken
+MIN_SAMPLES     = 5       # darunter: AI_HEDGE_DEFAULT_DELAY_SEC statt Perzentil
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket: rate Tokens pro Sekunde, max. burst auf Vorrat."""
+
+    def __init__(self, rate_per_sec: float, burst: int):
+        self.rate    = rate_per_sec
+        self.burst   = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last   = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last   = now
+
+    def try_take(self) -> float:
+        """0.0 → Token genommen; sonst Sekunden bis zum nächsten Token."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (1.0 - self._tokens) / self.rate
+
+    def wait_time(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1.0:
+                return 0.0
+            return (1.0 - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+class Endpoint:
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str,
+                 rate_per_min: float = AI_RATE_PER_MIN, burst: int = AI_RATE_BURST):
+        self.name     = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key  = api_key
+        self.model    = model
+        self.bucket   = TokenBucket(rate_per_min / 60.0, burst)
+
+        self._lock        = threading.Lock()
+        self._latencies   = deque(maxlen=LATENCY_WINDOW)
+        self._fail_streak = 0
+        self._open_until  = 0.0
+        self._defer_until = 0.0
+        self.successes    = 0
+        self.failures     = 0
+        self.rate_limited = 0
+
+    def __repr__(self):
+        return f"Endpoint({self.name})"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    # ── Health ──────────────────────────────────────────────
+
+    def available(self) -> bool:
+        """False solange der Breaker offen ist oder Retry-After läuft."""
+        return time.monotonic() >= max(self._open_until, self._defer_until)
+
+    def deferred(self) -> bool:
+        """True solange ein Retry-After des Servers läuft."""
+        return time.monotonic() < self._defer_until
+
+    def blocked_for(self) -> float:
+        """Sekunden, bis der Endpunkt wieder eine Anfrage annehmen kann."""
+        gate = max(self._open_until, self._defer_until) - time.monotonic()
+        return max(0.0, gate, self.bucket.wait_time())
+
+    def defer(self, seconds: float):
+        """Server hat um Pause gebeten (429 / Retry-After)."""
+        with self._lock:
+            self.rate_limited += 1
+            self._defer_until = max(self._defer_until, time.monotonic() + seconds)
+        print(f"[Providers] {self.name}: Rate-Limit, pausiert für {seconds:.1f}s")
+
+    def record_success(self, latency_s: float):
+        with self._lock:
+            self._latencies.append(latency_s)
+            self._fail_streak = 0
+            self._open_until  = 0.0
+            self.successes   += 1
+
+    def record_failure(self):
+        with self._lock:
+            self._fail_streak += 1
+            self.failures     += 1
+            if self._fail_streak >= AI_BREAKER_FAILURES:
+                self._open_until = time.monotonic() + AI_BREAKER_COOLDOWN_SEC
+                print(f"[Providers] {self.name}: Breaker offen für "
+                      f"{AI_BREAKER_COOLDOWN_SEC}s ({self._fail_streak} Fehler in Folge)")
+
+    def percentile(self, p: float) -> float | None:
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lat = sorted(self._latencies)
+            return {
+                "name":        self.name,
+                "available":   self.available(),
+                "successes":   self.successes,
+                "failures":    self.failures,
+                "fail_streak": self._fail_streak,
+                "rate_limited": self.rate_limited,
+                "p50_ms":      lat[len(lat) // 2] * 1000 if lat else None,
+            }
+
+
+class ProviderPool:
+
+    def __init__(self, endpoints: list[dict] = AI_ENDPOINTS):
+        self.endpoints = [Endpoint(**ep) for ep in endpoints]
+        if not self.endpoints:
+            raise ValueError("AI_ENDPOINTS ist leer")
+
+    @property
+    def primary(self) -> Endpoint:
+        ready = self.candidates()
+        return ready[0] if ready else self.endpoints[0]
+
+    def candidates(self) -> list[Endpoint]:
+        """
+        Endpunkte in Konfig-Reihenfolge, offene Breaker und laufende
+        Retry-After übersprungen. Leer, wenn alle pausiert sind.
+        """
+        return [ep for ep in self.endpoints if ep.available()]
+
+    def paused(self) -> bool:
+        """Alle Endpunkte pausiert (Breaker offen oder Retry-After)?"""
+        return not any(ep.available() for ep in self.endpoints)
+
+    def blocked_for(self) -> float:
+        """Sekunden, bis irgendein Endpunkt wieder eine Anfrage annimmt."""
+        return min(ep.blocked_for() for ep in self.endpoints)
+
+    @staticmethod
+    def hedge_delay(ep: Endpoint) -> float:
+        p = ep.percentile(AI_HEDGE_PERCENTILE)
+        if p is None:
+            return AI_HEDGE_DEFAULT_DELAY_SEC
+        return max(AI_HEDGE_MIN_DELAY_SEC, p)
+
+    def stats(self) -> list[dict]:
+        return [ep.stats() for ep in self.endpoints]
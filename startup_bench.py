@@ -0,0 +1,122 @@
+"""
+startup_bench.py
+────────────────
+Misst, wie schnell die App startet.
+
+Funktionsprinzip:
+  - Import-Zeit: `python -X importtime -c "import app"` in einem frischen
+    Prozess → Gesamtzeit und die teuersten Module (kumulativ). Prüft dabei,
+    dass faster_whisper / ctranslate2 / pyaudiowpatch NICHT mitgeladen werden
+  - Start-Phasen: startet `app.py --startup-bench PHASE` mehrfach; die App
+    meldet Sekunden seit Prozessstart für imports, first_paint, devices,
+    whisper und beendet sich nach PHASE. Dazu die Wandzeit inkl.
+    Interpreter-Start, gemessen von hier aus
+  - Ergebnis: Median je Phase über --runs Läufe
+
+Aufruf:
+    python startup_bench.py --runs 5 --until first_paint
+    python startup_bench.py --imports-only         # ohne Bildschirm nutzbar
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE  = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ("faster_whisper", "ctranslate2", "pyaudiowpatch")
+PHASES = ("imports", "first_paint", "devices", "whisper")
+
+
+def measure_imports(top: int = 12) -> dict:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                          cwd=HERE, capture_output=True, text=True)
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cum_us)))
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "?"}
+    app_cum = next((c for n, _, c in modules if n == "app"), None)
+    loaded  = {n for n, _, _ in modules}
+    return {
+        "app_import_s": app_cum / 1e6 if app_cum else None,
+        "heavy_loaded": [h for h in HEAVY if h in loaded],
+        "top": [(n, c / 1e6) for n, _, c in
+                sorted(modules, key=lambda m: -m[2])[:top]],
+    }
+
+
+def run_app(until: str, timeout: float) -> dict:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "app.py", "--startup-bench", until],
+                            cwd=HERE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding="utf-8", errors="replace")
+    result, last = {}, ""
+    try:
+        for line in proc.stdout:
+            last = line.strip() or last
+            if line.startswith("STARTUP_JSON "):
+                result = json.loads(line[len("STARTUP_JSON "):])
+                result["wall_s"] = time.perf_counter() - t0
+                break
+            if time.perf_counter() - t0 > timeout:
+                break
+    finally:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    if not result:
+        result["error"] = f"keine Startmeldung (Exit-Code {proc.poll()}): {last}"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startzeit der App messen")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--until", choices=PHASES[1:], default="first_paint",
+                        help="bis zu dieser Phase starten, dann beenden")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--imports-only", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = {"imports": measure_imports()}
+    if not args.imports_only:
+        runs = [run_app(args.until, args.timeout) for _ in range(args.runs)]
+        ok   = [r for r in runs if "error" not in r]
+        report["runs"]   = runs
+        report["median"] = {k: statistics.median(r[k] for r in ok if k in r)
+                            for k in PHASES + ("wall_s",)
+                            if any(k in r for r in ok)}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    imp = report["imports"]
+    print("══ Startzeit ══════════════════════════════════")
+    if "error" in imp:
+        print(f"  import app         Fehler: {imp['error']}")
+    else:
+        print(f"  import app         {imp['app_import_s'] * 1000:7.0f} ms")
+        print(f"  schwere Module     {', '.join(imp['heavy_loaded']) or 'keine (lazy ✔)'}")
+        for name, s in imp["top"]:
+            print(f"    {name:<28} {s * 1000:7.1f} ms")
+    if "median" in report:
+        errors = [r["error"] for r in report["runs"] if "error" in r]
+        print(f"  Läufe              {args.runs - len(errors)}/{args.runs} ok (bis {args.until})")
+        for k, v in report["median"].items():
+            print(f"  {k:<18} {v * 1000:7.0f} ms  (Median)")
+        if errors:
+            print(f"  Fehler             {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
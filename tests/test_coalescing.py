@@ -0,0 +1,160 @@
+"""
+Latest-wins-Bündelung in AISuggester.request_suggestions.
+
+Ein Burst innerhalb von AI_COALESCE_MS ergibt genau einen Nachzügler-Aufruf;
+die laufende Anfrage wird erst abgebrochen, wenn dieser wirklich rausgeht.
+Statt HTTP läuft eine Fake-Session, die den letzten Transkript-Satz als
+Vorschlag zurückstreamt.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_suggestions
+from ai_suggestions import AISuggester
+from event_bus import EventBus, AISuggestions, MODE_SYNC
+from providers import ProviderPool
+
+
+class _FakeResponse:
+
+    def __init__(self, text: str, gate: threading.Event):
+        self.status_code = 200
+        self.headers     = {}
+        self.text        = ""
+        self.encoding    = None
+        self.closed      = threading.Event()
+        self._answer     = text
+        self._gate       = gate
+
+    def iter_lines(self, chunk_size=None, decode_unicode=True):
+        # Blockiert wie ein langsames Modell, bis der Test freigibt (oder close())
+        while not self._gate.wait(0.01):
+            if self.closed.is_set():
+                raise ConnectionError("closed")
+        chunk = {"choices": [{"delta": {"content": self._answer}}]}
+        yield "data: " + json.dumps(chunk)
+        yield "data: [DONE]"
+
+    def close(self):
+        self.closed.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _FakeSession:
+
+    def __init__(self):
+        self.calls : list[tuple[str, _FakeResponse]] = []
+        self.gates : list[threading.Event] = []
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, data=None, timeout=None, stream=False):
+        transcript = json.loads(data)["messages"][1]["content"]
+        gate = threading.Event()
+        resp = _FakeResponse("1. " + transcript.splitlines()[-1], gate)
+        with self._lock:
+            self.calls.append((transcript, resp))
+            self.gates.append(gate)
+        return resp
+
+    def close(self):
+        pass
+
+
+def _setup(monkeypatch, window_ms: int):
+    monkeypatch.setattr(ai_suggestions, "AI_COALESCE_MS", window_ms)
+    bus     = EventBus()
+    finals  : list[AISuggestions] = []
+    arrived = threading.Condition()
+
+    def on_ai(ev: AISuggestions):
+        if ev.final:
+            with arrived:
+                finals.append(ev)
+                arrived.notify_all()
+
+    bus.subscribe(AISuggestions, on_ai, mode=MODE_SYNC, name="test")
+    suggester = AISuggester(bus, providers=ProviderPool(
+        [dict(name="fake", base_url="http://fake.invalid", api_key="x", model="fake")]))
+    session = _FakeSession()
+    suggester._session = session
+
+    def wait_finals(n: int) -> bool:
+        with arrived:
+            return arrived.wait_for(lambda: len(finals) >= n, timeout=5)
+
+    return bus, suggester, session, finals, wait_finals
+
+
+def _wait_calls(session: _FakeSession, n: int) -> bool:
+    deadline = time.monotonic() + 5
+    while len(session.calls) < n:
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_burst_is_one_trailing_call_and_inflight_finishes(monkeypatch):
+    bus, suggester, session, finals, wait_finals = _setup(monkeypatch, 300)
+    try:
+        first = suggester.request_suggestions("Satz 0", force=True)
+        assert _wait_calls(session, 1)
+        ids = [suggester.request_suggestions(f"Satz 0\nSatz {i}", force=True)
+               for i in range(1, 6)]
+        # Innerhalb des Fensters: erster Aufruf läuft ungestört weiter
+        assert suggester.stats["cancelled"] == 0
+        assert not session.calls[0][1].closed.is_set()
+        session.gates[0].set()
+        assert wait_finals(1)
+        assert finals[0].request_id == first and finals[0].text == "1. Satz 0"
+
+        # Fensterende: genau ein Nachzügler mit dem jüngsten Kontext
+        assert _wait_calls(session, 2)
+        session.gates[1].set()
+        assert wait_finals(2)
+        assert len(session.calls) == 2
+        assert session.calls[1][0].endswith("Satz 5")
+        assert finals[1].request_id == ids[-1] and finals[1].text == "1. Satz 5"
+        assert suggester.stats["sent"] == 2
+        assert suggester.stats["coalesced"] == 4
+        assert suggester.stats["cancelled"] == 0
+    finally:
+        for gate in session.gates:
+            gate.set()
+        suggester.stop()
+        bus.close()
+
+
+def test_inflight_cancelled_only_when_trailing_call_goes_out(monkeypatch):
+    bus, suggester, session, finals, wait_finals = _setup(monkeypatch, 200)
+    try:
+        suggester.request_suggestions("Satz 0", force=True)
+        assert _wait_calls(session, 1)
+        last = None
+        for i in range(1, 4):
+            last = suggester.request_suggestions(f"Satz 0\nSatz {i}", force=True)
+        assert suggester.stats["cancelled"] == 0
+        # Erster Aufruf hängt noch → beim Senden des Nachzüglers abgebrochen
+        assert _wait_calls(session, 2)
+        assert session.calls[0][1].closed.wait(2)
+        assert suggester.stats["cancelled"] == 1
+        session.gates[1].set()
+        assert wait_finals(1)
+        assert [ev.request_id for ev in finals] == [last]
+        assert finals[0].text == "1. Satz 3"
+    finally:
+        for gate in session.gates:
+            gate.set()
+        suggester.stop()
+        bus.close()
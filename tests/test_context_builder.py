@@ -0,0 +1,165 @@
+"""
+ContextBuilder: Token-Obergrenze, Fenster nach Zeilen-Regler und Übergabe
+der herausgefallenen Zeilen an die Zusammenfassung.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import context_builder
+from context_builder import ContextBuilder, estimate_tokens
+
+
+def _lines(n: int, words: int = 3) -> list[str]:
+    return [f"Zeile{i} " + " ".join(f"wort{i}x{j}" for j in range(words)) for i in range(n)]
+
+
+class _Summarizer:
+    """summarize_fn, die wartet, bis der Test sie freigibt."""
+
+    def __init__(self):
+        self.calls   : list[list[str]] = []
+        self.release = threading.Event()
+
+    def __call__(self, previous: str, new_lines: list[str], max_tokens: int) -> str:
+        self.calls.append(list(new_lines))
+        assert self.release.wait(5)
+        return f"{previous} [{len(new_lines)} Zeilen]".strip()
+
+
+def _wait_idle(cb: ContextBuilder):
+    deadline = time.monotonic() + 5
+    while cb._busy and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cb._busy
+
+
+def test_window_follows_max_lines_slider(monkeypatch):
+    monkeypatch.setattr(context_builder, "CONTEXT_SUMMARY_BATCH", 10)
+    fn = _Summarizer()
+    fn.release.set()
+    cb    = ContextBuilder(fn, max_lines=5)
+    lines = _lines(14)
+    for line in lines:
+        cb.add_line(line)
+    assert fn.calls == []                     # erst 9 Zeilen vor dem Fenster
+    lines.append("Zeile14 noch eine")
+    cb.add_line(lines[-1])
+    _wait_idle(cb)
+    assert fn.calls == [lines[:10]]           # genau bis zum Fensteranfang
+
+    # Regler hoch → Fenster größer, nichts Neues fällt heraus
+    cb.set_max_lines(8)
+    _wait_idle(cb)
+    assert len(fn.calls) == 1
+
+    context, n = cb.build(lines, "", 5)
+    assert n == 5
+    assert "[10 Zeilen]" in context
+    assert context.endswith("\n".join(lines[-5:]))
+
+
+def test_unsummarized_lines_stay_verbatim(monkeypatch):
+    monkeypatch.setattr(context_builder, "CONTEXT_SUMMARY_BATCH", 10)
+    monkeypatch.setattr(context_builder, "CONTEXT_RELEVANT_TOKENS", 0)
+    fn    = _Summarizer()
+    cb    = ContextBuilder(fn, max_lines=5)
+    lines = _lines(12)
+    for line in lines:
+        cb.add_line(line)
+    # 7 Zeilen vor dem Fenster, Batch noch nicht voll → alle wörtlich
+    context, n = cb.build(lines, "", 5)
+    assert fn.calls == [] and n == 12
+    assert context == "\n".join(lines)
+
+
+def test_summary_hand_off_loses_no_line(monkeypatch):
+    monkeypatch.setattr(context_builder, "CONTEXT_SUMMARY_BATCH", 10)
+    monkeypatch.setattr(context_builder, "CONTEXT_RELEVANT_TOKENS", 0)
+    fn    = _Summarizer()
+    cb    = ContextBuilder(fn, max_lines=5)
+    lines = _lines(18)
+    for line in lines:
+        cb.add_line(line)
+    assert len(fn.calls) == 1 and fn.calls[0] == lines[:10]
+
+    # Zusammenfassung läuft noch → alles, was nicht im Fenster ist, wörtlich
+    context, n = cb.build(lines, "", 5)
+    assert n == 18 and context == "\n".join(lines)
+
+    fn.release.set()
+    _wait_idle(cb)
+    # Danach: Zusammenfassung + die 3 noch offenen Zeilen + Fenster
+    context, n = cb.build(lines, "", 5)
+    assert n == 8
+    assert context == ("Bisheriger Verlauf (Zusammenfassung):\n[10 Zeilen]\n\n"
+                       + "\n".join(lines[10:]))
+
+
+def test_token_ceiling(monkeypatch):
+    monkeypatch.setattr(context_builder, "CONTEXT_SUMMARY_BATCH", 10)
+    monkeypatch.setattr(context_builder, "CONTEXT_TOKEN_CEILING", 120)
+    monkeypatch.setattr(context_builder, "CONTEXT_RECENT_TOKENS", 80)
+    monkeypatch.setattr(context_builder, "CONTEXT_RELEVANT_TOKENS", 0)
+    fn    = _Summarizer()
+    cb    = ContextBuilder(fn, max_lines=20)
+    lines = _lines(40, words=8)               # ~23 Tokens pro Zeile
+    for line in lines:
+        cb.add_line(line)
+    header = "Still seit: 3s\n\n"
+    context, n = cb.build(lines, header, 20)
+    assert 1 <= n < 40
+    assert context.endswith(lines[-1])        # neueste Zeile bleibt immer
+    # Noch keine Zusammenfassung → nur Header + Zeilen, gezählt wie in build()
+    body   = context[len(header.rstrip("\n")) + 2:].split("\n")
+    budget = estimate_tokens(header) + sum(estimate_tokens(l) for l in body)
+    assert budget <= 120
+    # Wörtlicher Teil ist ein lückenloses Ende des Transkripts
+    assert body[-n:] == lines[-n:]
+    fn.release.set()
+
+
+def test_late_line_sorted_by_capture_time(monkeypatch):
+    monkeypatch.setattr(context_builder, "CONTEXT_SUMMARY_BATCH", 3)
+    fn    = _Summarizer()
+    cb    = ContextBuilder(fn, max_lines=2)
+    lines = _lines(6)
+    # Loopback-Zeile 2 kommt nach der Mic-Zeile 3 aus dem Decoder
+    for i in (0, 1, 3, 2):
+        cb.add_line(lines[i], t_start=10.0 + i)
+    cb.add_line(lines[4], t_start=14.0)
+    cb.add_line(lines[5])                     # ohne Zeit → hinten an
+    assert cb._log == lines[:6]
+    assert fn.calls == [lines[:3]]            # Batch in Sprechreihenfolge
+
+    # Noch später als die laufende Zusammenfassung → hinter deren Block
+    cb.add_line("Zeile0b sehr spät", t_start=10.5)
+    assert cb._log[3] == "Zeile0b sehr spät"
+    fn.release.set()
+    _wait_idle(cb)
+    assert cb._log == ["Zeile0b sehr spät"] + lines[3:6]
+    assert cb._times == sorted(cb._times)
+
+
+def test_equal_capture_times_keep_arrival_order():
+    cb = ContextBuilder(None)
+    for text in ("a", "b", "c"):
+        cb.add_line(text, t_start=5.0)
+    cb.add_line("früher", t_start=4.0)
+    assert cb._log == ["früher", "a", "b", "c"]
+
+
+def test_relevant_lines_in_capture_order(monkeypatch):
+    monkeypatch.setattr(context_builder, "CONTEXT_SUMMARY_ENABLED", False)
+    cb    = ContextBuilder(None, max_lines=1)
+    older = ["Budget für Marketing zwei", "Budget für Marketing eins"]
+    cb.add_line(older[0], t_start=2.0)
+    cb.add_line(older[1], t_start=1.0)        # spät decodiert, früher gesprochen
+    cb.add_line("Wetter heute gut", t_start=3.0)
+    query = "Wie hoch ist das Budget für Marketing?"
+    cb.add_line(query, t_start=4.0)
+    assert cb._select_relevant([query]) == [older[1], older[0]]
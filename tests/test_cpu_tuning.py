@@ -0,0 +1,126 @@
+"""
+Kern-Zuordnung unter Windows mit nachgebautem kernel32 (läuft auf jedem
+System): CPU-Set-IDs aus GetSystemCpuSetInformation, kein Prozess-Standard,
+nur neue Engine-Threads werden umgelegt.
+"""
+
+import ctypes
+import os
+import struct
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cpu_tuning
+
+# (Gruppe, logischer Prozessor, CPU-Set-ID)
+CPU_SETS = [(0, 0, 256), (0, 1, 257), (0, 2, 258), (0, 3, 259), (1, 0, 300)]
+
+
+def _cpu_set_info(entries) -> bytes:
+    # SYSTEM_CPU_SET_INFORMATION: Size(4) Type(4) Id(4) Group(2) LogicalProcessorIndex(1) …
+    return b"".join(struct.pack("<IIIHB", 32, 0, set_id, group, logical).ljust(32, b"\0")
+                    for group, logical, set_id in entries)
+
+
+def _kernel32(entries=CPU_SETS, calls=None):
+    calls = calls if calls is not None else []
+    data  = _cpu_set_info(entries)
+
+    def get_system_cpu_set_information(buf, length, needed_ref, process, flags):
+        needed_ref._obj.value = len(data)
+        if buf is None or getattr(length, "value", length) < len(data):
+            return 0
+        ctypes.memmove(buf, data, len(data))
+        return 1
+
+    def record(name, result):
+        return lambda *args: calls.append((name, args)) or result
+
+    return SimpleNamespace(
+        GetSystemCpuSetInformation=get_system_cpu_set_information,
+        GetCurrentThread=record("GetCurrentThread", 7),
+        GetCurrentProcess=record("GetCurrentProcess", 9),
+        OpenThread=record("OpenThread", 42),
+        CloseHandle=record("CloseHandle", 1),
+        SetThreadSelectedCpuSets=record("SetThreadSelectedCpuSets", 1),
+        SetProcessDefaultCpuSets=record("SetProcessDefaultCpuSets", 1),
+    ), calls
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    """sys.platform = win32, kein sched_setaffinity, frischer CPU-Set-Cache."""
+    def install(k32):
+        monkeypatch.setattr(ctypes, "windll", SimpleNamespace(kernel32=k32), raising=False)
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.delattr(os, "sched_setaffinity", raising=False)
+    monkeypatch.setattr(cpu_tuning, "_cpu_set_ids", None)
+    return install
+
+
+def _ids(arr) -> list[int]:
+    return list(arr)
+
+
+def test_win_cpu_sets_maps_cores_to_ids(windows):
+    k32, _calls = _kernel32()
+    windows(k32)
+    arr, n = cpu_tuning._win_cpu_sets([0, 2, 64, 99])       # 64 = Gruppe 1, Index 0
+    assert n == 3 and _ids(arr) == [256, 258, 300]
+    assert isinstance(arr[0], int) and ctypes.sizeof(arr) == 3 * ctypes.sizeof(ctypes.c_ulong)
+    assert cpu_tuning.windows_pinning_available()
+
+
+def test_win_cpu_sets_errors(windows):
+    k32, _calls = _kernel32()
+    windows(k32)
+    with pytest.raises(ValueError):
+        cpu_tuning._win_cpu_sets([5, 6])                    # gibt es nicht
+
+
+def test_without_cpu_sets_pinning_is_off(windows):
+    k32, _calls = _kernel32()
+    del k32.GetSystemCpuSetInformation                      # vor Windows 10
+    windows(k32)
+    assert not cpu_tuning.windows_pinning_available()
+    with pytest.raises(OSError):
+        cpu_tuning._win_cpu_sets([0])
+    assert not cpu_tuning.pin_current_thread([0])
+
+
+def test_default_cores_do_not_touch_process_default(windows):
+    k32, calls = _kernel32()
+    windows(k32)
+    assert cpu_tuning.set_default_cores([1, 3])
+    names = [name for name, _args in calls]
+    assert "SetProcessDefaultCpuSets" not in names
+    (handle, arr, n), = [args for name, args in calls if name == "SetThreadSelectedCpuSets"]
+    assert handle == 7 and n == 2 and _ids(arr) == [257, 259]
+
+
+def test_pin_thread_by_id(windows):
+    k32, calls = _kernel32()
+    windows(k32)
+    assert cpu_tuning._pin_thread(1234, [0, 1])
+    names = [name for name, _args in calls]
+    assert names == ["OpenThread", "SetThreadSelectedCpuSets", "CloseHandle"]
+    assert calls[0][1][2] == 1234
+    _handle, arr, n = calls[1][1]
+    assert n == 2 and _ids(arr) == [256, 257]
+
+
+def test_pin_new_threads_skips_old_and_python_threads(monkeypatch):
+    me = threading.get_native_id()
+    monkeypatch.setattr(cpu_tuning, "native_thread_ids", lambda: {1, 2, me, 111, 222})
+    pinned = []
+    monkeypatch.setattr(cpu_tuning, "_pin_thread",
+                        lambda tid, cores: pinned.append((tid, cores)) or True)
+    assert cpu_tuning.pin_new_threads({1, 2}, [4, 5]) == 2
+    assert pinned == [(111, [4, 5]), (222, [4, 5])]
+    # Snapshot vorher fehlgeschlagen → lieber nichts umlegen als alles
+    assert cpu_tuning.pin_new_threads(set(), [4, 5]) == 0
@@ -0,0 +1,90 @@
+"""
+Micro-Batching: _decode_batch() verteilt die Wörter eines gemeinsamen
+Decodes nach Wortmitte auf die Chunks; Aufwärmen nimmt den Batch-Pfad
+(word_timestamps=True) mit. Statt Whisper läuft ein Stub-Modell.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcriber
+from config import SAMPLE_RATE
+from transcriber import Transcriber, BATCH_GAP
+
+
+def _word(start: float, end: float, word: str):
+    return SimpleNamespace(start=start, end=end, word=word)
+
+
+class _StubModel:
+    """transcribe() liefert feste Segmente und merkt sich die Aufrufe."""
+
+    def __init__(self, segments=()):
+        self.segments = list(segments)
+        self.calls    = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio, kwargs))
+        # Wie faster-whisper: Generator, decodiert wird erst beim Iterieren
+        return (s for s in self.segments), SimpleNamespace(language="de")
+
+
+def _silence(sec: float) -> np.ndarray:
+    return np.zeros(int(SAMPLE_RATE * sec), dtype=np.float32)
+
+
+def test_words_go_to_chunk_by_midpoint():
+    # Chunks 1.0 s, 0.5 s, 0.8 s, dazwischen je 0.4 s Trenner:
+    #   Chunk 0: 0.0–1.0   Grenze bei 1.2
+    #   Chunk 1: 1.4–1.9   Grenze bei 2.1
+    #   Chunk 2: 2.3–3.1   Grenze bei 3.3
+    assert len(BATCH_GAP) == int(SAMPLE_RATE * 0.4)
+    model = _StubModel([
+        SimpleNamespace(text="Hallo Welt ja", words=[
+            _word(0.10, 0.50, " Hallo"), _word(0.60, 0.95, " Welt"),
+            _word(0.90, 1.45, " ja"),            # ragt in den Trenner, Mitte 1.175 → Chunk 0
+        ]),
+        SimpleNamespace(text="genau", words=[
+            _word(1.05, 1.50, " genau"),         # ragt aus dem Trenner, Mitte 1.275 → Chunk 1
+        ]),
+        SimpleNamespace(text="", words=None),    # Segment ohne Wörter
+        SimpleNamespace(text="bis Freitag danke", words=[
+            _word(2.40, 2.70, " bis"), _word(2.70, 3.05, " Freitag"),
+            _word(3.20, 3.60, " danke"),         # Mitte 3.4 hinter allen Grenzen → letzter Chunk
+        ]),
+    ])
+    chunks = [_silence(1.0), _silence(0.5), _silence(0.8)]
+    texts  = Transcriber._decode_batch(model, chunks)
+    assert texts == ["Hallo Welt ja", "genau", "bis Freitag danke"]
+
+    (audio, kwargs), = model.calls
+    assert len(audio) == sum(len(c) for c in chunks) + 2 * len(BATCH_GAP)
+    assert audio.dtype == np.float32
+    assert kwargs["word_timestamps"] is True and kwargs["vad_filter"] is False
+
+
+def test_chunk_without_words_gets_empty_text():
+    model = _StubModel([SimpleNamespace(text="ok", words=[_word(0.1, 0.3, " ok")])])
+    assert Transcriber._decode_batch(model, [_silence(0.5), _silence(0.5)]) == ["ok", ""]
+
+
+def test_warmup_covers_batch_path(monkeypatch):
+    monkeypatch.setattr(transcriber, "WHISPER_WARMUP_SEC", 0.5)
+    t = Transcriber.__new__(Transcriber)
+    t._tuning = {"num_workers": 2}
+
+    monkeypatch.setattr(transcriber, "WHISPER_BATCH_ENABLED", True)
+    model = _StubModel()
+    t._warmup(model)
+    flags = sorted(bool(kw.get("word_timestamps")) for _audio, kw in model.calls)
+    assert flags == [False, False, True, True]       # je Worker: einzeln + Batch
+
+    monkeypatch.setattr(transcriber, "WHISPER_BATCH_ENABLED", False)
+    model = _StubModel()
+    t._warmup(model)
+    assert not any(kw.get("word_timestamps") for _audio, kw in model.calls)
@@ -0,0 +1,84 @@
+"""
+PrefetchPolicy: Vorlauf vor der Warnstufe, ein Prefetch pro Stufe,
+höchstens ein Neuversuch nach invalidate() und Kostendeckel, der nur
+gesendete Anfragen zählt.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prefetch import PrefetchPolicy
+
+
+def _policy(max_per_hour: int = 20) -> PrefetchPolicy:
+    return PrefetchPolicy(levels=(20, 40, 60), lead_s=8, max_per_hour=max_per_hour)
+
+
+def test_fires_within_lead_of_next_level():
+    p = _policy()
+    assert not p.check(10, True)             # 10 s vor Stufe 20 → zu früh
+    assert not p.check(13, False)            # nichts Neues gesagt
+    assert p.check(13, True)
+    p.commit(sent=True)
+    assert not p.check(14, True)             # Stufe 20 erledigt
+    assert p.check(33, True)                 # nächste Stufe
+    p.commit(sent=True)
+    assert p.budget_left() == 18
+
+
+def test_check_alone_consumes_nothing():
+    p = _policy(max_per_hour=1)
+    assert p.check(15, True)
+    assert p.check(15, True)                 # ohne commit() weder Stufe noch Budget weg
+    assert p.budget_left() == 1
+
+
+def test_unsent_prefetch_closes_level_without_budget():
+    # Leeres Transkript oder Cache-Treffer → Stufe erledigt, Deckel unberührt
+    p = _policy(max_per_hour=1)
+    assert p.check(15, True)
+    p.commit(sent=False)
+    assert p.budget_left() == 1
+    assert not p.check(16, True)
+    p.invalidate()                           # nichts gesendet → nichts zu invalidieren
+    assert not p.check(16, True)
+
+
+def test_only_one_refetch_per_level():
+    p = _policy()
+    assert p.check(13, True)
+    p.commit(sent=True)
+    # Neue Zeile → Prefetch veraltet → ein Neuversuch
+    p.invalidate()
+    assert p.check(14, True)
+    p.commit(sent=True)
+    # Weitere Zeilen → kein dritter Prefetch für dieselbe Stufe
+    for _ in range(5):
+        p.invalidate()
+        assert not p.check(15, True)
+    assert p.budget_left() == 18
+
+
+def test_reset_after_speech():
+    p = _policy()
+    assert p.check(13, True)
+    p.commit(sent=True)
+    p.invalidate()
+    assert p.check(14, True)
+    p.commit(sent=True)
+    p.reset()                                # Nutzer spricht → alles von vorn
+    assert p.check(13, True)
+    p.commit(sent=True)
+    p.invalidate()
+    assert p.check(14, True)
+
+
+def test_budget_cap():
+    p = _policy(max_per_hour=2)
+    for sil in (13, 33):
+        assert p.check(sil, True)
+        p.commit(sent=True)
+    assert p.budget_left() == 0
+    assert not p.check(53, True)
@@ -0,0 +1,245 @@
+"""
+Failover, Hedging, 429 und Circuit-Breaker gegen lokale Mock-Server
+(mock_server.py) – ohne API-Key und Netz.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_suggestions
+import mock_server
+import providers
+from ai_suggestions import AISuggester
+from event_bus import EventBus, AISuggestions, MODE_SYNC
+from providers import ProviderPool
+
+BODY_A = "1. Antwort von A."
+BODY_B = "1. Antwort von B."
+
+
+def _server(body: str, **kw) -> mock_server.MockServer:
+    kw.setdefault("latency", "fixed:0")
+    return mock_server.MockServer(mock_server.MockConfig(
+        token_delay=0.001, bodies=[body], seed=1, **kw)).start()
+
+
+def _pool(*servers: mock_server.MockServer) -> ProviderPool:
+    # Großzügiger Bucket: hier geht es um Fehlerpfade, nicht ums Kontingent
+    return ProviderPool([dict(name=f"ep{i}", base_url=s.base_url, api_key="mock",
+                              model="mock-model", rate_per_min=600, burst=10)
+                         for i, s in enumerate(servers)])
+
+
+def _ask(pool: ProviderPool) -> tuple[AISuggestions, float, dict]:
+    """Eine Anfrage → (finales Event, Dauer, Suggester-Statistik)."""
+    bus   = EventBus()
+    final = []
+    done  = threading.Event()
+
+    def on_ai(ev: AISuggestions):
+        if ev.final:
+            final.append(ev)
+            done.set()
+
+    bus.subscribe(AISuggestions, on_ai, mode=MODE_SYNC, name="test")
+    suggester = AISuggester(bus, providers=pool)
+    t0 = time.monotonic()
+    try:
+        suggester.request_suggestions("Ich: Wann ist die Deadline?", force=True)
+        assert done.wait(15), "keine finale Antwort"
+        return final[0], time.monotonic() - t0, dict(suggester.stats)
+    finally:
+        suggester.stop()
+        bus.close()
+
+
+def test_failover_to_backup_on_5xx():
+    a = _server(BODY_A, error_rate=1.0, error_status=500)
+    b = _server(BODY_B)
+    try:
+        pool = _pool(a, b)
+        ev, _dt, stats = _ask(pool)
+        assert not ev.error and ev.text == BODY_B
+        assert stats["failover"] == 1 and stats["retried"] == 0
+        assert pool.endpoints[0].failures == 1
+        assert pool.endpoints[1].successes == 1
+        assert a.stats.snapshot()["requests"] == 1
+    finally:
+        a.stop()
+        b.stop()
+
+
+def test_hedge_wins_against_slow_primary(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_HEDGE_ENABLED", True)
+    monkeypatch.setattr(providers, "AI_HEDGE_DEFAULT_DELAY_SEC", 0.1)
+    a = _server(BODY_A, latency="fixed:1.5")
+    b = _server(BODY_B)
+    try:
+        ev, dt, stats = _ask(_pool(a, b))
+        assert not ev.error and ev.text == BODY_B
+        assert stats["hedged"] == 1
+        assert dt < 1.0                                   # nicht auf A gewartet
+        assert b.stats.snapshot()["completed"] == 1
+    finally:
+        a.stop()
+        b.stop()
+
+
+def test_429_defers_without_tripping_breaker(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_RETRY_BASE_SEC", 0.01)
+    a = _server(BODY_A, error_rate=1.0, error_status=429, retry_after=0.2)
+    try:
+        pool = _pool(a)
+        ev, dt, stats = _ask(pool)
+        assert ev.error and "429" in ev.text
+        assert a.stats.snapshot()["requests"] == 1 + ai_suggestions.AI_RETRY_MAX
+        assert stats["retried"] == ai_suggestions.AI_RETRY_MAX
+        assert dt >= 0.2 * ai_suggestions.AI_RETRY_MAX    # Retry-After eingehalten
+        ep = pool.endpoints[0]
+        assert ep.rate_limited == 1 + ai_suggestions.AI_RETRY_MAX
+        assert ep.failures == 0                           # Kontingent ≠ Ausfall
+    finally:
+        a.stop()
+
+
+def test_429_fails_over_to_backup():
+    a = _server(BODY_A, error_rate=1.0, error_status=429, retry_after=30)
+    b = _server(BODY_B)
+    try:
+        pool = _pool(a, b)
+        ev, _dt, _stats = _ask(pool)
+        assert not ev.error and ev.text == BODY_B
+        assert pool.candidates() == [pool.endpoints[1]]   # A pausiert
+    finally:
+        a.stop()
+        b.stop()
+
+
+def test_single_endpoint_breaker_fails_fast():
+    a = _server(BODY_A)
+    try:
+        pool = _pool(a)
+        ep   = pool.endpoints[0]
+        for _ in range(providers.AI_BREAKER_FAILURES):
+            ep.record_failure()
+        assert pool.candidates() == [] and pool.paused()
+        ev, dt, _stats = _ask(pool)
+        assert ev.error and "pausiert" in ev.text
+        assert dt < 1.0
+        assert a.stats.snapshot()["requests"] == 0        # Breaker nicht umgangen
+    finally:
+        a.stop()
+
+
+def test_breaker_half_open_probe(monkeypatch):
+    monkeypatch.setattr(providers, "AI_BREAKER_COOLDOWN_SEC", 0.05)
+    a = _server(BODY_A)
+    try:
+        pool = _pool(a)
+        ep   = pool.endpoints[0]
+        for _ in range(providers.AI_BREAKER_FAILURES):
+            ep.record_failure()
+        time.sleep(0.1)
+        assert pool.candidates() == [ep]                  # Probe erlaubt
+        ev, _dt, _stats = _ask(pool)
+        assert not ev.error and ev.text == BODY_A
+        assert ep.stats()["fail_streak"] == 0
+    finally:
+        a.stop()
+
+
+# ── Token-Bucket, Backoff, Retry-After, Latenz-Budget ──────────────────────
+
+def test_token_bucket_burst_and_refill(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(providers.time, "monotonic", lambda: now[0])
+    bucket = providers.TokenBucket(rate_per_sec=2.0, burst=3)
+    assert [bucket.try_take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_take() == 0.5          # leer → 1 Token in 0.5 s
+    assert bucket.wait_time() == 0.5
+    now[0] += 0.25
+    assert bucket.wait_time() == 0.25
+    now[0] += 0.25
+    assert bucket.try_take() == 0.0
+    now[0] += 10                             # nie mehr als burst auf Vorrat
+    assert [bucket.try_take() for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+
+def test_token_bucket_without_rate():
+    bucket = providers.TokenBucket(rate_per_sec=0.0, burst=1)
+    assert bucket.try_take() == 0.0
+    assert bucket.try_take() == float("inf")
+
+
+def test_backoff_is_capped_with_jitter(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_RETRY_BASE_SEC", 0.5)
+    monkeypatch.setattr(ai_suggestions, "AI_RETRY_MAX_DELAY_SEC", 8)
+    for attempt, cap in [(0, 0.5), (1, 1.0), (2, 2.0), (5, 8.0), (10, 8.0)]:
+        for _ in range(50):
+            assert cap / 2 <= ai_suggestions._backoff(attempt) <= cap
+
+
+def test_parse_retry_after():
+    parse = ai_suggestions._parse_retry_after
+    assert parse(None) is None and parse("") is None
+    assert parse("2.5") == 2.5
+    assert parse("-3") == 0.0
+    assert parse("kaputt") is None
+    from email.utils import formatdate
+    assert 25 <= parse(formatdate(time.time() + 30, usegmt=True)) <= 30
+
+
+def test_503_retry_after_is_honoured(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_RETRY_BASE_SEC", 0.01)
+    monkeypatch.setattr(ai_suggestions, "AI_RETRY_MAX", 2)
+    a = _server(BODY_A, error_rate=1.0, error_status=503, retry_after=0.3)
+    try:
+        pool = _pool(a)
+        ev, dt, stats = _ask(pool)
+        assert ev.error and "503" in ev.text
+        assert a.stats.snapshot()["requests"] == 3
+        assert stats["retried"] == 2
+        assert dt >= 0.6                     # 2× Retry-After statt 2× ~10 ms Backoff
+        assert pool.endpoints[0].failures == 3  # 5xx zählt für den Breaker
+    finally:
+        a.stop()
+
+
+def test_retry_after_beyond_budget_gives_up(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_LATENCY_BUDGET_SEC", 1)
+    a = _server(BODY_A, error_rate=1.0, error_status=429, retry_after=5)
+    try:
+        ev, dt, stats = _ask(_pool(a))
+        assert ev.error and dt < 1.0         # nicht 5 s warten, die Antwort käme zu spät
+        assert stats["retried"] == 0
+        assert a.stats.snapshot()["requests"] == 1
+    finally:
+        a.stop()
+
+
+def test_hanging_attempt_is_cut_at_deadline(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_LATENCY_BUDGET_SEC", 0.5)
+    a = _server(BODY_A, latency="fixed:3")
+    try:
+        ev, dt, _stats = _ask(_pool(a))
+        assert ev.error and "abgebrochen" in ev.text
+        assert dt < 1.5                      # nicht AI_TIMEOUT_SEC
+    finally:
+        a.stop()
+
+
+def test_stream_started_before_deadline_finishes(monkeypatch):
+    monkeypatch.setattr(ai_suggestions, "AI_LATENCY_BUDGET_SEC", 0.3)
+    monkeypatch.setattr(mock_server, "CHUNK_CHARS", 2)
+    a = mock_server.MockServer(mock_server.MockConfig(
+        latency="fixed:0", token_delay=0.05, bodies=[BODY_A], seed=1)).start()
+    try:
+        ev, dt, _stats = _ask(_pool(a))
+        assert not ev.error and ev.text == BODY_A
+        assert dt > 0.3                      # Stream lief über die Deadline hinaus
+    finally:
+        a.stop()
@@ -0,0 +1,94 @@
+"""
+Streaming-Vorschläge gegen den lokalen Mock-Server (mock_server.py).
+
+Läuft ohne API-Key und Netz:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock_server
+from ai_suggestions import AISuggester, SuggestionStreamParser
+from event_bus import EventBus, AISuggestions, MODE_SYNC
+from providers import ProviderPool
+
+# Punkt am Ende von Zeile 1 – der erste Vorschlag geht trotzdem weiter
+MULTILINE = ("1. Frag nach dem Zeitplan.\n"
+             "   Zum Beispiel: bis wann muss es fertig sein?\n"
+             "2. Fass kurz zusammen, was ihr beschlossen habt.\n"
+             "3. Schlag vor, die offenen Punkte bis Freitag zu klären.")
+EXPECTED = ["1. Frag nach dem Zeitplan. Zum Beispiel: bis wann muss es fertig sein?",
+            "2. Fass kurz zusammen, was ihr beschlossen habt.",
+            "3. Schlag vor, die offenen Punkte bis Freitag zu klären."]
+
+
+def _feed_in_pieces(text: str, size: int) -> tuple[SuggestionStreamParser, list[list[str]]]:
+    parser, steps = SuggestionStreamParser(), []
+    for i in range(0, len(text), size):
+        steps.append(parser.feed(text[i:i + size]))
+    steps.append(parser.finish())
+    return parser, steps
+
+
+def test_parser_chunk_boundaries_mid_item():
+    for size in (1, 3, 4, 7, len(MULTILINE)):
+        parser, _ = _feed_in_pieces(MULTILINE, size)
+        assert parser.items == EXPECTED, size
+
+
+def test_parser_item_done_when_next_starts():
+    parser = SuggestionStreamParser()
+    assert parser.feed("1. Erster Satz.\n") == []          # könnte weitergehen
+    assert parser.feed("   Noch eine Zeile.\n") == []
+    assert parser.feed("2") == []                          # noch keine Nummer
+    assert parser.feed(". Zwei") == ["1. Erster Satz. Noch eine Zeile."]
+    assert parser.feed("ter\n") == []
+    assert parser.finish() == ["2. Zweiter"]
+
+
+def test_parser_blank_line_closes_item():
+    parser = SuggestionStreamParser()
+    assert parser.feed("1. Erster.\n\n") == ["1. Erster."]
+    assert parser.finish() == []
+
+
+def _run_stream(bodies: list[str]) -> tuple[list[AISuggestions], dict]:
+    server = mock_server.MockServer(mock_server.MockConfig(
+        latency="fixed:0", token_delay=0.001, bodies=bodies, seed=1)).start()
+    bus    = EventBus()
+    events, done = [], threading.Event()
+
+    def on_ai(ev: AISuggestions):
+        events.append(ev)
+        if ev.final:
+            done.set()
+
+    bus.subscribe(AISuggestions, on_ai, mode=MODE_SYNC, name="test")
+    suggester = AISuggester(bus, providers=ProviderPool(
+        [dict(name="mock", base_url=server.base_url, api_key="mock", model="mock-model")]))
+    try:
+        suggester.request_suggestions("Ich: Wann ist die Deadline?", force=True)
+        assert done.wait(10), "keine finale Antwort vom Mock-Server"
+        return events, server.stats.snapshot()
+    finally:
+        suggester.stop()
+        bus.close()
+        server.stop()
+
+
+def test_stream_via_mock_server(monkeypatch):
+    # 3 Zeichen pro SSE-Delta → Grenzen mitten in Wörtern und Einträgen
+    monkeypatch.setattr(mock_server, "CHUNK_CHARS", 3)
+    events, stats = _run_stream([MULTILINE])
+
+    partial = [ev for ev in events if not ev.final]
+    final   = [ev for ev in events if ev.final]
+    assert len(final) == 1 and not final[0].error
+    assert final[0].text == MULTILINE                      # [DONE] beendet sauber
+    # Vorschläge kommen einzeln, sobald der nächste beginnt – nie halbe Einträge
+    assert [ev.text for ev in partial] == ["\n".join(EXPECTED[:1]), "\n".join(EXPECTED[:2])]
+    assert stats["completed"] == 1 and stats["aborted"] == 0
@@ -0,0 +1,67 @@
+"""
+Timeline: Zeilen nach Aufnahmezeit statt nach Decode-Ende; capture_time()
+rechnet die PortAudio-Zeitstempel auf time.monotonic() um.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcriber
+from transcriber import Timeline, capture_time, CAPTURE_LATENCY_MAX
+
+NOW = 1000.0
+
+
+def test_late_result_sorted_before_newer_lines():
+    tl = Timeline()
+    assert tl.insert(10.0, "mic", "eins") == 0.0
+    assert tl.insert(12.0, "mic", "drei") == 0.0
+    # Loopback-Zeile wurde früher gesprochen, aber später fertig
+    assert tl.insert(11.0, "loopback", "zwei") == pytest.approx(1.0)
+    assert tl.last_n(3) == ["eins", "zwei", "drei"]
+    assert tl.insert(9.0, "mic", "null") == pytest.approx(3.0)
+    assert tl.last_n(10) == ["null", "eins", "zwei", "drei"]
+
+
+def test_equal_timestamps_keep_arrival_order():
+    tl = Timeline()
+    for text in ("a", "b", "c"):
+        assert tl.insert(5.0, "mic", text) == 0.0
+    tl.insert(5.0, "loopback", "d")
+    assert tl.last_n(4) == ["a", "b", "c", "d"]
+
+
+def test_max_lines_drops_oldest_by_capture_time():
+    tl = Timeline(max_lines=3)
+    for t in (1.0, 3.0, 4.0):
+        tl.insert(t, "mic", str(t))
+    tl.insert(2.0, "mic", "2.0")               # spät, aber nicht die älteste
+    assert len(tl) == 3 and tl.last_n(3) == ["2.0", "3.0", "4.0"]
+    tl.clear()
+    assert len(tl) == 0 and tl.last_n(3) == []
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(transcriber.time, "monotonic", lambda: NOW)
+
+
+def test_capture_time_uses_adc_latency(clock):
+    info = {"input_buffer_adc_time": 50.0, "current_time": 50.08}
+    assert capture_time(info, 1600, 16000) == pytest.approx(NOW - 0.08)
+
+
+@pytest.mark.parametrize("info", [
+    {"input_buffer_adc_time": 0.0, "current_time": 0.0},                       # WASAPI-Loopback
+    {"input_buffer_adc_time": 50.0, "current_time": 49.9},                     # negative Latenz
+    {"input_buffer_adc_time": 50.0, "current_time": 50.0 + CAPTURE_LATENCY_MAX + 0.5},
+    {},                                                                         # Felder fehlen
+    None,                                                                       # kein time_info
+])
+def test_capture_time_falls_back_to_buffer_length(clock, info):
+    # Puffer gerade voll geworden → erstes Sample liegt eine Pufferlänge zurück
+    assert capture_time(info, 1600, 16000) == pytest.approx(NOW - 0.1)
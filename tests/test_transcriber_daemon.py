@@ -0,0 +1,104 @@
+"""
+Transkriptions-Dienst: Zugang nur mit Token aus der Nutzer-Datei und
+begrenztes Warten in RemoteTranscriber.start().
+
+Whisper wird nicht geladen – _load ist durch einen Stub ersetzt.
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcriber_daemon
+from transcriber_daemon import TranscriberDaemon, RemoteTranscriber, HOST
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def daemon(monkeypatch, tmp_path):
+    """Dienst im Hintergrund; ready=True → meldet sich sofort bereit."""
+    monkeypatch.setattr(transcriber_daemon, "TRANSCRIBER_DAEMON_TOKEN_FILE",
+                        str(tmp_path / "daemon.token"))
+    started = []
+
+    def run(ready: bool = True) -> TranscriberDaemon:
+        def fake_load(self):
+            if ready:
+                self._state = "ready"
+        monkeypatch.setattr(TranscriberDaemon, "_load", fake_load)
+        d = TranscriberDaemon(_free_port())
+        threading.Thread(target=d.serve, daemon=True).start()
+        deadline = time.monotonic() + 5
+        while not d._token and time.monotonic() < deadline:
+            time.sleep(0.01)
+        started.append(d)
+        return d
+
+    yield run
+    for d in started:
+        d.stop()
+
+
+def _first_reply(port: int, first: dict | None) -> str:
+    with socket.create_connection((HOST, port), timeout=5) as sock:
+        if first is not None:
+            sock.sendall((json.dumps(first) + "\n").encode("utf-8"))
+        return sock.makefile("r", encoding="utf-8").readline()
+
+
+def test_token_file_is_user_only(daemon):
+    d    = daemon()
+    path = transcriber_daemon._token_path(d.port)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == d._token and len(d._token) == 64
+    if os.name != "nt":
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_client_with_token_gets_hello(daemon):
+    d     = daemon()
+    hello = json.loads(_first_reply(d.port, {"op": "auth", "token": d._token}))
+    assert hello["type"] == "hello" and hello["state"] == "ready"
+
+
+def test_wrong_or_missing_token_is_disconnected(daemon, monkeypatch):
+    monkeypatch.setattr(transcriber_daemon, "AUTH_SEC", 0.2)
+    d = daemon()
+    assert _first_reply(d.port, {"op": "auth", "token": "0" * 64}) == ""
+    assert _first_reply(d.port, {"op": "shutdown"}) == ""
+    assert _first_reply(d.port, None) == ""          # schweigt → nach AUTH_SEC getrennt
+    assert not d._stop.is_set()                      # shutdown ohne Token ignoriert
+
+
+def test_remote_start_connects_with_token(daemon):
+    d      = daemon()
+    remote = RemoteTranscriber(port=d.port)
+    try:
+        remote.start()
+        assert remote._ready.is_set() and remote._error is None
+    finally:
+        remote.stop()
+
+
+def test_remote_start_gives_up_without_sign_of_life(daemon, monkeypatch):
+    monkeypatch.setattr(transcriber_daemon, "TRANSCRIBER_DAEMON_READY_SEC", 0.3)
+    d      = daemon(ready=False)
+    remote = RemoteTranscriber(port=d.port)
+    t0 = time.monotonic()
+    with pytest.raises(RuntimeError, match="meldet sich"):
+        remote.start()
+    assert time.monotonic() - t0 < 3
+    assert remote._sock is None                      # Verbindung wieder freigegeben
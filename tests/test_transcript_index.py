@@ -0,0 +1,80 @@
+"""
+BM25-Ranking im TranscriptIndex und das Token-Budget der relevanten
+Zeilen im ContextBuilder.
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import context_builder
+from context_builder import ContextBuilder, estimate_tokens
+from transcript_index import TranscriptIndex, tokenize, BM25_K1, BM25_B
+
+
+def test_tokenize():
+    # Kleinschreibung, Umlaute bleiben, Stoppwörter/kurze Tokens/Zahlen fliegen raus
+    assert tokenize("Ähm, wir MÜSSEN das Budget bis 2025 prüfen, ok?") == \
+        ["müssen", "budget", "prüfen"]
+    assert tokenize("ja so ist es") == []
+
+
+def test_idf_rare_term_wins():
+    index = TranscriptIndex()
+    for i in range(5):
+        index.add(f"Projekt Statusbericht Nummer{i}")
+    index.add("Projekt Datenbank Migration")
+    hits = index.search("Projekt Datenbank")
+    # "projekt" steht überall → kaum Gewicht; "datenbank" entscheidet
+    assert hits[0][1] == "Projekt Datenbank Migration"
+    assert hits[0][2] > 2 * hits[1][2]
+
+
+def test_length_normalisation():
+    index = TranscriptIndex()
+    short = index.add("Deadline verschieben")
+    long_ = index.add("Deadline Kunde Vertrag Rechnung Termin Angebot verschieben Freigabe")
+    index.add("Mittagessen Kantine")
+    scores = {doc_id: score for doc_id, _line, score in index.search("Deadline")}
+    assert scores[short] > scores[long_]
+
+
+def test_score_matches_formula():
+    index = TranscriptIndex()
+    index.add("Budget Budget Planung")          # 3 Terme, tf=2
+    index.add("Urlaub Planung")                 # 2 Terme
+    (doc_id, _line, score), = index.search("Budget")
+    n, df, avg_len = 2, 1, 2.5
+    idf  = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    norm = 2 + BM25_K1 * (1 - BM25_B + BM25_B * 3 / avg_len)
+    assert doc_id == 0
+    assert math.isclose(score, idf * 2 * (BM25_K1 + 1) / norm)
+
+
+def test_exclude_and_k():
+    index = TranscriptIndex()
+    lines = [f"Server Ausfall Teil{i}" for i in range(6)]
+    for line in lines:
+        index.add(line)
+    hits = index.search("Server Ausfall", k=3, exclude={lines[0], lines[1]})
+    assert len(hits) == 3
+    assert not {lines[0], lines[1]} & {line for _id, line, _s in hits}
+
+
+def test_relevant_lines_respect_token_budget(monkeypatch):
+    long_line = "Budget " + " ".join(f"füllwort{i}" for i in range(30))
+    fits      = ["Budget Freigabe Freigabe Controlling", "Budget Freigabe Einkauf"]
+    budget    = sum(estimate_tokens(l) for l in fits)
+    monkeypatch.setattr(context_builder, "CONTEXT_RELEVANT_TOKENS", budget)
+    monkeypatch.setattr(context_builder, "CONTEXT_RELEVANT_MAX", 6)
+    cb = ContextBuilder()
+    for line in [fits[0], long_line, "Mittagessen Kantine", fits[1]]:
+        cb.add_line(line)
+    picked = cb._select_relevant(["Wer macht die Budget Freigabe?"])
+    # Zu lange Treffer werden übersprungen, kleinere passen danach noch rein
+    assert long_line not in picked
+    assert sum(estimate_tokens(l) for l in picked) <= budget
+    # Chronologisch, nicht nach Score
+    assert picked == fits
@@ -0,0 +1,107 @@
+"""
+trim_silence(): Rand bleibt stehen, reine Stille bleibt unberührt, leise
+Loopback-Sprache überlebt die Loopback-Schwelle, entfernte Dauer landet in
+der Metrik.
+
+tests/fixtures/*.wav sind synthetische, sprachähnliche Laute (16 kHz mono,
+Grundton 100–180 Hz mit Obertönen und Silben-Hüllkurve), keine Aufnahmen.
+"""
+
+import os
+import sys
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcriber
+from config import SAMPLE_RATE
+from transcriber import (trim_silence, FRAME_SAMPLES, PREROLL_MS, SILENCE_MS,
+                         TRIM_GUARD_MS, TRIM_RMS_FACTOR, VAD_RMS_THRESH, LOOPBACK_RMS_FACTOR)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GUARD    = int(SAMPLE_RATE * TRIM_GUARD_MS / 1000)
+
+
+def _wav(name: str) -> np.ndarray:
+    with wave.open(os.path.join(FIXTURES, name), "rb") as w:
+        assert w.getframerate() == SAMPLE_RATE and w.getnchannels() == 1
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def _like_vad_chunk(speech: np.ndarray, noise: float = 0.002) -> tuple[np.ndarray, int]:
+    """Pre-Roll + Sprache + Nachlauf wie vom VADAccumulator → (Chunk, Sprachbeginn)."""
+    rng  = np.random.default_rng(0)
+    pre  = noise * rng.standard_normal(int(SAMPLE_RATE * PREROLL_MS / 1000))
+    post = noise * rng.standard_normal(int(SAMPLE_RATE * SILENCE_MS / 1000))
+    return np.concatenate([pre, speech, post]).astype(np.float32), len(pre)
+
+
+def _frame_rms(audio: np.ndarray) -> np.ndarray:
+    n = len(audio) // FRAME_SAMPLES
+    return np.sqrt(np.mean(audio[:n * FRAME_SAMPLES].reshape(n, FRAME_SAMPLES) ** 2, axis=1))
+
+
+def _locate(trimmed: np.ndarray, chunk: np.ndarray) -> int:
+    """Startindex des getrimmten Stücks im Original (trim_silence schneidet nur)."""
+    assert np.shares_memory(trimmed, chunk)
+    return (trimmed.ctypes.data - chunk.ctypes.data) // chunk.itemsize
+
+
+def test_guard_margin_kept_around_speech():
+    for name in ("utterance_short.wav", "utterance_long.wav"):
+        chunk, speech_at = _like_vad_chunk(_wav(name))
+        trimmed, removed = trim_silence(chunk, VAD_RMS_THRESH)
+        assert removed == len(chunk) - len(trimmed) > 0
+        loud  = np.flatnonzero(_frame_rms(chunk) >= VAD_RMS_THRESH * TRIM_RMS_FACTOR)
+        start = _locate(trimmed, chunk)
+        # Genau TRIM_GUARD_MS vor dem ersten und nach dem letzten lauten Frame
+        assert start == loud[0] * FRAME_SAMPLES - GUARD
+        assert start + len(trimmed) == (loud[-1] + 1) * FRAME_SAMPLES + GUARD
+        assert start <= speech_at - GUARD // 2
+        # Pre-Roll ist größtenteils weg
+        assert removed / SAMPLE_RATE > 0.6
+
+
+def test_all_silence_chunk_untouched():
+    chunk, _ = _like_vad_chunk(np.zeros(0, dtype=np.float32))
+    trimmed, removed = trim_silence(chunk, VAD_RMS_THRESH)
+    assert removed == 0 and trimmed is chunk
+    short = np.zeros(FRAME_SAMPLES - 1, dtype=np.float32)   # kürzer als ein Frame
+    assert trim_silence(short)[1] == 0
+
+
+def test_loopback_threshold_keeps_quiet_speech():
+    speech = _wav("utterance_quiet.wav")
+    chunk, speech_at = _like_vad_chunk(speech, noise=0.0005)  # Loopback: digital sauber
+    speech_end = speech_at + len(speech)
+
+    loop_thresh = VAD_RMS_THRESH * LOOPBACK_RMS_FACTOR
+    trimmed, _ = trim_silence(chunk, loop_thresh)
+    start = _locate(trimmed, chunk)
+    assert start <= speech_at and start + len(trimmed) >= speech_end
+
+    # Mit der Mic-Schwelle würden leiser Anlaut und Ausklang abgeschnitten
+    mic_trimmed, _ = trim_silence(chunk, VAD_RMS_THRESH)
+    mic_start = _locate(mic_trimmed, chunk)
+    assert mic_start > speech_at or mic_start + len(mic_trimmed) < speech_end
+
+
+def test_removed_duration_metric(monkeypatch):
+    recorded = []
+
+    class _Metrics:
+        def record(self, name, value):
+            recorded.append((name, value))
+
+    monkeypatch.setattr(transcriber, "METRICS", _Metrics())
+    monkeypatch.setattr(transcriber, "TRIM_SILENCE", True)
+    chunk, _ = _like_vad_chunk(_wav("utterance_short.wav"))
+    out = transcriber.Transcriber._prepare(chunk, VAD_RMS_THRESH)
+    assert recorded == [("whisper.trimmed_s", (len(chunk) - len(out)) / SAMPLE_RATE)]
+
+    monkeypatch.setattr(transcriber, "TRIM_SILENCE", False)
+    assert transcriber.Transcriber._prepare(chunk, VAD_RMS_THRESH) is chunk
+    assert len(recorded) == 1
@@ -0,0 +1,122 @@
+"""
+Sicherheitsnetz-Split im VADAccumulator: Schnitt am leisesten Frame der
+letzten CUT_LOOKBACK_MS, OVERLAP_MS wandern in den Folge-Chunk (seam=True);
+dedupe_seam() entfernt an der Naht höchstens SEAM_MAX_WORDS Wörter.
+
+Die Frames haben konstante Amplitude = RMS, jeder Frame einen eigenen Wert –
+so lässt sich im ausgegebenen Audio ablesen, welcher Frame wo gelandet ist.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_bus import EventBus
+from transcriber import (Transcriber, VADAccumulator, dedupe_seam, FRAME_SAMPLES, FRAME_SEC,
+                         MAX_CHUNK_FR, CUT_LOOKBACK_FR, OVERLAP_FR, SILENCE_FRAMES,
+                         SEAM_MAX_WORDS, VAD_RMS_THRESH)
+
+T0 = 100.0
+
+
+def _level(i: int) -> float:
+    return 0.1 + i * 1e-4                     # laut, je Frame unterscheidbar
+
+
+def _frames(levels) -> np.ndarray:
+    return np.concatenate([np.full(FRAME_SAMPLES, a, dtype=np.float32) for a in levels])
+
+
+def _frame_levels(audio: np.ndarray) -> list[float]:
+    return [float(f[0]) for f in audio.reshape(-1, FRAME_SAMPLES)]
+
+
+def _run(levels) -> list[tuple[np.ndarray, bool, float]]:
+    chunks = []
+    vad = VADAccumulator(lambda a, seam, t: chunks.append((a, seam, t)), name="test")
+    vad.push(_frames(levels), t_capture=T0)
+    return chunks
+
+
+def test_split_cuts_at_quietest_frame_in_lookback():
+    first_lookback = MAX_CHUNK_FR - CUT_LOOKBACK_FR
+    dip            = first_lookback + 20       # leisester Frame im Suchfenster
+    quieter_before = first_lookback - 30       # noch leiser, aber vor dem Fenster
+
+    levels = [_level(i) for i in range(MAX_CHUNK_FR + 20)]
+    levels[dip]            = VAD_RMS_THRESH * 2     # noch Sprache, kein Pausen-Flush
+    levels[quieter_before] = VAD_RMS_THRESH * 1.2
+    levels += [0.0] * SILENCE_FRAMES
+
+    chunks = _run(levels)
+    assert len(chunks) == 2
+    (head, head_seam, head_t), (tail, tail_seam, tail_t) = chunks
+
+    # Erster Chunk endet direkt nach dem leisesten Frame im Fenster
+    head_levels = _frame_levels(head)
+    assert len(head_levels) == dip + 1
+    assert head_levels[-1] == pytest.approx(levels[dip])
+    assert not head_seam and head_t == pytest.approx(T0)
+
+    # Folge-Chunk beginnt OVERLAP_FR Frames vor dem Schnitt
+    tail_levels = _frame_levels(tail)
+    assert tail_levels[:OVERLAP_FR] == pytest.approx(head_levels[-OVERLAP_FR:])
+    assert tail_levels[:len(levels) - (dip + 1 - OVERLAP_FR)] == pytest.approx(
+        levels[dip + 1 - OVERLAP_FR:])
+    assert tail_seam
+    assert tail_t == pytest.approx(T0 + (dip + 1 - OVERLAP_FR) * FRAME_SEC)
+
+
+def test_seam_flag_only_on_chunk_after_split():
+    # Zwei normale Äußerungen mit Pause → kein Split, keine Naht
+    speech = [_level(i) for i in range(20)] + [0.0] * SILENCE_FRAMES
+    chunks = _run(speech + speech)
+    assert [seam for _a, seam, _t in chunks] == [False, False]
+
+
+def test_dedupe_removes_overlap_words():
+    assert dedupe_seam("wir treffen uns am Freitag", "am Freitag um zehn") == "um zehn"
+    assert dedupe_seam("bis Freitag.", "Freitag, um zehn") == "um zehn"   # Satzzeichen egal
+    assert dedupe_seam("bis Freitag", "um zehn") == "um zehn"            # nichts doppelt
+    assert dedupe_seam("", "um zehn") == "um zehn"
+
+
+def test_dedupe_removes_at_most_seam_max_words():
+    assert SEAM_MAX_WORDS == 2
+    # Drei gleiche Wörter an der Naht passen nicht in OVERLAP_MS – nur zwei fallen weg
+    prev = "und dann und dann"
+    text = "und dann und dann kam er"
+    out  = dedupe_seam(prev, text)
+    assert out == "und dann kam er"
+    assert len(text.split()) - len(out.split()) <= SEAM_MAX_WORDS
+
+
+def test_dedupe_keeps_real_repetition():
+    # "ja, ja, ja" gesprochen: die Naht liefert ein Wort doppelt, der Rest bleibt
+    assert dedupe_seam("ich sag ja", "ja ja genau") == "ja genau"
+    # Wiederholung tiefer im Text wird nicht angefasst
+    assert dedupe_seam("das ist gut", "sehr gut gut") == "sehr gut gut"
+    # Überlappung länger als SEAM_MAX_WORDS → kein Teiltreffer, Text bleibt
+    assert dedupe_seam("wir sehen uns am Freitag", "uns am Freitag wieder") == \
+        "uns am Freitag wieder"
+
+
+def test_transcribe_dedupes_only_seam_chunks(monkeypatch):
+    bus = EventBus()
+    t   = Transcriber(bus)
+    try:
+        replies = iter([["wir treffen uns am Freitag"], ["am Freitag um zehn"],
+                        ["am Freitag wieder"]])
+        monkeypatch.setattr(t, "_decode", lambda model, audio: next(replies))
+        audio = np.zeros(FRAME_SAMPLES * 10, dtype=np.float32)
+        t._transcribe(audio, "mic", T0)
+        t._transcribe(audio, "mic", T0 + 6, seam=True)
+        t._transcribe(audio, "mic", T0 + 20)          # neue Äußerung, keine Naht
+        assert t.timeline.last_n(3) == ["wir treffen uns am Freitag", "um zehn",
+                                        "am Freitag wieder"]
+    finally:
+        bus.close()
@@ -8,24 +8,71 @@ Funktionsprinzip:
   - Einfacher Energie-VAD erkennt Sprache/Stille pro Frame
   - Sobald Sprache endet (Pause > SILENCE_MS) → sofort an Whisper
   - Minimale Chunk-Länge: MIN_SPEECH_MS (verhindert "aha"-Verlust)
-  - Maximale Chunk-Länge: MAX_CHUNK_SEC (Sicherheitsnetz)
+  - Maximale Chunk-Länge: MAX_CHUNK_SEC (Sicherheitsnetz, bei jedem Frame
+    geprüft): geschnitten wird am leisesten Frame der letzten CUT_LOOKBACK_MS,
+    OVERLAP_MS davor wandern in den nächsten Chunk mit; doppelt erkannte
+    Wörter an der Naht entfernt dedupe_seam()
 
 Ergebnis: "aha" wird in ~400ms erkannt statt nach 3 Sekunden.
+
+Vor dem Decode: trim_silence() schneidet Pre-Roll und Stille am Ende bis auf
+TRIM_GUARD_MS weg – bei kurzen Einwürfen ist sonst der Großteil des Chunks
+Stille (Messung: decode_bench.py, entfernte Dauer: whisper.trimmed_s). Die
+Schwelle folgt der VAD-Schwelle der Quelle, die den Chunk geschnitten hat
+(Loopback ist leiser) – was der VAD als Sprache behielt, bleibt drin.
+
+Zeitachse: jeder Chunk trägt seine Aufnahmezeit (capture_time() rechnet die
+ADC-Zeit aus PortAudios time_info auf time.monotonic() um). Mic und Loopback
+werden getrennt decodiert – nicht mehr gemischt – und die Ergebnisse nach
+Aufnahmezeit in die Timeline einsortiert. Ein Ergebnis, das später fertig
+wird als ein jüngeres (andere Quelle, andere Decode-Spur), landet trotzdem
+an der richtigen Stelle (TranscriptLine.t_start, Metrik timeline.late).
+
+Micro-Batching (WHISPER_BATCH_ENABLED): kurze Chunks derselben Quelle, die
+innerhalb von WHISPER_BATCH_WINDOW_MS anstehen, werden mit BATCH_GAP_MS
+Stille dazwischen in einem transcribe() decodiert; die Wörter werden über
+ihre Zeitstempel wieder den Chunks zugeordnet → je Chunk eine Zeile.
+
+Start (start()):
+  - Modell auflösen (lokal zuerst, siehe model_manager.py) → laden → Aufwärm-Decode, jede Phase
+    gemessen (startup.whisper.*) und in load_info festgehalten
+  - Fallback-Leiter: erst WHISPER_DEVICE/WHISPER_COMPUTE, dann die Stufen aus
+    WHISPER_FALLBACK (cuda/float16 → cpu/int8_float32 → cpu/int8); jeder
+    Abstieg wird mit Grund geloggt. Auch ein Fehler im Aufwärmen (typisch:
+    cuDNN fehlt) führt zur nächsten Stufe statt zum ersten echten Chunk
+  - CPU: cpu_threads / num_workers / Kern-Zuordnung aus cpu_tuning.resolve();
+    bei num_workers > 1 decodieren Mic und Loopback parallel, je Quelle eine
+    Spur in Aufnahme-Reihenfolge
+
+Metriken (metrics.py): Capture-Callback, VAD-Flush, Wartezeit in den
+Chunk-Queues, Whisper-Decode + Real-Time-Faktor, verworfene Chunks,
+leere Decodes.
+
+Gesprächs-Events (für Auto-Send nach Sprecherwechsel):
+  - TurnEnded:        ein anderer Sprecher (Loopback) ist seit TURN_END_GAP_SEC
+                      ohne neue Zeile → er ist vermutlich fertig
+  - QuestionDetected: die letzte fremde Zeile ist eine Frage
 """
 
+import bisect
+import re
 import threading
 import time
 import queue
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import pyaudiowpatch as pyaudio
-from faster_whisper import WhisperModel
 
 from config import (
-    WHISPER_MODEL, WHISPER_DEVICE, WHISPER_COMPUTE,
+    WHISPER_MODEL, WHISPER_DEVICE, WHISPER_COMPUTE, WHISPER_FALLBACK, WHISPER_WARMUP_SEC,
     CHUNK_SECONDS, SAMPLE_RATE,
-    MAX_TRANSCRIPT_LINES, WHISPER_VAD_FILTER
+    MAX_TRANSCRIPT_LINES, WHISPER_VAD_FILTER,
+    TURN_END_GAP_SEC,
+    WHISPER_BATCH_ENABLED, WHISPER_BATCH_WINDOW_MS, WHISPER_BATCH_MAX, WHISPER_BATCH_CHUNK_SEC,
 )
+import cpu_tuning
 from audio_devices import AudioDevice
+from event_bus import EventBus, TranscriptLine, TurnEnded, QuestionDetected
+from metrics import METRICS
 
 # ── VAD-Parameter ────────────────────────────────────────────
 FRAME_MS       = 30       # Frames die VAD analysiert (ms)
@@ -40,14 +87,106 @@ MIN_SPEECH_FR  = int(MIN_SPEECH_MS / FRAME_MS)        # 6 Frames
 MAX_CHUNK_SEC  = 6.0      # Sicherheitsnetz: max Chunk-Länge
 MAX_CHUNK_FR   = int(MAX_CHUNK_SEC * 1000 / FRAME_MS)
 
+CUT_LOOKBACK_MS = 1500    # Schnittpunkt-Suche: so weit vor MAX_CHUNK_SEC zurück
+CUT_LOOKBACK_FR = int(CUT_LOOKBACK_MS / FRAME_MS)     # 50 Frames
+OVERLAP_MS      = 300     # Überlappung in den Folge-Chunk (Wort an der Naht komplett)
+OVERLAP_FR      = int(OVERLAP_MS / FRAME_MS)          # 10 Frames
+SEAM_MAX_WORDS  = 2       # in OVERLAP_MS passen 1–2 Wörter; mehr würde echte
+                           # Wiederholungen ("ja, ja", "und … und") mit entfernen
+
 VAD_RMS_THRESH = 0.008    # RMS-Schwelle: darüber = Sprache
                            # (0.008 ≈ flüstern; 0.002 = Silence-Gate)
+LOOPBACK_RMS_FACTOR = 0.3  # Loopback typisch leiser → VAD_RMS_THRESH × Faktor
 
 PREROLL_MS     = 600      # Frames VOR Sprachbeginn die mit eingeschlossen werden
 PREROLL_FR     = int(PREROLL_MS / FRAME_MS)           # 10 Frames → erstes Wort vollständig
+FRAME_SEC      = FRAME_MS / 1000
+
+CAPTURE_LATENCY_MAX = 1.0  # s – größere ADC-Latenz aus time_info gilt als unplausibel
 
 CHUNK_FRAMES   = int(SAMPLE_RATE * CHUNK_SECONDS)
 
+# ── Trimmen vor dem Decode ───────────────────────────────────
+TRIM_SILENCE    = True
+TRIM_GUARD_MS   = 120     # so viel Rand bleibt vor/nach der Sprache stehen
+TRIM_RMS_FACTOR = 0.5     # Schwelle = VAD-Schwelle der Quelle × Faktor (leise Anlaute bleiben)
+
+# ── Micro-Batching ───────────────────────────────────────────
+BATCH_GAP_MS      = 400   # Stille zwischen zwei Chunks – Whisper setzt dort Satzgrenzen
+BATCH_GAP         = np.zeros(int(SAMPLE_RATE * BATCH_GAP_MS / 1000), dtype=np.float32)
+BATCH_CHUNK_MAX   = int(SAMPLE_RATE * WHISPER_BATCH_CHUNK_SEC)
+
+# Quellen, deren Zeilen von anderen Gesprächsteilnehmern stammen
+OTHER_SOURCES  = ("loopback",)
+
+# Fragewörter am Satzanfang (Whisper setzt das "?" nicht immer)
+_QUESTION_START = re.compile(
+    r"^(wer|wen|wem|wessen|was|wann|wo|woher|wohin|wie|warum|wieso|weshalb|"
+    r"welche[rsmn]?|kannst|könntest|hast|hättest|bist|wärst|willst|"
+    r"möchtest|meinst|glaubst|findest|siehst|weißt)\b",
+    re.IGNORECASE
+)
+
+
+def is_question(text: str) -> bool:
+    t = text.strip()
+    return t.endswith("?") or bool(_QUESTION_START.match(t))
+
+
+def capture_time(time_info: dict, n_samples: int, sample_rate: int) -> float:
+    """Aufnahmezeit des ersten Samples im Callback-Puffer, in time.monotonic().
+
+    PortAudio liefert input_buffer_adc_time und current_time in der Stream-Uhr;
+    die Differenz ist die Eingangslatenz. Manche Host-APIs (z.B. WASAPI-Loopback)
+    liefern 0 → dann gilt: Puffer ist gerade voll geworden.
+    """
+    now = time.monotonic()
+    try:
+        adc     = time_info["input_buffer_adc_time"]
+        latency = time_info["current_time"] - adc
+        if adc > 0 and 0.0 <= latency <= CAPTURE_LATENCY_MAX:
+            return now - latency
+    except (KeyError, TypeError):
+        pass
+    return now - n_samples / sample_rate
+
+
+def _norm_word(w: str) -> str:
+    return re.sub(r"[^\w]", "", w.lower())
+
+
+def dedupe_seam(previous: str, text: str, max_words: int = SEAM_MAX_WORDS) -> str:
+    """Wörter am Anfang von text entfernen, die schon am Ende von previous stehen
+    (Überlappung nach einem MAX_CHUNK-Split). Längste Übereinstimmung gewinnt."""
+    prev  = [_norm_word(w) for w in previous.split()][-max_words:]
+    words = text.split()
+    head  = [_norm_word(w) for w in words[:max_words]]
+    for k in range(min(len(prev), len(head)), 0, -1):
+        if prev[-k:] == head[:k]:
+            return " ".join(words[k:])
+    return text
+
+
+def trim_silence(audio: np.ndarray, vad_threshold: float = VAD_RMS_THRESH,
+                 guard_ms: int = TRIM_GUARD_MS) -> tuple[np.ndarray, int]:
+    """Leise Frames am Anfang und Ende entfernen → (audio, entfernte Samples).
+
+    vad_threshold = RMS-Schwelle des VAD, der den Chunk geschnitten hat;
+    getrimmt wird unter vad_threshold × TRIM_RMS_FACTOR.
+    """
+    rms_threshold = vad_threshold * TRIM_RMS_FACTOR
+    n_frames = len(audio) // FRAME_SAMPLES
+    if n_frames == 0:
+        return audio, 0
+    frames = audio[:n_frames * FRAME_SAMPLES].reshape(n_frames, FRAME_SAMPLES)
+    loud   = np.flatnonzero(np.sqrt(np.mean(frames ** 2, axis=1)) >= rms_threshold)
+    if len(loud) == 0:
+        return audio, 0
+    guard = int(SAMPLE_RATE * guard_ms / 1000)
+    start = max(0, loud[0] * FRAME_SAMPLES - guard)
+    end   = min(len(audio), (loud[-1] + 1) * FRAME_SAMPLES + guard)
+    return audio[start:end], len(audio) - (end - start)
+
 
 class VADAccumulator:
     """
@@ -55,10 +194,15 @@ class VADAccumulator:
 
     Pre-Roll: Die letzten PREROLL_FR Stille-Frames werden VOR dem ersten
     Sprach-Frame mit eingeschlossen → erstes Wort wird nicht abgeschnitten.
+
+    on_chunk(audio, seam, t_start): seam=True heißt, der Chunk beginnt mit
+    OVERLAP_MS Audio, das schon am Ende des vorigen Chunks stand (Split bei
+    MAX_CHUNK); t_start = Aufnahmezeit des ersten Samples (time.monotonic()).
     """
 
-    def __init__(self, on_chunk, rms_threshold=VAD_RMS_THRESH):
+    def __init__(self, on_chunk, rms_threshold=VAD_RMS_THRESH, name="mic"):
         self._on_chunk     = on_chunk
+        self._name         = name
         self._rms_thresh   = rms_threshold
         self._frames       = []       # aktiver Sprach-Chunk
         self._preroll      = []       # Ringpuffer: letzte N Stille-Frames
@@ -66,21 +210,27 @@ class VADAccumulator:
         self._silence_run  = 0
         self._total_frames = 0
         self._in_speech    = False    # sind wir gerade in einem Sprach-Segment?
+        self._seam         = False    # aktueller Chunk beginnt mit Überlappung
+        self._t_start      = 0.0      # Aufnahmezeit des ersten Frames im Chunk
 
-    def push(self, audio: np.ndarray):
+    def push(self, audio: np.ndarray, t_capture: float | None = None):
+        """t_capture = Aufnahmezeit des ersten Samples (siehe capture_time())."""
+        if t_capture is None:
+            t_capture = time.monotonic() - len(audio) / SAMPLE_RATE
         for start in range(0, len(audio), FRAME_SAMPLES):
             frame = audio[start : start + FRAME_SAMPLES]
             if len(frame) < FRAME_SAMPLES // 2:
                 continue
-            self._process_frame(frame)
+            self._process_frame(frame, t_capture + start / SAMPLE_RATE)
 
-    def _process_frame(self, frame: np.ndarray):
+    def _process_frame(self, frame: np.ndarray, t: float):
         rms       = float(np.sqrt(np.mean(frame ** 2)))
         is_speech = rms >= self._rms_thresh
 
         if is_speech:
             if not self._in_speech:
                 # Sprache beginnt: Pre-Roll-Buffer vorne anhängen
+                self._t_start = t - len(self._preroll) * FRAME_SEC
                 self._frames.extend(self._preroll)
                 self._preroll  = []
                 self._in_speech = True
@@ -100,27 +250,54 @@ class VADAccumulator:
                         self._flush()
                     else:
                         self._reset()
-                # Sicherheitsnetz
-                elif self._total_frames >= MAX_CHUNK_FR:
-                    if self._speech_count >= MIN_SPEECH_FR:
-                        self._flush()
-                    else:
-                        self._reset()
+                    return
             else:
                 # Stille vor Sprache: in Pre-Roll-Ringpuffer
                 self._preroll.append(frame)
                 if len(self._preroll) > PREROLL_FR:
                     self._preroll.pop(0)   # ältesten Frame entfernen
+                return
+
+        # Sicherheitsnetz – bei jedem Frame, auch mitten im Dauersprechen
+        if len(self._frames) >= MAX_CHUNK_FR:
+            if self._speech_count >= MIN_SPEECH_FR:
+                self._split()
+            else:
+                self._reset()
+
+    def _split(self):
+        """Am leisesten Frame der letzten CUT_LOOKBACK_FR schneiden, Rest behalten."""
+        n   = len(self._frames)
+        lo  = max(OVERLAP_FR + 1, n - CUT_LOOKBACK_FR)
+        rms = [float(np.sqrt(np.mean(f ** 2))) for f in self._frames[lo:]]
+        cut = lo + int(np.argmin(rms)) + 1        # Schnitt direkt nach dem leisesten Frame
+        head, tail = self._frames[:cut], self._frames[cut - OVERLAP_FR:]
+        METRICS.incr(f"vad.splits.{self._name}")
+
+        self._frames = head
+        self._emit()
+        # Folge-Chunk beginnt mit der Überlappung; Zähler für den Rest neu
+        loud = [float(np.sqrt(np.mean(f ** 2))) >= self._rms_thresh for f in tail]
+        self._frames       = tail
+        self._speech_count = sum(loud)
+        self._total_frames = len(tail)
+        self._silence_run  = next((i for i, v in enumerate(reversed(loud)) if v), len(loud))
+        self._seam         = True
+        self._t_start     += (cut - OVERLAP_FR) * FRAME_SEC
 
     def _flush(self):
-        if self._frames:
-            audio = np.concatenate(self._frames)
-            try:
-                self._on_chunk(audio)
-            except Exception:
-                pass
+        self._emit()
         self._reset()
 
+    def _emit(self):
+        if self._frames:
+            with METRICS.span(f"vad.flush.{self._name}"):
+                audio = np.concatenate(self._frames)
+                try:
+                    self._on_chunk(audio, self._seam, self._t_start)
+                except Exception:
+                    pass
+
     def _reset(self):
         self._frames       = []
         self._preroll      = []   # Pre-Roll auch zurücksetzen
@@ -128,19 +305,63 @@ class VADAccumulator:
         self._silence_run  = 0
         self._total_frames = 0
         self._in_speech    = False
+        self._seam         = False
+
+    @property
+    def rms_threshold(self) -> float:
+        return self._rms_thresh
 
     def set_threshold(self, thresh: float):
         self._rms_thresh = thresh
 
 
+class Timeline:
+    """Transkriptzeilen aller Quellen, sortiert nach Aufnahmezeit.
+
+    insert() sortiert per bisect ein – verspätete Ergebnisse landen vor
+    jüngeren Zeilen, die schon drinstehen. Thread-sicher (Decode-Pool).
+    """
+
+    def __init__(self, max_lines: int = MAX_TRANSCRIPT_LINES):
+        self._max   = max_lines
+        self._lock  = threading.Lock()
+        self._times = []             # Aufnahmezeit je Zeile (aufsteigend)
+        self._lines = []             # (source, text)
+
+    def insert(self, t_start: float, source: str, text: str) -> float:
+        """Zeile einsortieren; Rückgabe: wie viele Sekunden die jüngste schon
+        vorhandene Zeile NACH dieser begann (0 = normal angehängt)."""
+        with self._lock:
+            late = self._times[-1] - t_start if self._times else 0.0
+            i = bisect.bisect_right(self._times, t_start)
+            self._times.insert(i, t_start)
+            self._lines.insert(i, (source, text))
+            if len(self._lines) > self._max:
+                del self._times[:-self._max]
+                del self._lines[:-self._max]
+        return max(0.0, late)
+
+    def last_n(self, n: int) -> list[str]:
+        with self._lock:
+            return [text for _, text in self._lines[-n:]]
+
+    def clear(self):
+        with self._lock:
+            self._times.clear()
+            self._lines.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._lines)
+
+
 class Transcriber:
 
-    def __init__(self):
+    def __init__(self, bus: EventBus | None = None):
+        self.bus          = bus if bus is not None else EventBus()
         self._running     = False
         self._model       = None
-        self._callbacks   = []
-        self._buffer      = []
-        self._buffer_lock = threading.Lock()
+        self.timeline     = Timeline()
 
         self._mic_q  = queue.Queue(maxsize=20)
         self._loop_q = queue.Queue(maxsize=20)
@@ -154,32 +375,193 @@ class Transcriber:
 
         self._mic_thread   = None
         self._loop_thread  = None
-        self._mixer_thread = None
+        self._chunk_thread = None
+        self._decode_lanes = {}         # Quelle → Decode-Spur (nur bei num_workers > 1)
+        self._workers      = 1
+        self._batch        = []         # [(audio, source, t_start)] – noch nicht decodiert
+        self._batch_t0     = 0.0
+        self._last_text    = {}         # Quelle → letzte Zeile (Naht-Abgleich)
+        self._tuning       = {}
+        self._pinned_cb    = set()      # PortAudio-Callback-Threads mit Kern-Zuordnung
+
+        # Sprecherwechsel-Erkennung: Zeitpunkt der letzten fremden Zeile
+        self._other_last_line = 0.0
+        self._other_turn_open = False
 
         self.speaker_monitor = None
 
+        # Ergebnis des Ladens: device, compute, Phasen-Dauern, Abstiege
+        self.load_info : dict = {}
+
     # ── Public API ──────────────────────────────────────────
 
-    def start(self):
-        print(f"[Transcriber] Lade faster-whisper … (device={WHISPER_DEVICE}, compute={WHISPER_COMPUTE})")
-        self._model   = WhisperModel(
-            WHISPER_MODEL,
-            device=WHISPER_DEVICE,
-            compute_type=WHISPER_COMPUTE
-        )
+    def start(self, on_phase=None):
+        """Lädt Whisper (mit Fallback-Leiter), wärmt auf, startet die Threads.
+
+        on_phase(text) meldet den Fortschritt (Statuszeile der App).
+        """
+        phase = on_phase or (lambda text: None)
+        self._tuning = cpu_tuning.resolve()
+        threads_before = set()
+        if self._tuning["pin"]:
+            # Lade-Thread auf die Decode-Kerne (Linux: der Pool von CTranslate2
+            # erbt das). Nur Threads, die beim Laden entstehen, werden danach
+            # umgelegt – Tk, KI-Pool und Event-Bus bleiben unberührt.
+            threads_before = cpu_tuning.native_thread_ids()
+            cpu_tuning.set_default_cores(self._tuning["decode_cores"])
+
+        phase("Whisper: Modell suchen …")
+        t0 = time.perf_counter()
+        path = self._resolve_model()
+        resolve_s = time.perf_counter() - t0
+        METRICS.record("startup.whisper.resolve", resolve_s)
+        print(f"[Transcriber] Modell aufgelöst in {resolve_s:.2f}s: {path}")
+
+        self.load_info = {"resolve_s": resolve_s, "fallbacks": [],
+                          "cpu_threads": self._tuning["cpu_threads"],
+                          "num_workers": self._tuning["num_workers"]}
+        self._model = self._load_with_fallback(path, phase)
+        if self._tuning["pin"]:
+            # Pool existiert jetzt (Aufwärmen hat jeden Worker einmal benutzt)
+            n = cpu_tuning.pin_new_threads(threads_before, self._tuning["decode_cores"])
+            print(f"[Transcriber] {n} Engine-Threads auf Decode-Kerne gelegt")
+        info = self.load_info
+        print(f"[Transcriber] Whisper {info['device']}/{info['compute']} – "
+              f"Auflösen {info['resolve_s']:.2f}s, Laden {info['load_s']:.2f}s, "
+              f"Aufwärmen {info['warmup_s']:.2f}s")
+        print(f"[Transcriber] cpu_threads={info['cpu_threads']} "
+              f"({self._tuning['source']['cpu_threads']}), num_workers={info['num_workers']} "
+              f"({self._tuning['source']['num_workers']})"
+              + (f", Decode-Kerne {self._tuning['decode_cores']}" if self._tuning["pin"] else ""))
+
+        self._workers = self._tuning["num_workers"]
+
         self._running = True
-        self._mic_thread   = threading.Thread(target=self._mic_loop,   daemon=True)
-        self._loop_thread  = threading.Thread(target=self._loop_loop,  daemon=True)
-        self._mixer_thread = threading.Thread(target=self._mixer_loop, daemon=True)
+        self._mic_thread   = threading.Thread(target=self._mic_loop,   name="mic-loop",
+                                              daemon=True)
+        self._loop_thread  = threading.Thread(target=self._loop_loop,  name="loopback-loop",
+                                              daemon=True)
+        self._chunk_thread = threading.Thread(target=self._chunk_loop, name="chunk-loop",
+                                              daemon=True)
         self._mic_thread.start()
         self._loop_thread.start()
-        self._mixer_thread.start()
+        self._chunk_thread.start()
         print(f"[Transcriber] Bereit – VAD-Modus, Pause={SILENCE_MS}ms, Min={MIN_SPEECH_MS}ms")
 
     def stop(self):
         self._running = False
         self._mic_change.set()
         self._loop_change.set()
+        for lane in list(self._decode_lanes.values()):
+            lane.shutdown(wait=False, cancel_futures=True)
+
+    # ── Modell laden ────────────────────────────────────────
+
+    @staticmethod
+    def _resolve_model() -> str:
+        """Lokaler Pfad des Modells – Netz nur, wenn nichts da ist (model_manager)."""
+        import model_manager
+        return model_manager.resolve(WHISPER_MODEL)
+
+    @staticmethod
+    def _ladder() -> list[tuple[str, str]]:
+        steps = [(WHISPER_DEVICE, WHISPER_COMPUTE)]
+        for step in WHISPER_FALLBACK:
+            # Wer "cpu" konfiguriert, will nicht doch auf der GPU landen
+            if WHISPER_DEVICE == "cpu" and step[0] != "cpu":
+                continue
+            if tuple(step) not in steps:
+                steps.append(tuple(step))
+        return steps
+
+    @staticmethod
+    def _unsupported(device: str, compute: str) -> str | None:
+        """Grund, warum (device, compute) hier sicher nicht geht – sonst None."""
+        try:
+            import ctranslate2
+            if device == "cuda" and ctranslate2.get_cuda_device_count() == 0:
+                return "keine CUDA-GPU gefunden"
+            if compute not in ctranslate2.get_supported_compute_types(device):
+                return f"{compute} wird auf {device} nicht unterstützt"
+        except Exception as e:             # Abfrage selbst scheitert → einfach probieren
+            print(f"[Transcriber] Geräteprüfung nicht möglich: {e}")
+        return None
+
+    def _load_with_fallback(self, path: str, phase):
+        # faster-whisper/CTranslate2 erst im Lade-Thread importieren
+        from faster_whisper import WhisperModel
+        ladder = self._ladder()
+        reason = None
+        for i, (device, compute) in enumerate(ladder):
+            label = f"{device}/{compute}"
+            reason = self._unsupported(device, compute)
+            if reason is None:
+                try:
+                    phase(f"Whisper: lade Modell ({label}) …")
+                    t0 = time.perf_counter()
+                    model = WhisperModel(path, device=device, compute_type=compute,
+                                         cpu_threads=self._tuning["cpu_threads"],
+                                         num_workers=self._tuning["num_workers"])
+                    load_s = time.perf_counter() - t0
+
+                    phase(f"Whisper: aufwärmen ({label}) …")
+                    t0 = time.perf_counter()
+                    self._warmup(model)
+                    warmup_s = time.perf_counter() - t0
+                except Exception as e:
+                    reason = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+                    model = None
+                else:
+                    METRICS.record("startup.whisper.load", load_s)
+                    METRICS.record("startup.whisper.warmup", warmup_s)
+                    self.load_info.update(device=device, compute=compute,
+                                          load_s=load_s, warmup_s=warmup_s)
+                    return model
+
+            self.load_info["fallbacks"].append({"step": label, "reason": reason})
+            METRICS.incr("startup.whisper.fallbacks")
+            nxt = ladder[i + 1] if i + 1 < len(ladder) else None
+            print(f"[Transcriber] ⤵ {label} nicht nutzbar: {reason}"
+                  + (f" → versuche {nxt[0]}/{nxt[1]}" if nxt else ""))
+        raise RuntimeError(f"Whisper konnte nicht geladen werden: {reason}")
+
+    def _pin(self, cores_key: str):
+        if self._tuning.get("pin"):
+            cpu_tuning.pin_current_thread(self._tuning[cores_key])
+
+    def _pin_callback(self):
+        """PortAudio startet den Callback-Thread selbst → beim ersten Aufruf
+        auf die Aufnahme-Kerne legen (sonst läuft VAD auf den Decode-Kernen)."""
+        tid = threading.get_ident()
+        if tid not in self._pinned_cb:
+            self._pinned_cb.add(tid)
+            self._pin("capture_cores")
+
+    def _warmup(self, model):
+        """Ein Decode pro Worker auf synthetischem Audio: CUDA-Kernel, cuDNN,
+        Allocator, Beam-Search-Puffer und die Thread-Pools aller Worker sind
+        danach initialisiert (pin_new_threads() findet sie). Mit Batching
+        zusätzlich ein Batch-Decode: word_timestamps=True nimmt einen eigenen
+        Pfad (Alignment), der sonst den ersten echten Batch ausbremst."""
+        if WHISPER_WARMUP_SEC <= 0:
+            return
+        n     = int(SAMPLE_RATE * WHISPER_WARMUP_SEC)
+        t     = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+        rng   = np.random.default_rng(0)
+        audio = (0.05 * np.sin(2 * np.pi * 220.0 * t)
+                 + 0.01 * rng.standard_normal(n)).astype(np.float32)
+
+        def warm(_):
+            self._decode(model, audio)
+            if WHISPER_BATCH_ENABLED:
+                self._decode_batch(model, [audio[:n // 2], audio[n // 2:]])
+
+        workers = max(1, self._tuning.get("num_workers", 1))
+        if workers == 1:
+            warm(0)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(warm, range(workers)))
 
     def set_mic_device(self, device: AudioDevice | None):
         self._pending_mic = device
@@ -189,20 +571,26 @@ class Transcriber:
         self._pending_loop = device
         self._loop_change.set()
 
-    def register_callback(self, fn):
-        self._callbacks.append(fn)
-
     def get_last_n_lines(self, n: int = 20) -> str:
-        with self._buffer_lock:
-            return "\n".join(self._buffer[-n:])
+        return "\n".join(self.timeline.last_n(n))
 
     def clear_buffer(self):
-        with self._buffer_lock:
-            self._buffer.clear()
+        self.timeline.clear()
+
+    @staticmethod
+    def _enqueue(q: queue.Queue, audio: np.ndarray, name: str, seam: bool, t_start: float,
+                 vad_thresh: float):
+        """Chunk mit Zeitstempeln und VAD-Schwelle einreihen; volle Queue → verwerfen + zählen."""
+        try:
+            q.put_nowait((time.monotonic(), audio, seam, t_start, vad_thresh))
+        except queue.Full:
+            METRICS.incr(f"audio.dropped_chunks.{name}")
 
     # ── Mic-Stream-Loop ──────────────────────────────────────
 
     def _mic_loop(self):
+        import pyaudiowpatch as pyaudio     # erst hier laden → schneller Fensteraufbau
+        self._pin("capture_cores")
         pa     = None
         stream = None
 
@@ -234,18 +622,23 @@ class Transcriber:
                         # VAD-Akkumulator für Mic
                         # Mic-RMS ist in float32/32768 normalisiert → gleicher Schwellenwert
                         vad = VADAccumulator(
-                            on_chunk=lambda a: self._mic_q.put_nowait(a)
-                            if not self._mic_q.full() else None,
-                            rms_threshold=VAD_RMS_THRESH
+                            on_chunk=lambda a, seam, t: self._enqueue(
+                                self._mic_q, a, "mic", seam, t, vad.rms_threshold),
+                            rms_threshold=VAD_RMS_THRESH,
+                            name="mic"
                         )
 
                         def cb(in_data, frame_count, time_info, status,
                                _ch=ch, _vad=vad):
+                            self._pin_callback()
+                            t0 = time.perf_counter()
+                            t_cap = capture_time(time_info, frame_count, SAMPLE_RATE)
                             audio = (np.frombuffer(in_data, dtype=np.int16)
                                      .astype(np.float32) / 32768.0)
                             if _ch > 1:
                                 audio = audio.reshape(-1, _ch).mean(axis=1)
-                            _vad.push(audio)
+                            _vad.push(audio, t_cap)
+                            METRICS.record("capture.cb.mic", time.perf_counter() - t0)
                             return (None, pyaudio.paContinue)
 
                         stream = pa.open(
@@ -271,6 +664,8 @@ class Transcriber:
     # ── Loopback-Stream-Loop ─────────────────────────────────
 
     def _loop_loop(self):
+        import pyaudiowpatch as pyaudio     # erst hier laden → schneller Fensteraufbau
+        self._pin("capture_cores")
         pa     = None
         stream = None
 
@@ -303,13 +698,17 @@ class Transcriber:
 
                         # Loopback-Audio ist leiser → niedrigerer Schwellenwert
                         vad = VADAccumulator(
-                            on_chunk=lambda a: self._loop_q.put_nowait(a)
-                            if not self._loop_q.full() else None,
-                            rms_threshold=VAD_RMS_THRESH * 0.3   # Loopback typisch leiser
+                            on_chunk=lambda a, seam, t: self._enqueue(
+                                self._loop_q, a, "loopback", seam, t, vad.rms_threshold),
+                            rms_threshold=VAD_RMS_THRESH * LOOPBACK_RMS_FACTOR,
+                            name="loopback"
                         )
 
                         def cb(in_data, frame_count, time_info, status,
                                _ch=ch, _sr=sr, _vad=vad):
+                            self._pin_callback()
+                            t0 = time.perf_counter()
+                            t_cap = capture_time(time_info, frame_count, _sr)
                             audio = (np.frombuffer(in_data, dtype=np.int16)
                                      .astype(np.float32) / 32768.0)
                             if _ch > 1:
@@ -325,7 +724,8 @@ class Transcriber:
                             if self.speaker_monitor is not None:
                                 self.speaker_monitor.push_chunk(audio, SAMPLE_RATE)
                             # VAD-Akkumulator
-                            _vad.push(audio)
+                            _vad.push(audio, t_cap)
+                            METRICS.record("capture.cb.loopback", time.perf_counter() - t0)
                             return (None, pyaudio.paContinue)
 
                         stream = pa.open(
@@ -348,36 +748,86 @@ class Transcriber:
 
         _close()
 
-    # ── Mixer + Whisper ──────────────────────────────────────
+    # ── Chunk-Verteilung + Whisper ───────────────────────────
 
-    def _mixer_loop(self):
-        while self._running:
-            mic_chunk  = None
-            loop_chunk = None
-
-            try:
-                mic_chunk = self._mic_q.get(timeout=0.05)
-            except queue.Empty:
-                pass
-
-            try:
-                loop_chunk = self._loop_q.get(timeout=0.05)
-            except queue.Empty:
-                pass
+    def _chunk_loop(self):
+        """Chunks beider Quellen einsammeln und getrennt decodieren.
 
-            if mic_chunk is None and loop_chunk is None:
+        Kein Mischen mehr: zwei gleichzeitig anstehende Chunks gehören selten
+        zur selben Zeitspanne. Liegen beide vor, geht der früher aufgenommene
+        zuerst raus – die Timeline sortiert ohnehin nach Aufnahmezeit.
+        """
+        self._pin("decode_cores")
+        sources = ((self._mic_q, "mic"), (self._loop_q, "loopback"))
+        while self._running:
+            ready = []
+            for q, source in sources:
+                try:
+                    t_in, audio, seam, t_start, vad_thresh = q.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                METRICS.record(f"queue.wait.{source}", time.monotonic() - t_in)
+                ready.append((t_start, source, audio, seam, vad_thresh))
+
+            if self._batch and (time.monotonic() - self._batch_t0
+                                >= WHISPER_BATCH_WINDOW_MS / 1000):
+                self._flush_batch()
+
+            if not ready:
+                self._check_turn_end()
                 continue
 
-            if mic_chunk is not None and loop_chunk is not None:
-                min_len = min(len(mic_chunk), len(loop_chunk))
-                mixed   = (mic_chunk[:min_len] + loop_chunk[:min_len]) * 0.5
-                if self._has_speech(mixed):
-                    self._transcribe(mixed, source="mixed")
-            else:
-                if mic_chunk is not None and self._has_speech(mic_chunk):
-                    self._transcribe(mic_chunk, source="mic")
-                if loop_chunk is not None and self._has_speech(loop_chunk):
-                    self._transcribe(loop_chunk, source="loopback")
+            for t_start, source, audio, seam, vad_thresh in sorted(ready, key=lambda r: r[0]):
+                if self._has_speech(audio):
+                    # Vor dem Batching trimmen: getrimmte Einwürfe passen öfter in einen Batch
+                    self._submit(self._prepare(audio, vad_thresh), source, seam, t_start)
+
+    def _submit(self, audio: np.ndarray, source: str, seam: bool, t_start: float):
+        """Kurze Chunks sammeln (Micro-Batching), sonst direkt decodieren."""
+        if WHISPER_BATCH_ENABLED and len(audio) <= BATCH_CHUNK_MAX and not seam:
+            if self._batch and self._batch[0][1] != source:
+                self._flush_batch()
+            if not self._batch:
+                self._batch_t0 = time.monotonic()
+            self._batch.append((audio, source, t_start))
+            if len(self._batch) >= WHISPER_BATCH_MAX:
+                self._flush_batch()
+            return
+        self._flush_batch()                 # Reihenfolge erhalten
+        self._dispatch(source, self._transcribe, audio, source, t_start, seam)
+
+    def _flush_batch(self):
+        batch, self._batch = self._batch, []
+        if len(batch) == 1:
+            audio, source, t_start = batch[0]
+            self._dispatch(source, self._transcribe, audio, source, t_start)
+        elif batch:
+            self._dispatch(batch[0][1], self._transcribe_batch, batch)
+
+    def _dispatch(self, source: str, fn, *args):
+        """Seriell im Chunk-Thread oder – bei num_workers > 1 – in der Spur der Quelle.
+
+        Eine Spur pro Quelle: Mic und Loopback decodieren parallel, Chunks
+        derselben Quelle aber in Reihenfolge – der Naht-Abgleich (dedupe_seam)
+        braucht den fertigen Text des Vorgänger-Chunks.
+        """
+        if self._workers <= 1:
+            fn(*args)
+            return
+        lane = self._decode_lanes.get(source)
+        if lane is None:
+            lane = self._decode_lanes[source] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"whisper-{source}",
+                initializer=self._pin, initargs=("decode_cores",))
+        lane.submit(fn, *args)
+
+    def _check_turn_end(self):
+        if not self._other_turn_open:
+            return
+        gap = time.monotonic() - self._other_last_line
+        if gap >= TURN_END_GAP_SEC:
+            self._other_turn_open = False
+            self.bus.publish(TurnEnded(source="loopback", gap_s=gap))
 
     # Schwellenwerte für finalen Stille-Check
     _SPEECH_RMS_MIN  = 0.002
@@ -388,27 +838,103 @@ class Transcriber:
         peak = float(np.max(np.abs(audio)))
         return rms >= self._SPEECH_RMS_MIN and peak >= self._SPEECH_PEAK_MIN
 
-    def _transcribe(self, audio: np.ndarray, source: str = "mic"):
+    @staticmethod
+    def _decode(model, audio: np.ndarray) -> list[str]:
+        segments, _ = model.transcribe(
+            audio.astype(np.float32),
+            language="de",
+            beam_size=5,
+            vad_filter=False,        # Wir machen VAD selbst via VADAccumulator
+            condition_on_previous_text=False,
+            without_timestamps=True
+        )
+        # segments ist ein Generator – decodiert wird erst beim Iterieren
+        return [s.text.strip() for s in segments if s.text.strip()]
+
+    @staticmethod
+    def _decode_batch(model, chunks: list[np.ndarray]) -> list[str]:
+        """Chunks mit Stille-Trennern in EINEM Decode; Text je Chunk zurück."""
+        pieces, bounds, pos = [], [], 0
+        for i, audio in enumerate(chunks):
+            if i:
+                pieces.append(BATCH_GAP)
+                pos += len(BATCH_GAP)
+            pieces.append(audio.astype(np.float32))
+            bounds.append((pos + len(audio) + len(BATCH_GAP) / 2) / SAMPLE_RATE)
+            pos += len(audio)
+        segments, _ = model.transcribe(
+            np.concatenate(pieces),
+            language="de",
+            beam_size=5,
+            vad_filter=False,
+            condition_on_previous_text=False,
+            word_timestamps=True
+        )
+        words = [[] for _ in chunks]
+        for seg in segments:
+            for w in seg.words or []:
+                # Wortmitte → erster Chunk, dessen Ende (inkl. halbem Trenner) danach liegt
+                mid = (w.start + w.end) / 2
+                idx = next((i for i, end in enumerate(bounds) if mid < end), len(chunks) - 1)
+                words[idx].append(w.word)
+        return ["".join(ws).strip() for ws in words]
+
+    @staticmethod
+    def _prepare(audio: np.ndarray, vad_thresh: float) -> np.ndarray:
+        if TRIM_SILENCE:
+            audio, removed = trim_silence(audio, vad_thresh)
+            METRICS.record("whisper.trimmed_s", removed / SAMPLE_RATE)
+        return audio
+
+    def _transcribe(self, audio: np.ndarray, source: str, t_start: float, seam: bool = False):
+        try:
+            t0 = time.perf_counter()
+            parts = self._decode(self._model, audio)
+            elapsed = time.perf_counter() - t0
+            METRICS.record("whisper.decode", elapsed)
+            METRICS.record("whisper.rtf", elapsed / (len(audio) / SAMPLE_RATE))
+            METRICS.incr("whisper.chunks")
+            text = " ".join(parts)
+            if seam and text:
+                deduped = dedupe_seam(self._last_text.get(source, ""), text)
+                if deduped != text:
+                    METRICS.incr("whisper.seam_dedup")
+                text = deduped
+            self._publish_text(text, source, t_start)
+        except Exception as e:
+            print(f"[Transcriber] Whisper-Fehler: {e}")
+
+    def _transcribe_batch(self, batch: list[tuple[np.ndarray, str, float]]):
+        source = batch[0][1]
         try:
-            segments, _ = self._model.transcribe(
-                audio.astype(np.float32),
-                language="de",
-                beam_size=5,
-                vad_filter=False,        # Wir machen VAD selbst via VADAccumulator
-                condition_on_previous_text=False,
-                without_timestamps=True
-            )
-            parts = [s.text.strip() for s in segments if s.text.strip()]
-            text  = " ".join(parts)
-            if text:
-                with self._buffer_lock:
-                    self._buffer.append(text)
-                    if len(self._buffer) > MAX_TRANSCRIPT_LINES:
-                        self._buffer = self._buffer[-MAX_TRANSCRIPT_LINES:]
-                for fn in self._callbacks:
-                    try:
-                        fn(text, False, source)
-                    except Exception as e:
-                        print(f"[Transcriber] Callback-Fehler: {e}")
+            chunks = [audio for audio, _, _ in batch]
+            t0 = time.perf_counter()
+            texts = self._decode_batch(self._model, chunks)
+            elapsed = time.perf_counter() - t0
+            audio_s = sum(len(c) for c in chunks) / SAMPLE_RATE
+            METRICS.record("whisper.decode", elapsed)
+            METRICS.record("whisper.rtf", elapsed / audio_s)
+            METRICS.record("whisper.batch_size", len(chunks))
+            METRICS.incr("whisper.chunks", len(chunks))
+            METRICS.incr("whisper.batches")
+            for text, (_, _, t_start) in zip(texts, batch):
+                self._publish_text(text, source, t_start)
         except Exception as e:
-            print(f"[Transcriber] Whisper-Fehler: {e}")
\ No newline at end of file
+            print(f"[Transcriber] Whisper-Fehler (Batch): {e}")
+
+    def _publish_text(self, text: str, source: str, t_start: float):
+        if not text:
+            METRICS.incr("whisper.empty")
+            return
+        self._last_text[source] = text
+        late = self.timeline.insert(t_start, source, text)
+        if late > 0:
+            METRICS.incr("timeline.late_inserts")
+            METRICS.record("timeline.late", late)
+        METRICS.record("timeline.capture_to_text", time.monotonic() - t_start)
+        self.bus.publish(TranscriptLine(text=text, source=source, t_start=t_start))
+        if source in OTHER_SOURCES:
+            self._other_last_line = time.monotonic()
+            self._other_turn_open = True
+            if is_question(text):
+                self.bus.publish(QuestionDetected(text=text, source=source))
\ No newline at end of file
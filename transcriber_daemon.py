@@ -0,0 +1,566 @@
+"""
+transcriber_daemon.py
+─────────────────────
+Langlebiger Transkriptions-Dienst: hält das Whisper-Modell und die
+Aufnahme-Streams, die App ist nur noch ein Client.
+
+Funktionsprinzip:
+  - Dienst (TranscriberDaemon) lauscht auf 127.0.0.1:TRANSCRIBER_DAEMON_PORT,
+    lauscht sofort und lädt Whisper im Hintergrund (inkl. Fallback-Leiter
+    und Aufwärmen aus transcriber.py)
+  - Zugang: beim Start schreibt der Dienst ein zufälliges Token nach
+    TRANSCRIBER_DAEMON_TOKEN_FILE (nur für den Nutzer lesbar); die erste
+    Nachricht jedes Clients muss es enthalten, sonst wird getrennt – der
+    Port auf 127.0.0.1 ist für alle lokalen Nutzer erreichbar
+  - Protokoll: eine JSON-Nachricht pro Zeile
+      Client → Dienst:  auth (Token, zuerst), set_mic / set_loopback
+                        (Gerät oder null), clear, shutdown
+      Dienst → Client:  hello (Zustand beim Verbinden), phase, ready, error,
+                        event (TranscriptLine, TurnEnded, QuestionDetected),
+                        level (Loopback-Pegel fürs VU-Meter)
+  - Alle verbundenen Clients bekommen dieselben Events – mehrere Fenster
+    können gleichzeitig mitlesen; die letzte Geräteauswahl gewinnt
+  - Trennt sich ein Client, laufen Modell und Streams weiter → UI-Neustart
+    ist sofort "Bereit"; gleiche Geräteauswahl öffnet keinen Stream neu
+  - RemoteTranscriber hat dieselbe Schnittstelle wie Transcriber, startet
+    den Dienst bei Bedarf selbst (TRANSCRIBER_DAEMON_AUTOSTART) und verbindet
+    sich nach einem Abbruch neu; kommt beim Laden TRANSCRIBER_DAEMON_READY_SEC
+    lang kein Lebenszeichen, meldet start() einen Fehler
+
+Aufruf:
+    python transcriber_daemon.py            # Dienst im Vordergrund
+    python transcriber_daemon.py --status   # Zustand des laufenden Dienstes
+    python transcriber_daemon.py --stop     # Dienst beenden
+"""
+
+import argparse
+import hmac
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from audio_devices import AudioDevice
+from config import (
+    TRANSCRIBER_DAEMON_PORT, TRANSCRIBER_DAEMON_AUTOSTART,
+    TRANSCRIBER_DAEMON_START_SEC, TRANSCRIBER_DAEMON_READY_SEC,
+    TRANSCRIBER_DAEMON_TOKEN_FILE,
+)
+from event_bus import EventBus, TranscriptLine, TurnEnded, QuestionDetected
+from mic_monitor import SpeakerMonitor
+from transcriber import Timeline
+
+HOST          = "127.0.0.1"
+LOG_FILE      = "transcriber_daemon.log"
+LEVEL_SEC     = 0.05      # Pegel höchstens alle 50 ms an die Clients
+RECONNECT_SEC = 2.0
+AUTH_SEC      = 2.0       # so lange hat ein neuer Client für die auth-Nachricht
+
+# Events, die der Dienst an die Clients weiterreicht
+_EVENT_TYPES = {cls.__name__: cls for cls in (TranscriptLine, TurnEnded, QuestionDetected)}
+
+
+def _device_to_dict(device: AudioDevice | None) -> dict | None:
+    if device is None:
+        return None
+    return {"index": device.index, "name": device.name, "device_type": device.device_type,
+            "channels": device.channels, "sample_rate": device.sample_rate}
+
+
+def _device_from_dict(d: dict | None) -> AudioDevice | None:
+    if d is None:
+        return None
+    return AudioDevice(d["index"], d["name"], d["device_type"],
+                       d["channels"], d["sample_rate"], raw={})
+
+
+def _send(sock: socket.socket, lock: threading.Lock, msg: dict):
+    data = (json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8")
+    with lock:
+        sock.sendall(data)
+
+
+def _token_path(port: int) -> str:
+    # Ein Token pro Port → mehrere Dienste (Tests, zweite Instanz) kommen sich nicht in die Quere
+    return (TRANSCRIBER_DAEMON_TOKEN_FILE if port == TRANSCRIBER_DAEMON_PORT
+            else f"{TRANSCRIBER_DAEMON_TOKEN_FILE}.{port}")
+
+
+def _write_token(port: int) -> str:
+    """Neues Token, Datei nur für den Nutzer lesbar (0600; Windows: Profilordner)."""
+    token = secrets.token_hex(32)
+    path  = _token_path(port)
+    try:
+        os.remove(path)          # alte Datei könnte andere Rechte haben
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def _read_token(port: int) -> str:
+    try:
+        with open(_token_path(port), encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError as e:
+        raise RuntimeError(f"Kein Zugangs-Token für den Transkriptions-Dienst ({e})") from e
+
+
+def _close_socket(sock: socket.socket):
+    # shutdown() weckt auch einen Leser, der in makefile() blockiert –
+    # close() allein schließt den Socket erst, wenn die Datei zu ist
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    try:
+        sock.close()
+    except OSError:
+        pass
+
+
+# ══════════════════════════════════════════════════════════════
+#  DIENST
+# ══════════════════════════════════════════════════════════════
+
+class _LevelTap(SpeakerMonitor):
+    """Statt ein VU-Meter zu füttern: Pegel sammeln und gebündelt an die
+    Clients senden – nie aus dem Audio-Callback heraus (Socket kann blockieren)."""
+
+    def __init__(self, broadcast, stop: threading.Event):
+        super().__init__()
+        self._broadcast = broadcast
+        self._stop      = stop
+        self._pending   = 0.0
+        threading.Thread(target=self._loop, name="daemon-level", daemon=True).start()
+
+    def push_level(self, peak: float):
+        if peak > self._pending:
+            self._pending = peak
+
+    def _loop(self):
+        while not self._stop.wait(LEVEL_SEC):
+            peak, self._pending = self._pending, 0.0
+            if peak > 0.0:
+                self._broadcast({"type": "level", "rms": peak})
+
+
+class _Client:
+
+    def __init__(self, sock: socket.socket, addr):
+        self.sock  = sock
+        self.addr  = addr
+        self.lock  = threading.Lock()
+
+    def send(self, msg: dict):
+        _send(self.sock, self.lock, msg)
+
+    def close(self):
+        _close_socket(self.sock)
+
+
+class TranscriberDaemon:
+
+    def __init__(self, port: int = TRANSCRIBER_DAEMON_PORT):
+        self.port         = port
+        self.bus          = EventBus()
+        self._clients     : set[_Client] = set()
+        self._lock        = threading.Lock()
+        self._stop        = threading.Event()
+        self._server      = None
+        self._transcriber = None
+        self._state       = "loading"          # loading | ready | error
+        self._phase       = ""
+        self._error       = ""
+        self._mic         : AudioDevice | None = None
+        self._loop        : AudioDevice | None = None
+        self._token       = ""
+
+        for cls in _EVENT_TYPES.values():
+            self.bus.subscribe(cls, self._forward, name=f"daemon.{cls.__name__}")
+
+    def serve(self):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if os.name != "nt":
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Token nach dem Binden (ein zweiter Dienst auf demselben Port scheitert
+        # vorher und überschreibt es nicht), aber vor dem Lauschen (kein Client
+        # verbindet sich, bevor die Datei da ist)
+        self._server.bind((HOST, self.port))
+        self._token  = _write_token(self.port)
+        self._server.listen()
+        print(f"[Daemon] Lausche auf {HOST}:{self.port}")
+        threading.Thread(target=self._load, name="whisper-load", daemon=True).start()
+        self._server.settimeout(0.5)
+        while not self._stop.is_set():
+            try:
+                conn, addr = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(AUTH_SEC)
+            client = _Client(conn, addr)
+            threading.Thread(target=self._handle, args=(client,),
+                             name=f"daemon-client-{addr[1]}", daemon=True).start()
+        self._shutdown()
+
+    def stop(self):
+        self._stop.set()
+
+    # ── Laden ───────────────────────────────────────────────
+
+    def _load(self):
+        def phase(text):
+            self._phase = text
+            self._broadcast({"type": "phase", "text": text})
+        try:
+            from transcriber import Transcriber          # zieht faster-whisper nach
+            t = Transcriber(self.bus)
+            t.speaker_monitor = _LevelTap(self._broadcast, self._stop)
+            t.start(on_phase=phase)
+            with self._lock:
+                self._transcriber = t
+                self._state = "ready"
+                mic, loop = self._mic, self._loop
+            if mic is not None:
+                t.set_mic_device(mic)
+            if loop is not None:
+                t.set_loopback_device(loop)
+            self._broadcast({"type": "ready", "load_info": t.load_info})
+        except Exception as e:
+            self._state, self._error = "error", str(e)
+            print(f"[Daemon] Whisper-Start fehlgeschlagen: {e}")
+            self._broadcast({"type": "error", "message": str(e)})
+
+    # ── Clients ─────────────────────────────────────────────
+
+    def _hello(self) -> dict:
+        t = self._transcriber
+        return {"type": "hello", "state": self._state, "phase": self._phase,
+                "error": self._error, "load_info": t.load_info if t else {},
+                "mic": _device_to_dict(self._mic), "loopback": _device_to_dict(self._loop),
+                "clients": len(self._clients)}
+
+    def _authorized(self, msg) -> bool:
+        token = msg.get("token") if isinstance(msg, dict) and msg.get("op") == "auth" else None
+        return isinstance(token, str) and hmac.compare_digest(token, self._token)
+
+    def _handle(self, client: _Client):
+        reader = client.sock.makefile("r", encoding="utf-8")
+        try:
+            if not self._authorized(json.loads(reader.readline() or "null")):
+                print(f"[Daemon] Client ohne gültiges Token abgewiesen ({client.addr[0]})")
+                client.close()
+                return
+        except (OSError, ValueError):
+            client.close()           # kein auth innerhalb von AUTH_SEC
+            return
+        client.sock.settimeout(None)
+        with self._lock:
+            self._clients.add(client)
+        print(f"[Daemon] Client verbunden ({len(self._clients)} aktiv)")
+        try:
+            client.send(self._hello())
+            for line in reader:
+                if line.strip():
+                    self._on_message(json.loads(line))
+        except (OSError, ValueError) as e:
+            print(f"[Daemon] Client-Fehler: {e}")
+        finally:
+            with self._lock:
+                self._clients.discard(client)
+            client.close()
+            print(f"[Daemon] Client getrennt ({len(self._clients)} aktiv)")
+
+    def _on_message(self, msg: dict):
+        op = msg.get("op")
+        if op in ("set_mic", "set_loopback"):
+            self._set_device(op, _device_from_dict(msg.get("device")))
+        elif op == "clear":
+            if self._transcriber is not None:
+                self._transcriber.clear_buffer()
+        elif op == "shutdown":
+            print("[Daemon] Beenden angefordert")
+            self.stop()
+        else:
+            print(f"[Daemon] Unbekannte Nachricht: {op!r}")
+
+    def _set_device(self, op: str, device: AudioDevice | None):
+        attr = "_mic" if op == "set_mic" else "_loop"
+        with self._lock:
+            current = getattr(self, attr)
+            same = (device is None and current is None) or (
+                device is not None and current is not None
+                and (device.index, device.name) == (current.index, current.name))
+            setattr(self, attr, device)
+            t = self._transcriber
+        # Gleiches Gerät → laufenden Stream behalten (typisch nach UI-Neustart)
+        if same or t is None:
+            return
+        if op == "set_mic":
+            t.set_mic_device(device)
+        else:
+            t.set_loopback_device(device)
+
+    def _forward(self, event):
+        data = {k: v for k, v in vars(event).items() if k != "ts"}
+        self._broadcast({"type": "event", "name": type(event).__name__, "data": data})
+
+    def _broadcast(self, msg: dict):
+        with self._lock:
+            clients = list(self._clients)
+        for c in clients:
+            try:
+                c.send(msg)
+            except OSError:
+                c.close()             # _handle räumt beim Lesefehler auf
+
+    def _shutdown(self):
+        print("[Daemon] Beende …")
+        if self._transcriber is not None:
+            self._transcriber.stop()
+        with self._lock:
+            clients = list(self._clients)
+        for c in clients:
+            c.close()
+        self._server.close()
+        try:
+            os.remove(_token_path(self.port))
+        except OSError:
+            pass
+        self.bus.close()
+
+
+# ══════════════════════════════════════════════════════════════
+#  CLIENT
+# ══════════════════════════════════════════════════════════════
+
+class RemoteTranscriber:
+    """Gleiche Schnittstelle wie transcriber.Transcriber – Arbeit macht der Dienst."""
+
+    def __init__(self, bus: EventBus | None = None, port: int = TRANSCRIBER_DAEMON_PORT):
+        self.bus             = bus if bus is not None else EventBus()
+        self.port            = port
+        self.load_info       : dict = {}
+        self.speaker_monitor = None
+        self._sock           = None
+        self._send_lock      = threading.Lock()
+        self._running        = False
+        self._ready          = threading.Event()
+        self._alive          = 0.0         # letzte Nachricht vom Dienst (monotonic)
+        self._error          = None
+        self._on_phase       = lambda text: None
+        self._mic            : AudioDevice | None = None
+        self._loop           : AudioDevice | None = None
+        self.timeline        = Timeline()
+
+    # ── Public API ──────────────────────────────────────────
+
+    def start(self, on_phase=None):
+        """Verbindet (startet den Dienst notfalls) und wartet, bis Whisper bereit ist."""
+        self._on_phase = on_phase or (lambda text: None)
+        self._running  = True
+        self._on_phase("Verbinde mit Transkriptions-Dienst …")
+        self._connect(autostart=TRANSCRIBER_DAEMON_AUTOSTART)
+        self._alive = time.monotonic()
+        threading.Thread(target=self._reader_loop, name="daemon-reader", daemon=True).start()
+        # Laden darf dauern (Download, Fallback-Leiter), solange der Dienst
+        # Phasen meldet – ohne Lebenszeichen nicht ewig hängen
+        while not self._ready.wait(0.5):
+            silent = time.monotonic() - self._alive
+            if silent > TRANSCRIBER_DAEMON_READY_SEC:
+                self.stop()
+                raise RuntimeError(f"Transkriptions-Dienst meldet sich seit {silent:.0f}s "
+                                   f"nicht (siehe {LOG_FILE})")
+        if self._error:
+            self.stop()
+            raise RuntimeError(self._error)
+        print(f"[RemoteTranscriber] Bereit – Dienst auf Port {self.port}")
+
+    def stop(self):
+        """Trennt nur die Verbindung – Dienst, Modell und Streams laufen weiter."""
+        self._running = False
+        self._close()
+
+    def set_mic_device(self, device: AudioDevice | None):
+        self._mic = device
+        self._request({"op": "set_mic", "device": _device_to_dict(device)})
+
+    def set_loopback_device(self, device: AudioDevice | None):
+        self._loop = device
+        self._request({"op": "set_loopback", "device": _device_to_dict(device)})
+
+    def get_last_n_lines(self, n: int = 20) -> str:
+        return "\n".join(self.timeline.last_n(n))
+
+    def clear_buffer(self):
+        self.timeline.clear()
+        self._request({"op": "clear"})
+
+    # ── Verbindung ──────────────────────────────────────────
+
+    def _connect(self, autostart: bool):
+        try:
+            self._sock = socket.create_connection((HOST, self.port), timeout=2)
+        except OSError:
+            if not autostart:
+                raise
+            self._spawn_daemon()
+            deadline = time.monotonic() + TRANSCRIBER_DAEMON_START_SEC
+            while True:
+                try:
+                    self._sock = socket.create_connection((HOST, self.port), timeout=2)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError("Transkriptions-Dienst startet nicht "
+                                           f"(siehe {LOG_FILE})")
+                    time.sleep(0.2)
+        self._sock.settimeout(None)
+        self._request({"op": "auth", "token": _read_token(self.port)})
+        # Nach einem Neuaufbau die Geräteauswahl erneut melden
+        if self._mic is not None:
+            self._request({"op": "set_mic", "device": _device_to_dict(self._mic)})
+        if self._loop is not None:
+            self._request({"op": "set_loopback", "device": _device_to_dict(self._loop)})
+
+    def _spawn_daemon(self):
+        print("[RemoteTranscriber] Kein Dienst gefunden – starte transcriber_daemon.py")
+        self._on_phase("Starte Transkriptions-Dienst …")
+        here  = os.path.dirname(os.path.abspath(__file__))
+        log   = open(os.path.join(here, LOG_FILE), "a", encoding="utf-8")
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = (subprocess.DETACHED_PROCESS
+                                       | subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            kwargs["start_new_session"] = True
+        subprocess.Popen([sys.executable, os.path.join(here, "transcriber_daemon.py"),
+                          "--port", str(self.port)],
+                         cwd=here, stdout=log, stderr=subprocess.STDOUT,
+                         stdin=subprocess.DEVNULL, **kwargs)
+        log.close()
+
+    def _close(self):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            _close_socket(sock)
+
+    def _request(self, msg: dict):
+        sock = self._sock
+        if sock is None:
+            return                   # wird beim Neuaufbau nachgeholt
+        try:
+            _send(sock, self._send_lock, msg)
+        except OSError as e:
+            print(f"[RemoteTranscriber] Senden fehlgeschlagen: {e}")
+
+    def _reader_loop(self):
+        while self._running:
+            sock = self._sock
+            try:
+                if sock is None:
+                    raise OSError("nicht verbunden")
+                for line in sock.makefile("r", encoding="utf-8"):
+                    if line.strip():
+                        self._on_message(json.loads(line))
+                raise OSError("Verbindung geschlossen")
+            except (OSError, ValueError) as e:
+                if not self._running:
+                    break
+                if not self._ready.is_set():
+                    self._error = f"Transkriptions-Dienst: {e}"
+                    self._ready.set()
+                    break
+                print(f"[RemoteTranscriber] Verbindung verloren ({e}) – neuer Versuch …")
+                self._close()
+                time.sleep(RECONNECT_SEC)
+                try:
+                    self._connect(autostart=False)
+                except (OSError, RuntimeError):
+                    pass
+
+    def _on_message(self, msg: dict):
+        self._alive = time.monotonic()
+        kind = msg.get("type")
+        if kind == "event":
+            cls = _EVENT_TYPES.get(msg["name"])
+            if cls is None:
+                return
+            event = cls(**msg["data"])
+            if isinstance(event, TranscriptLine):
+                # monotonic() ist systemweit → Aufnahmezeiten des Dienstes passen
+                self.timeline.insert(event.t_start if event.t_start is not None
+                                     else time.monotonic(), event.source, event.text)
+            self.bus.publish(event)
+        elif kind == "level":
+            if self.speaker_monitor is not None:
+                self.speaker_monitor.push_level(msg["rms"])
+        elif kind == "hello":
+            if msg["state"] == "ready":
+                self.load_info = msg["load_info"]
+                self._ready.set()
+            elif msg["state"] == "error":
+                self._error = msg["error"]
+                self._ready.set()
+            elif msg["phase"]:
+                self._on_phase(msg["phase"])
+        elif kind == "phase":
+            self._on_phase(msg["text"])
+        elif kind == "ready":
+            self.load_info = msg["load_info"]
+            self._ready.set()
+        elif kind == "error":
+            self._error = msg["message"]
+            self._ready.set()
+
+
+# ══════════════════════════════════════════════════════════════
+#  CLI
+# ══════════════════════════════════════════════════════════════
+
+def _query(port: int, msg: dict | None = None) -> dict:
+    with socket.create_connection((HOST, port), timeout=2) as sock:
+        _send(sock, threading.Lock(), {"op": "auth", "token": _read_token(port)})
+        hello = json.loads(sock.makefile("r", encoding="utf-8").readline())
+        if msg is not None:
+            _send(sock, threading.Lock(), msg)
+        return hello
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transkriptions-Dienst für die App")
+    parser.add_argument("--port", type=int, default=TRANSCRIBER_DAEMON_PORT)
+    parser.add_argument("--status", action="store_true", help="Zustand des Dienstes ausgeben")
+    parser.add_argument("--stop", action="store_true", help="Laufenden Dienst beenden")
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        try:
+            hello = _query(args.port, {"op": "shutdown"} if args.stop else None)
+        except OSError:
+            print(f"[Daemon] Kein Dienst auf Port {args.port}")
+            sys.exit(1)
+        except (RuntimeError, ValueError) as e:
+            print(f"[Daemon] Dienst auf Port {args.port} lehnt ab: {e or 'Token ungültig'}")
+            sys.exit(1)
+        print(json.dumps(hello, indent=2, ensure_ascii=False))
+        return
+
+    daemon = TranscriberDaemon(args.port)
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        daemon.stop()
+        daemon._shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+transcript_index.py
+───────────────────
+Lokaler BM25-Index über die Transkript-Zeilen der Sitzung.
+
+Funktionsprinzip:
+  - Jede Zeile ist ein Dokument, wird beim Eintreffen inkrementell indiziert
+  - Postings (Term → {Zeile: Häufigkeit}) + Dokumentlängen, keine Abhängigkeiten
+  - search() bewertet alle Zeilen, die einen Query-Term enthalten, mit BM25
+
+Damit findet der ContextBuilder ältere Aussagen, die zum aktuellen Thema
+passen – auch wenn sie 15 Minuten zurückliegen.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+
+BM25_K1 = 1.5
+BM25_B  = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Kleine Stoppwort-Liste (Deutsch + Füllwörter aus Live-Transkripten)
+_STOPWORDS = frozenset("""
+aber alle also auch auf aus bei bin bis bist das dass dem den der des die dir
+doch dort durch ein eine einem einen einer eines er es für hab habe haben hat
+hier ich ihr ist ja jetzt kann kein keine mal man mich mir mit muss nach nein
+nicht noch nur oder ok okay schon sein sich sie sind so und uns von war was
+weil wenn wie wir wird wo zu zum zur über äh ähm hm halt eben genau gut naja
+the and you that this with
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower())
+            if len(t) > 2 and t not in _STOPWORDS and not t.isdigit()]
+
+
+class TranscriptIndex:
+
+    def __init__(self):
+        self._lock     = threading.Lock()
+        self._docs     = []        # Original-Zeilen
+        self._lengths  = []        # Anzahl Terme pro Zeile
+        self._postings = {}        # term → {doc_id: tf}
+        self._total_len = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, line: str) -> int:
+        """Indiziert eine Zeile und gibt ihre ID zurück."""
+        terms = tokenize(line)
+        with self._lock:
+            doc_id = len(self._docs)
+            self._docs.append(line)
+            self._lengths.append(len(terms))
+            self._total_len += len(terms)
+            for term, tf in Counter(terms).items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+        return doc_id
+
+    def clear(self):
+        with self._lock:
+            self._docs      = []
+            self._lengths   = []
+            self._postings  = {}
+            self._total_len = 0
+
+    def search(self, query: str, k: int = 5,
+               exclude: set[str] | None = None) -> list[tuple[int, str, float]]:
+        """
+        Gibt bis zu k (doc_id, Zeile, Score) zurück, beste zuerst.
+        exclude = Zeilen, die ohnehin im Kontext sind.
+        """
+        q_terms = set(tokenize(query))
+        if not q_terms:
+            return []
+        with self._lock:
+            n = len(self._docs)
+            if n == 0:
+                return []
+            avg_len = self._total_len / n or 1.0
+            scores  = {}
+            for term in q_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df  = len(postings)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+            ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+            results = []
+            for doc_id, score in ranked:
+                line = self._docs[doc_id]
+                if exclude and line in exclude:
+                    continue
+                results.append((doc_id, line, score))
+                if len(results) >= k:
+                    break
+            return results